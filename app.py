@@ -1,156 +1,634 @@
-"""Flask application for GPU Tycoon"""
+"""Flask application for GPU Tycoon
+
+create_app() builds the app. gunicorn imports `app:app`; with preload_app
+(see gunicorn_config.py) that happens once in the master, so the catalogs,
+compiled templates, asset bundles and serialized catalog response are built once and
+shared copy-on-write by the forked workers. Per-process resources (SQLite
+connections) are created lazily, after the fork.
+"""
+import time
+STARTUP_STARTED = time.perf_counter()  # Before the other imports, so they are timed too
+
+import functools
+import json
+import math
 import os
+import pickle
 import secrets
-from flask import Flask, render_template, jsonify, request, session
+import threading
+from flask import Blueprint, Flask, current_app, render_template, jsonify, request, session
 from flask_cors import CORS
-from game.game_state import GameState
+from game.game_state import GameState, STATE_SECTIONS
 from game.gpus import GPU_CATALOG
 from game.economy import COOLING_TIERS, SCHEDULER_TIERS
+from game.regions import REGIONS, DEFAULT_REGION
+from game.workload import Workload, load_job_shapes
+from compression import init_compression
+from assets import init_assets
+from router import shard_for_session
+from session_store import SessionStore
+from tick_admission import TickAdmission, RETRY_AFTER
+from leaderboard import Leaderboard, METRICS as LEADERBOARD_METRICS, player_name
+from memory_budget import MemoryAccountant, item_costs
+
+IMPORTS_DONE = time.perf_counter()
 
-app = Flask(__name__)
-CORS(app, supports_credentials=True)
+bp = Blueprint('game', __name__)
 
-# Session configuration
-app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(32))
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['PERMANENT_SESSION_LIFETIME'] = 86400 * 7  # 7 days
-app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
-app.config['SESSION_COOKIE_SECURE'] = False  # Set to True if using HTTPS in production
-app.config['SESSION_COOKIE_HTTPONLY'] = True
+# Startup timing report (ms), also served by /api/health
+startup_timings = {'imports_ms': round((IMPORTS_DONE - STARTUP_STARTED) * 1000, 1)}
 
 # Store game states per session (in-memory)
-# In production, you might want to use Redis or a database
+# Idle sessions are hibernated to a local SQLite store and rehydrated on demand
 game_sessions = {}
-MAX_SESSIONS = 100  # Limit to prevent memory issues
+session_last_seen = {}  # session_id -> wall time of last request
+# Resident games are bounded by their estimated memory, not by count: when the
+# total goes over budget the costliest idle sessions are hibernated (not lost)
+MEMORY_BUDGET_MB = float(os.environ.get('MEMORY_BUDGET_MB', '256'))
+memory = MemoryAccountant(int(MEMORY_BUDGET_MB * 2**20))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')  # Enables /api/admin/* (unset = disabled)
 
-def get_game_state():
-    """Get or create game state for current session"""
+SESSION_STORE_PATH = os.environ.get('SESSION_STORE_PATH', 'game_sessions.db')
+MAX_LEADERBOARD_LIMIT = 100
+
+# SQLite connections must not cross a fork: each worker opens its own on first use
+@functools.cache
+def get_session_store():
+    return SessionStore(SESSION_STORE_PATH)
+
+@functools.cache
+def get_leaderboard():
+    return Leaderboard(SESSION_STORE_PATH)
+
+# Workload of new games (see game/workload.py): WORKLOAD=fixed|poisson|bursty|trace,
+# WORKLOAD_OPTIONS='{"path": "trace.jsonl", "loop": true}', JOB_SHAPES_PATH=shapes.json
+WORKLOAD = os.environ.get('WORKLOAD', 'fixed')
+WORKLOAD_OPTIONS = json.loads(os.environ.get('WORKLOAD_OPTIONS', '{}'))
+JOB_SHAPES_PATH = os.environ.get('JOB_SHAPES_PATH')
+
+@functools.cache
+def custom_job_shapes():
+    return load_job_shapes(JOB_SHAPES_PATH) if JOB_SHAPES_PATH else None
+
+def new_workload():
+    """A fresh arrival process (they are stateful) for a new game"""
+    return Workload.create(WORKLOAD, custom_job_shapes(), **WORKLOAD_OPTIONS)
+HIBERNATE_AFTER = float(os.environ.get('HIBERNATE_AFTER', '300'))  # Idle seconds before hibernating
+CATCH_UP_SECONDS = float(os.environ.get('CATCH_UP_SECONDS', '0'))  # Game time simulated on wake-up
+HIBERNATE_SWEEP_INTERVAL = 30  # Seconds between idle sweeps
+last_hibernate_sweep = 0.0
+sweep_lock = threading.Lock()  # Guards last_hibernate_sweep, so one request runs each sweep
+
+# Multi-process mode (see router.py): this process owns the sessions hashing to its shard
+SHARD_INDEX = int(os.environ.get('SHARD_INDEX', '0'))
+SHARD_COUNT = int(os.environ.get('SHARD_COUNT', '1'))
+
+def new_session_id():
+    """Create a session id owned by this shard, so the router sends it back here"""
+    while True:
+        session_id = secrets.token_hex(16)
+        if shard_for_session(session_id, SHARD_COUNT) == SHARD_INDEX:
+            return session_id
+
+def ensure_session_id():
+    """Get the current session id, creating one if needed"""
     if 'session_id' not in session:
-        session['session_id'] = secrets.token_hex(16)
+        session['session_id'] = new_session_id()
         session.permanent = True
+    return session['session_id']
+
+# Concurrency: with threaded or async workers (see gunicorn_config.py) several
+# requests for the same game can run at once. Each session gets its own lock so
+# ticks and actions on one GameState are serialized while other players proceed.
+sessions_lock = threading.Lock()  # Guards game_sessions and session_locks
+session_locks = {}
+
+def get_session_lock(session_id):
+    """Get (or create) the lock serializing requests for a session"""
+    with sessions_lock:
+        lock = session_locks.get(session_id)
+        if lock is None:
+            lock = session_locks[session_id] = threading.RLock()
+        return lock
+
+# Tick admission (rate limit, coalescing, response cache) per session
+tick_admissions = {}
+
+def get_tick_admission(session_id):
+    """Get (or create) the tick admission state for a session"""
+    with sessions_lock:
+        admission = tick_admissions.get(session_id)
+        if admission is None:
+            admission = tick_admissions[session_id] = TickAdmission()
+        return admission
+
+def with_session_lock(view):
+    """Run a view while holding the current session's lock"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        session_id = ensure_session_id()
+        with get_session_lock(session_id):
+            response = view(*args, **kwargs)
+            _account_memory(session_id)
+            return response
+    return wrapper
+
+def _account_memory(session_id):
+    """Re-estimate a session after its request and enforce the memory budget"""
+    with sessions_lock:
+        game = game_sessions.get(session_id)
+        if game is not None:
+            memory.update(session_id, game)
+        hibernated = _enforce_memory_budget(exclude=session_id)
+    _save_hibernated(hibernated)
+
+def get_game_state():
+    """Get or create game state for current session"""
+    session_id = ensure_session_id()
     
-    session_id = session['session_id']
+    with sessions_lock:
+        session_last_seen[session_id] = time.time()
+        game = game_sessions.get(session_id)
     
-    if session_id not in game_sessions:
-        # Simple cleanup: remove oldest sessions if we hit the limit
-        if len(game_sessions) >= MAX_SESSIONS:
-            oldest_session = next(iter(game_sessions))
-            del game_sessions[oldest_session]
+    if game is None:
+        # Rehydrate from disk outside the global lock (we hold this session's lock)
+        stored = get_session_store().load(session_id)
+        if stored is not None:
+            # The game was idle from the player's last request, not just since the save
+            game, last_seen = stored
+            game.resume(time.time() - last_seen, CATCH_UP_SECONDS)
+        else:
+            game = GameState(new_workload())
         
-        game_sessions[session_id] = GameState()
+        with sessions_lock:
+            game_sessions[session_id] = game
+            memory.update(session_id, game)
+            hibernated = _enforce_memory_budget(exclude=session_id)
+        _save_hibernated(hibernated)
     
-    return game_sessions[session_id]
+    _maybe_sweep_idle_sessions(session_id)
+    return game
 
-@app.route('/')
+def _hibernate_session(session_id):
+    """Take one session out of memory. Caller holds sessions_lock.
+    
+    The session's lock stays held until _save_hibernated has written the
+    game, so a request for it waits and then finds it on disk. Pickling and
+    the SQLite write happen in _save_hibernated, after sessions_lock is
+    released.
+    
+    Returns:
+        tuple: (session_id, game, last_seen, lock) to pass to _save_hibernated,
+        or None if a request is currently using the session
+    """
+    # The lock stays in session_locks: a request may already be waiting on it
+    lock = session_locks.setdefault(session_id, threading.RLock())
+    if not lock.acquire(blocking=False):
+        return None
+    game = game_sessions.pop(session_id, None)
+    last_seen = session_last_seen.pop(session_id, None)
+    tick_admissions.pop(session_id, None)
+    memory.forget(session_id)
+    return session_id, game, last_seen, lock
+
+def _save_hibernated(hibernated):
+    """Write hibernated sessions to disk and release their locks. Caller must not hold sessions_lock."""
+    for session_id, game, last_seen, lock in hibernated:
+        try:
+            if game is not None:
+                get_session_store().save(session_id, game, last_seen)
+        finally:
+            lock.release()
+
+def _enforce_memory_budget(exclude=None):
+    """Take sessions out of memory until the resident games fit MEMORY_BUDGET_MB. Caller holds sessions_lock.
+    
+    Idle sessions go first, largest first, then active ones least recently
+    used first. The session being served is never hibernated.
+    
+    Returns:
+        list: Hibernated sessions, to save with _save_hibernated once sessions_lock is released
+    """
+    hibernated = []
+    if not memory.over_budget():
+        return hibernated
+    for sid in memory.eviction_order(session_last_seen, time.time(), exclude):
+        entry = _hibernate_session(sid)
+        if entry is not None:
+            hibernated.append(entry)
+        if not memory.over_budget():
+            break
+    return hibernated
+
+def _maybe_sweep_idle_sessions(current_session_id):
+    """Periodically hibernate sessions idle for longer than HIBERNATE_AFTER"""
+    global last_hibernate_sweep
+    now = time.time()
+    with sweep_lock:
+        if now - last_hibernate_sweep < HIBERNATE_SWEEP_INTERVAL:
+            return
+        last_hibernate_sweep = now
+    
+    with sessions_lock:
+        idle = [sid for sid, seen in session_last_seen.items()
+                if now - seen > HIBERNATE_AFTER and sid != current_session_id]
+        hibernated = [entry for entry in map(_hibernate_session, idle) if entry is not None]
+    _save_hibernated(hibernated)
+    
+    get_leaderboard().flush()
+
+@bp.route('/')
 def index():
     """Serve the game page"""
     return render_template('index.html')
 
-@app.route('/api/state')
+def requested_fields():
+    """Sections requested with ?fields=a,b,c (None means all of them)"""
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(',') if f.strip()]
+
+def unknown_fields_response():
+    """400 response if ?fields= names a section that does not exist, else None"""
+    unknown = [f for f in requested_fields() or () if f not in STATE_SECTIONS]
+    if not unknown:
+        return None
+    return jsonify({
+        'success': False,
+        'message': f"Unknown fields: {', '.join(unknown)}",
+        'valid_fields': list(STATE_SECTIONS)
+    }), 400
+
+@bp.route('/api/state')
+@with_session_lock
 def get_state():
-    """Get current game state"""
+    """Get current game state (optionally only ?fields=...)"""
+    error = unknown_fields_response()
+    if error:
+        return error
     game = get_game_state()
-    return jsonify(game.to_dict())
+    return jsonify(game.to_dict(requested_fields()))
 
-@app.route('/api/tick', methods=['POST'])
+@bp.route('/api/tick', methods=['POST'])
+@with_session_lock
 def tick():
-    """Advance game simulation"""
+    """Advance game simulation (optionally return only ?fields=...)"""
     data = request.json or {}
-    dt = data.get('dt', 0.2)  # Default 200ms
+    try:
+        dt = float(data.get('dt', 0.2) if isinstance(data, dict) else None)  # Default 200ms
+    except (TypeError, ValueError):
+        dt = math.nan
+    if not math.isfinite(dt):
+        return jsonify({'success': False, 'message': 'dt must be a number'}), 400
+    error = unknown_fields_response()
+    if error:
+        return error
     
     game = get_game_state()
-    game.update(dt)
-    return jsonify({'success': True, 'state': game.to_dict()})
+    admission = get_tick_admission(session['session_id'])
+    if not admission.allow_request():
+        # The client keeps the unsent dt and retries after the delay
+        response = jsonify({'success': False, 'message': 'Too many ticks'})
+        response.headers['Retry-After'] = str(RETRY_AFTER)
+        return response, 429
+    
+    # Ticks too close together are coalesced; speed is capped per session
+    granted_dt = admission.admit(dt)
+    if granted_dt > 0:
+        game.update(granted_dt)
+        get_leaderboard().update(session['session_id'], game)
+    
+    # Reuse the last body if nothing changed since it was built
+    fields = requested_fields()
+    fields_key = tuple(fields) if fields else None
+    body = admission.get_cached(fields_key)
+    if body is None:
+        body = jsonify({'success': True, 'state': game.to_dict(fields)}).get_data()
+        admission.store(fields_key, body)
+    return current_app.response_class(body, mimetype='application/json')
 
-@app.route('/api/action', methods=['POST'])
+@bp.route('/api/action', methods=['POST'])
+@with_session_lock
 def action():
     """Handle player actions (purchases)"""
     game = get_game_state()
-    data = request.json
+    data = request.json or {}
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'message': 'Action must be an object'}), 400
+    result = apply_action(game, data)
+    get_tick_admission(session['session_id']).state_changed()
+    get_leaderboard().update(session['session_id'], game)
+    return jsonify(result)
+
+MAX_BATCH_ACTIONS = 50
+
+@bp.route('/api/actions', methods=['POST'])
+@with_session_lock
+def batch_actions():
+    """Apply an ordered list of actions in one round trip
+
+    Body: {'actions': [{'type': ...}, ...], 'all_or_nothing': false}
+    The whole batch runs under the session lock, so no tick interleaves with it.
+    An action that raises counts as a failed action. With all_or_nothing, the
+    first failure rolls the game back to its state before the batch; the
+    snapshot is a pickle of the whole game taken up front (about 1 ms at 200
+    GPUs, unpickled only on rollback). Returns per-action results plus a
+    single state.
+    """
+    game = get_game_state()
+    data = request.json or {}
+    actions = data.get('actions', []) if isinstance(data, dict) else None
+    if not isinstance(actions, list) or not all(isinstance(item, dict) for item in actions):
+        return jsonify({'success': False, 'message': 'Actions must be a list of objects'}), 400
+    if len(actions) > MAX_BATCH_ACTIONS:
+        return jsonify({'success': False, 'message': f'Batch limited to {MAX_BATCH_ACTIONS} actions'}), 400
+    error = unknown_fields_response()
+    if error:
+        return error
+
+    all_or_nothing = bool(data.get('all_or_nothing', False))
+    snapshot = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL) if all_or_nothing else None
+
+    results = []
+    for item in actions:
+        try:
+            result = apply_action(game, item)
+        except Exception as e:
+            result = {'success': False, 'message': f'Action failed: {e}'}
+        results.append(result)
+        if all_or_nothing and not result['success']:
+            game.__dict__.update(pickle.loads(snapshot).__dict__)
+            break
+
+    get_tick_admission(session['session_id']).state_changed()
+    get_leaderboard().update(session['session_id'], game)
+    success = len(results) == len(actions) and all(r['success'] for r in results)
+    return jsonify({
+        'success': success,
+        'rolled_back': all_or_nothing and not success,
+        'results': results,
+        'state': game.to_dict(requested_fields())
+    })
+
+def apply_action(game, data):
+    """Apply one player action to a game and return its result dict"""
     action_type = data.get('type')
     
     if action_type == 'buy_gpu':
         gpu_type = data.get('gpu_type')
-        success, message = game.purchase_gpu(gpu_type)
-        return jsonify({'success': success, 'message': message})
+        region = data.get('region', DEFAULT_REGION)
+        success, message = game.purchase_gpu(gpu_type, region)
+        return {'success': success, 'message': message}
+    
+    elif action_type == 'buy_gpus':
+        gpu_type = data.get('gpu_type')
+        region = data.get('region', DEFAULT_REGION)
+        success, result = game.purchase_gpus(gpu_type, data.get('count', 1), region)
+        if success:
+            return {'success': True, 'message': f'Purchased {len(result)}x {gpu_type}', 'gpu_ids': result}
+        return {'success': False, 'message': result}
     
     elif action_type == 'upgrade_marketing':
         success, message = game.upgrade_marketing()
-        return jsonify({'success': success, 'message': message})
+        return {'success': success, 'message': message}
     
     elif action_type == 'reset':
         game.reset()
-        return jsonify({'success': True, 'message': 'Game reset'})
+        return {'success': True, 'message': 'Game reset'}
     
     elif action_type == 'assign_job':
         job_id = data.get('job_id')
         gpu_ids = data.get('gpu_ids', [])
         success, message = game.assign_job_to_gpus(job_id, gpu_ids)
-        return jsonify({'success': success, 'message': message})
+        return {'success': success, 'message': message}
     
     elif action_type == 'toggle_auto_assign':
         auto_enabled = game.toggle_auto_assign()
         mode = "automatic" if auto_enabled else "manual"
-        return jsonify({'success': True, 'message': f'Job assignment: {mode}', 'auto_assign': auto_enabled})
+        return {'success': True, 'message': f'Job assignment: {mode}', 'auto_assign': auto_enabled}
+    
+    elif action_type == 'toggle_auto_cluster':
+        enabled = game.toggle_auto_cluster()
+        report = game.auto_clusterer.last_report
+        message = f"Auto-clustering: {'ON' if enabled else 'OFF'}"
+        if enabled and report and report['applied']:
+            message += f" ({report['clusters_created']} clusters, +{report['utilization_gain_pct']}% expected utilization)"
+        return {'success': True, 'message': message, 'auto_cluster': game.auto_clusterer.to_dict()}
+    
+    elif action_type == 'set_batching':
+        success, message = game.set_batching(data.get('max_size', 1))
+        return {'success': success, 'message': message}
+    
+    elif action_type == 'toggle_placement_mode':
+        placement_mode = game.toggle_placement_mode()
+        mode = "compact (topology-aware)" if placement_mode == 'compact' else "first fit"
+        return {'success': True, 'message': f'GPU placement: {mode}', 'placement_mode': placement_mode}
     
     elif action_type == 'start_contract_negotiation':
         contract_id = data.get('contract_id')
         success, message = game.start_contract_negotiation(contract_id)
-        return jsonify({'success': success, 'message': message})
+        return {'success': success, 'message': message}
     
     elif action_type == 'invest_in_contract':
         contract_id = data.get('contract_id')
         amount = data.get('amount', 0)
         success, message = game.invest_in_contract(contract_id, amount)
-        return jsonify({'success': success, 'message': message})
+        return {'success': success, 'message': message}
     
     # GPU Clustering actions
     elif action_type == 'create_cluster':
         gpu_ids = data.get('gpu_ids', [])
         success, result = game.create_gpu_cluster(gpu_ids)
         if success:
-            return jsonify({'success': True, 'message': f'Cluster #{result} created', 'cluster_id': result})
+            return {'success': True, 'message': f'Cluster #{result} created', 'cluster_id': result}
         else:
-            return jsonify({'success': False, 'message': result})
+            return {'success': False, 'message': result}
     
     elif action_type == 'add_to_cluster':
         cluster_id = data.get('cluster_id')
         gpu_id = data.get('gpu_id')
         success, message = game.add_gpu_to_cluster(cluster_id, gpu_id)
-        return jsonify({'success': success, 'message': message})
+        return {'success': success, 'message': message}
     
     elif action_type == 'remove_from_cluster':
         cluster_id = data.get('cluster_id')
         gpu_id = data.get('gpu_id')
         success, message = game.remove_gpu_from_cluster(cluster_id, gpu_id)
-        return jsonify({'success': success, 'message': message})
+        return {'success': success, 'message': message}
     
     elif action_type == 'disband_cluster':
         cluster_id = data.get('cluster_id')
         success, message = game.disband_cluster(cluster_id)
-        return jsonify({'success': success, 'message': message})
+        return {'success': success, 'message': message}
+    
+    # Bulk fleet operations
+    elif action_type == 'create_clusters':
+        success, result = game.create_gpu_clusters(
+            data.get('gpu_type'), data.get('size', 8), data.get('count', 1), data.get('region')
+        )
+        if success:
+            return {'success': True, 'message': f'Created {len(result)} cluster(s)', 'cluster_ids': result}
+        return {'success': False, 'message': result}
     
-    return jsonify({'success': False, 'message': 'Unknown action'})
+    elif action_type == 'disband_clusters':
+        success, message = game.disband_clusters(data.get('cluster_ids', []))
+        return {'success': success, 'message': message}
+    
+    elif action_type == 'label_clusters':
+        success, message = game.label_clusters(data.get('cluster_ids', []), data.get('label'))
+        return {'success': success, 'message': message}
+    
+    return {'success': False, 'message': 'Unknown action'}
+
+@bp.route('/api/forecast')
+@with_session_lock
+def forecast():
+    """Forecast utilization, queue wait and SLA now and with ?gpu_type=X&count=N more GPUs"""
+    game = get_game_state()
+    success, result = game.forecast_capacity(request.args.get('gpu_type'), request.args.get('count', 1))
+    if not success:
+        return jsonify({'success': False, 'message': result}), 400
+    return jsonify({'success': True, **result})
+
+@bp.route('/api/history')
+@with_session_lock
+def history():
+    """Metrics over the last ?window=S game seconds, downsampled to ?points=N (?metrics=a,b)"""
+    game = get_game_state()
+    metrics = request.args.get('metrics')
+    success, result = game.get_history(request.args.get('window', 600), request.args.get('points', 120),
+                                       metrics.split(',') if metrics else None)
+    if not success:
+        return jsonify({'success': False, 'message': result}), 400
+    return jsonify({'success': True, 'history': result})
 
-@app.route('/api/catalog')
+@bp.route('/api/leaderboard')
+def leaderboard():
+    """Top players per metric (?metric=..., ?limit=N) and the current player's rank"""
+    metric = request.args.get('metric')
+    if metric is not None and metric not in LEADERBOARD_METRICS:
+        return jsonify({'success': False, 'message': 'Unknown metric'}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), MAX_LEADERBOARD_LIMIT))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Limit must be a number'}), 400
+    
+    session_id = session.get('session_id')
+    boards = {}
+    for name in ([metric] if metric else LEADERBOARD_METRICS):
+        rank, ranked = get_leaderboard().rank(name, session_id) if session_id else (None, None)
+        boards[name] = {'top': get_leaderboard().top(name, limit), 'your_rank': rank, 'ranked': ranked}
+    return jsonify({'success': True, 'leaderboards': boards})
+
+@bp.route('/api/admin/memory')
+def admin_memory():
+    """Estimated memory of the resident sessions against the budget (needs X-Admin-Token)"""
+    if not ADMIN_TOKEN or not secrets.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN):
+        return jsonify({'success': False, 'message': 'Not found'}), 404
+    with sessions_lock:
+        report = memory.to_dict(session_last_seen, time.time(), game_sessions)
+    for row in report['sessions']:
+        row['session'] = player_name(row['session'])  # Never expose session ids
+    report['rss_mb'] = _rss_mb()
+    return jsonify({'success': True, 'memory': report})
+
+@bp.route('/api/catalog')
 def get_catalog():
     """Get item catalog for shop (simplified - only GPUs purchasable)"""
-    return jsonify({
-        'gpus': GPU_CATALOG,
-        # For display purposes only (not purchasable)
-        'cooling_info': COOLING_TIERS,
-        'scheduler_info': SCHEDULER_TIERS
-    })
+    # Serialized once in create_app - the catalogs never change at runtime
+    return current_app.response_class(current_app.config['CATALOG_JSON'], mimetype='application/json')
 
-@app.route('/api/health')
+@bp.route('/api/health')
 def health_check():
     """Health check endpoint for debugging"""
     return jsonify({
         'status': 'healthy',
         'session_id': session.get('session_id', 'none'),
+        'shard': SHARD_INDEX,
+        'shard_count': SHARD_COUNT,
         'active_sessions': len(game_sessions),
-        'has_game_state': session.get('session_id') in game_sessions if 'session_id' in session else False
+        'session_memory_mb': round(memory.total / 2**20, 1),
+        'memory_budget_mb': MEMORY_BUDGET_MB,
+        'hibernated_sessions': get_session_store().count(),
+        'has_game_state': session.get('session_id') in game_sessions if 'session_id' in session else False,
+        'rss_mb': _rss_mb(),
+        'startup': startup_timings
+    })
+
+def _rss_mb():
+    """Resident memory of this process in MB (None where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20, 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _record_first_response(response):
+    """Time from process start to the first response (the cold start users see)"""
+    if 'first_response_ms' not in startup_timings:
+        startup_timings['first_response_ms'] = round((time.perf_counter() - STARTUP_STARTED) * 1000, 1)
+        startup_timings['first_response_pid'] = os.getpid()
+    return response
+
+def create_app():
+    """Build the Flask app
+    
+    Everything built here is shared by all workers when gunicorn preloads the
+    app: the asset bundles, the compiled index template and the serialized
+    catalog response.
+    """
+    started = time.perf_counter()
+    app = Flask(__name__)
+    CORS(app, supports_credentials=True)
+    init_compression(app)  # gzip/br/zstd negotiated via Accept-Encoding
+    
+    # Session configuration
+    app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(32))
+    app.config['SESSION_TYPE'] = 'filesystem'
+    app.config['PERMANENT_SESSION_LIFETIME'] = 86400 * 7  # 7 days
+    app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+    app.config['SESSION_COOKIE_SECURE'] = False  # Set to True if using HTTPS in production
+    app.config['SESSION_COOKIE_HTTPONLY'] = True
+    
+    app.register_blueprint(bp)
+    app.after_request(_record_first_response)
+    new_workload()  # Fail at startup, not on the first game, if the workload config is bad
+    setup_done = time.perf_counter()
+    
+    init_assets(app)  # Bundled, fingerprinted, pre-compressed JS/CSS under /assets/
+    assets_done = time.perf_counter()
+    
+    app.jinja_env.get_template('index.html')  # Compile now, not on the first page view
+    templates_done = time.perf_counter()
+    
+    app.config['CATALOG_JSON'] = app.json.dumps({
+        'gpus': GPU_CATALOG,
+        'regions': REGIONS,
+        # For display purposes only (not purchasable)
+        'cooling_info': COOLING_TIERS,
+        'scheduler_info': SCHEDULER_TIERS
     })
+    catalog_done = time.perf_counter()
+    
+    item_costs()  # Calibrate the session memory model once, before workers fork
+    memory_model_done = time.perf_counter()
+    
+    startup_timings.update({
+        'app_setup_ms': round((setup_done - started) * 1000, 1),
+        'assets_ms': round((assets_done - setup_done) * 1000, 1),
+        'templates_ms': round((templates_done - assets_done) * 1000, 1),
+        'catalog_ms': round((catalog_done - templates_done) * 1000, 1),
+        'memory_model_ms': round((memory_model_done - catalog_done) * 1000, 1),
+        'ready_ms': round((memory_model_done - STARTUP_STARTED) * 1000, 1)
+    })
+    print(f"⏱️ Startup: {startup_timings['ready_ms']}ms to ready "
+          f"(imports {startup_timings['imports_ms']}ms, app {startup_timings['app_setup_ms']}ms, "
+          f"assets {startup_timings['assets_ms']}ms, "
+          f"templates {startup_timings['templates_ms']}ms, catalog {startup_timings['catalog_ms']}ms)", flush=True)
+    return app
+
+app = create_app()
 
 if __name__ == '__main__':
     print("🎮 GPU Tycoon starting...")
@@ -0,0 +1,233 @@
+"""Build-free static asset pipeline: bundled, fingerprinted, pre-compressed
+
+At startup the page's scripts and stylesheet are concatenated into one
+bundle each, minified, and named after a hash of their content
+(app.3f9c2a1b7d4e.js). Every encoding the server supports is computed once
+at its highest level. Bundles are served from memory with
+`Cache-Control: immutable`: a changed file gets a new URL, so browsers never
+need to revalidate. Templates get the current URLs from asset_url().
+"""
+import gzip
+import hashlib
+import os
+import re
+
+from flask import abort, current_app, request
+
+from compression import ENCODERS
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+# Bundle name -> source files, in load order
+BUNDLES = {
+    'app.js': ['js/audio.js', 'js/education.js', 'js/clusters.js', 'js/ui.js', 'js/game.js'],
+    'style.css': ['css/style.css']
+}
+
+MIME_TYPES = {'.js': 'application/javascript', '.css': 'text/css'}
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+# One-time compression, so the slowest (smallest) levels are affordable
+STATIC_ENCODERS = {
+    'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+    'br': (lambda data: brotli.compress(data, quality=11)) if brotli else None,
+    'zstd': (lambda data: zstandard.ZstdCompressor(level=19).compress(data)) if zstandard else None
+}
+
+# Characters after which a '/' starts a regex literal rather than a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def _skip_quoted(source, start, quote):
+    """Index just past the string literal starting at `start`"""
+    i = start + 1
+    while i < len(source) and source[i] != quote:
+        i += 2 if source[i] == '\\' else 1
+    return i + 1
+
+
+def _skip_regex(source, start):
+    """Index just past the regex literal (and its flags) starting at `start`"""
+    i, in_class = start + 1, False
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            break
+        i += 1
+    i += 1
+    while i < len(source) and source[i].isalpha():
+        i += 1
+    return i
+
+
+def minify_js(source):
+    """Drop comments, indentation and blank lines (literals are kept verbatim)
+
+    Newlines are kept so automatic semicolon insertion behaves as before.
+    """
+    segments = []  # (is_code, text)
+    code = []
+    i, n = 0, len(source)
+    braces = 0
+    template_braces = []  # Brace depth at each open ${ of a template literal
+    last = ''  # Last non-space code character
+
+    def literal(end):
+        nonlocal i
+        segments.append((True, ''.join(code)))
+        code.clear()
+        segments.append((False, source[i:end]))
+        i = end
+
+    while i < n:
+        char = source[i]
+        if char in '"\'':
+            literal(_skip_quoted(source, i, char))
+            last = char
+        elif char == '`' or (char == '}' and template_braces and template_braces[-1] == braces):
+            if char == '}':
+                template_braces.pop()
+            end = i + 1
+            while end < n:
+                if source[end] == '\\':
+                    end += 2
+                elif source[end] == '`':
+                    end += 1
+                    break
+                elif source.startswith('${', end):
+                    end += 2
+                    template_braces.append(braces)
+                    break
+                else:
+                    end += 1
+            literal(end)
+            last = '`'
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end < 0 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2) + 2
+            code.append('\n' if '\n' in source[i:end] else ' ')
+            i = end
+        elif char == '/' and (last == '' or last in REGEX_PRECEDERS):
+            literal(_skip_regex(source, i))
+            last = '/'
+        else:
+            if char == '{':
+                braces += 1
+            elif char == '}':
+                braces -= 1
+            code.append(char)
+            if not char.isspace():
+                last = char
+            i += 1
+    segments.append((True, ''.join(code)))
+
+    # Normalize whitespace in runs of code between literals
+    out = []
+    run = []
+    for is_code, text in segments + [(False, '')]:
+        if is_code:
+            run.append(text)
+            continue
+        joined = re.sub(r'[ \t]+', ' ', ''.join(run))
+        out.append(re.sub(r' ?\n[ \n]*', '\n', joined))
+        run = []
+        out.append(text)
+    return ''.join(out).strip() + '\n'
+
+
+def minify_css(source):
+    """Drop comments and collapse whitespace (strings are kept verbatim)"""
+    strings_or_comments = r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/'
+    source = re.sub(strings_or_comments, lambda m: m.group(1) or '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    return re.sub(r' ?([{};,]) ?', r'\1', source).strip() + '\n'
+
+
+def build_bundle(name, files):
+    """Concatenate and minify a bundle
+
+    Returns:
+        bytes: Minified bundle
+    """
+    sources = []
+    for path in files:
+        with open(os.path.join(STATIC_DIR, path), encoding='utf-8') as f:
+            sources.append(f.read())
+    if name.endswith('.js'):
+        # A ';' between files stops one file's last statement running into the next
+        return ';\n'.join(minify_js(source) for source in sources).encode()
+    return ''.join(minify_css(source) for source in sources).encode()
+
+
+class AssetPipeline:
+    """In-memory fingerprinted bundles and their pre-compressed encodings"""
+
+    def __init__(self, bundles=BUNDLES):
+        self.urls = {}  # Bundle name -> fingerprinted URL
+        self.files = {}  # Fingerprinted file name -> (mimetype, etag, {encoding: bytes})
+        for name, files in bundles.items():
+            data = build_bundle(name, files)
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            stem, ext = os.path.splitext(name)
+            filename = f'{stem}.{digest}{ext}'
+
+            encodings = {None: data}
+            for encoding, encode in STATIC_ENCODERS.items():
+                if encode is not None:
+                    encodings[encoding] = encode(data)
+            self.files[filename] = (MIME_TYPES[ext], digest, encodings)
+            self.urls[name] = f'/assets/{filename}'
+
+    def url(self, name):
+        """Fingerprinted URL of a bundle (for templates)"""
+        return self.urls[name]
+
+    def sizes(self):
+        """Bundle sizes in bytes, raw and per encoding"""
+        return {filename: {encoding or 'identity': len(data) for encoding, data in encodings.items()}
+                for filename, (_, _, encodings) in self.files.items()}
+
+    def serve(self, filename):
+        """View function for /assets/<filename>"""
+        if filename not in self.files:
+            abort(404)
+        mimetype, etag, encodings = self.files[filename]
+
+        # Same preference order as dynamic responses
+        encoding = next((name for name, _ in ENCODERS
+                         if name in encodings and request.accept_encodings.quality(name) > 0), None)
+        response = current_app.response_class(encodings[encoding], mimetype=mimetype)
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE
+        response.vary.add('Accept-Encoding')
+        response.set_etag(f'{etag}-{encoding or "identity"}')
+        return response.make_conditional(request)
+
+
+def init_assets(app):
+    """Build the bundles, serve them under /assets/ and expose asset_url() to templates"""
+    pipeline = AssetPipeline()
+    app.add_url_rule('/assets/<filename>', 'assets', pipeline.serve)
+    app.jinja_env.globals['asset_url'] = pipeline.url
+    app.extensions['assets'] = pipeline
+    return pipeline
@@ -0,0 +1,91 @@
+"""Negotiated response compression for API payloads
+
+State payloads repeat the same keys for every GPU and job, so they shrink
+5-10x. gzip comes from the standard library; brotli and zstd are used when
+their packages (`brotli`, `zstandard`) are installed. The server picks the
+best encoding the client accepts.
+"""
+import threading
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+MIN_COMPRESS_SIZE = 1024  # Bytes - smaller bodies aren't worth the CPU
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript')
+
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4  # Brotli levels above ~5 cost far more CPU per tick
+ZSTD_LEVEL = 3
+
+# zstd compressor contexts are reusable but not thread-safe: keep one per thread
+_local = threading.local()
+
+
+def _gzip(data):
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+def _zstd(data):
+    compressor = getattr(_local, 'zstd', None)
+    if compressor is None:
+        compressor = _local.zstd = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress(data)
+
+
+# Encodings in server preference order
+ENCODERS = [(name, encode) for name, encode, module in (
+    ('zstd', _zstd, zstandard),
+    ('br', _brotli, brotli),
+    ('gzip', _gzip, zlib)
+) if module is not None]
+
+
+def choose_encoding(accept_encodings):
+    """Pick the preferred encoding the client accepts (or None)"""
+    for name, encode in ENCODERS:
+        if accept_encodings.quality(name) > 0:
+            return name, encode
+    return None, None
+
+
+def compress_response(response):
+    """after_request hook: compress eligible responses"""
+    response.vary.add('Accept-Encoding')
+
+    if (response.direct_passthrough or response.is_streamed or
+            response.status_code < 200 or response.status_code >= 300 or
+            'Content-Encoding' in response.headers or
+            not response.mimetype.startswith(COMPRESSIBLE_TYPES)):
+        return response
+
+    name, encode = choose_encoding(request.accept_encodings)
+    if name is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+
+    response.set_data(encode(data))
+    response.headers['Content-Encoding'] = name
+    return response
+
+
+def init_compression(app):
+    """Enable response compression on a Flask app"""
+    app.after_request(compress_response)
@@ -0,0 +1,141 @@
+"""Admission control and load shedding for the job queue
+
+Every arriving job gets a predicted start time: the work queued ahead of it
+(earlier deadlines, EDF order) plus the remaining work of running jobs,
+divided by the compute of the GPUs it may run on (regions within its latency
+budget). Only work that competes for those GPUs counts: running jobs in those
+regions, and each queued job in proportion to the share of its own reachable
+compute that lies there. This is a fluid approximation, cheap enough to run
+on every arrival. Region performance is the right compute for inference too:
+the per-stream cap only bounds MIG slices, which are used only when they keep
+most of a GPU's throughput.
+Work is measured in game seconds and SLA deadlines in wall-clock seconds, so
+the drain time is divided by the game's measured speed (GameState.game_speed).
+
+- Accept: the job is predicted to start before its SLA deadline.
+- Defer: it is predicted to start late. It waits outside the queue (where it
+  costs the scheduler nothing) and is admitted once capacity frees up.
+- Reject: it can never run on the current fleet, its deadline passed while
+  deferred, or the deferral room is full. Rejected jobs count as SLA misses,
+  like shed ones.
+
+Queued jobs whose deadline has already passed are shed while the queue is
+over its target depth, so demand spikes can't grow the queue without bound.
+"""
+import time
+
+from .regions import region_latency
+
+MAX_DEFERRED = 20  # Jobs that can wait outside the queue
+MAX_QUEUE_FACTOR = 4  # Hard cap on the queue, as a multiple of its target depth
+
+
+def job_work(job):
+    """GPU-seconds of a job on a performance-1.0 GPU"""
+    return job.base_duration * job.gpu_count
+
+
+class AdmissionController:
+    """Decides which arriving jobs enter the queue and sheds hopeless ones"""
+
+    def __init__(self):
+        self.deferred = []
+        self.accepted = 0
+        self.rejected = 0
+        self.shed = 0
+        self.deferred_total = 0
+
+    @staticmethod
+    def reachable_pools(game, job):
+        """Region -> pool of the regions within a job's latency budget"""
+        return {region: pool for region, pool in game.region_pools.items()
+                if region_latency(job.origin_region, region) <= job.latency_budget_ms}
+
+    def predict_start(self, game, job, now=None):
+        """Predicted wall-clock start time of a job (None = can never run)"""
+        now = time.time() if now is None else now
+        pools = self.reachable_pools(game, job)
+        gpus = sum(len(pool.gpus) for pool in pools.values())
+        capacity = sum(pool.performance for pool in pools.values())
+        if gpus < job.gpu_count or capacity <= 0:
+            return None
+
+        work_ahead = sum((1.0 - active.progress) * job_work(active) for active in game.active_jobs
+                         if active.region in pools)
+
+        # A queued job competes in proportion to its reachable compute that lies in our regions
+        shares = {}  # (origin region, latency budget) -> share
+        for queued in game.job_queue:
+            if queued.sla_deadline > job.sla_deadline:
+                continue
+            key = (queued.origin_region, queued.latency_budget_ms)
+            if key not in shares:
+                theirs = self.reachable_pools(game, queued)
+                total = sum(pool.performance for pool in theirs.values())
+                overlap = sum(pool.performance for region, pool in theirs.items() if region in pools)
+                shares[key] = overlap / total if total > 0 else 0.0
+            work_ahead += shares[key] * job_work(queued)
+        return now + work_ahead / capacity / game.game_speed
+
+    def admit(self, game, job, target_depth=None):
+        """Decide on an arriving job: 'accept', 'defer' or 'reject'"""
+        if target_depth is None:
+            target_depth = game.target_queue_depth()
+        if len(game.job_queue) >= target_depth * MAX_QUEUE_FACTOR:
+            predicted = None
+        else:
+            predicted = self.predict_start(game, job)
+
+        if predicted is not None and predicted <= job.sla_deadline:
+            self.accepted += 1
+            return 'accept'
+        if predicted is not None and len(self.deferred) < MAX_DEFERRED:
+            self.deferred.append(job)
+            self.deferred_total += 1
+            return 'defer'
+        self.rejected += 1
+        return 'reject'
+
+    def update(self, game):
+        """Re-check deferred jobs and shed hopeless queued ones
+
+        Returns:
+            tuple: (jobs to add to the queue, queued jobs to drop, deferred jobs rejected)
+        """
+        now = time.time()
+
+        admitted = []
+        expired = []
+        still_deferred = []
+        for job in sorted(self.deferred, key=lambda j: j.sla_deadline):
+            if now > job.sla_deadline:
+                expired.append(job)
+                self.rejected += 1
+                continue
+            predicted = self.predict_start(game, job, now)
+            if predicted is not None and predicted <= job.sla_deadline:
+                admitted.append(job)
+                self.accepted += 1
+            else:
+                still_deferred.append(job)
+        self.deferred = still_deferred
+
+        shed = []
+        excess = len(game.job_queue) - game.target_queue_depth()
+        if excess > 0:
+            late = [job for job in game.job_queue
+                    if job.started_at is None and now > job.sla_deadline]
+            late.sort(key=lambda j: j.sla_deadline)  # Most hopeless first
+            shed = late[:excess]
+            self.shed += len(shed)
+
+        return admitted, shed, expired
+
+    def to_dict(self):
+        return {
+            'accepted': self.accepted,
+            'deferred': len(self.deferred),
+            'deferred_total': self.deferred_total,
+            'rejected': self.rejected,
+            'shed': self.shed
+        }
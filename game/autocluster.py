@@ -0,0 +1,202 @@
+"""Automatic cluster formation sized to recent demand
+
+Every AUTO_CLUSTER_INTERVAL seconds of game time the AutoClusterer looks at
+the shapes of recently arrived jobs (GPU count and VRAM per GPU) and
+re-partitions idle GPUs into homogeneous clusters, per region and GPU type.
+Each job has a natural cluster size for each GPU model:
+max(gpu_count, ceil(vram_per_gpu / gpu_vram)). Idle GPUs are split between
+cluster sizes (and unclustered GPUs for single-GPU work) in proportion to
+the GPUs that demand asks for.
+
+Only idle auto-created clusters are reshaped. Manual clusters, busy clusters
+and contract-reserved GPUs are left alone. Each run reports the expected
+utilization and SLA gain, and a plan that gains nothing is not applied.
+"""
+import math
+from collections import Counter, deque
+
+from .topology import group_compact
+
+AUTO_CLUSTER_INTERVAL = 30.0  # Game seconds between re-partitions
+DEMAND_WINDOW = 200  # Recent job arrivals considered
+MIN_GAIN_PCT = 1.0  # Plans that gain less than this are not applied
+MAX_CLUSTER_SIZE = 8  # Same as GPUCluster.max_size
+
+
+def natural_size(job_shape, vram):
+    """GPUs of `vram` GB a job wants as one unit (1 = no cluster needed)"""
+    gpu_count, vram_per_gpu = job_shape
+    return min(MAX_CLUSTER_SIZE, max(gpu_count, math.ceil(vram_per_gpu / vram)))
+
+
+class AutoClusterer:
+    """Re-partitions idle GPUs into clusters that match the recent job mix"""
+
+    def __init__(self):
+        self.enabled = False
+        self.recent_jobs = deque(maxlen=DEMAND_WINDOW)  # (gpu_count, vram_per_gpu)
+        self.last_run = 0.0
+        self.last_report = None
+
+    def record_job(self, job):
+        """Remember the shape of an arriving job"""
+        self.recent_jobs.append((job.gpu_count, job.vram_per_gpu))
+
+    def maybe_run(self, game):
+        """Run if enabled and the interval has passed"""
+        if not self.enabled or game.game_time - self.last_run < AUTO_CLUSTER_INTERVAL:
+            return None
+        self.last_run = game.game_time
+        return self.run(game)
+
+    def run(self, game):
+        """Plan and (if worthwhile) apply a re-partition of idle GPUs
+
+        Returns:
+            dict: Report of the plan, or None if there is no demand data yet
+        """
+        if not self.recent_jobs:
+            return None
+
+        reserved_ids = game._get_reserved_gpu_ids()
+
+        # Manual and busy clusters keep their GPUs; idle auto clusters may be reshaped
+        fixed_ids = set()
+        reshapeable = []
+        for cluster in game.cluster_manager.clusters:
+            members = [game.gpu_index.get(gpu_id) for gpu_id in cluster.gpu_ids]
+            idle = cluster.current_job is None and all(
+                gpu is not None and gpu.is_available() and gpu.gpu_id not in reserved_ids
+                for gpu in members
+            )
+            if cluster.auto and idle:
+                reshapeable.append(cluster)
+            else:
+                fixed_ids.update(cluster.gpu_ids)
+
+        # Idle GPUs in scope, per (region, GPU type) - clusters never mix either
+        groups = {}
+        for pool in game.region_pools.values():
+            for gpu in pool.free.values():
+                if gpu.gpu_id not in reserved_ids and gpu.gpu_id not in fixed_ids:
+                    groups.setdefault((pool.region, gpu.gpu_type), []).append(gpu)
+
+        # Current partition of those GPUs, as (size, vram) units
+        before_units = []
+        in_reshapeable = set()
+        for cluster in reshapeable:
+            vram = game.gpu_index[cluster.gpu_ids[0]].vram
+            before_units.append((len(cluster.gpu_ids), vram))
+            in_reshapeable.update(cluster.gpu_ids)
+        for gpus in groups.values():
+            before_units.extend((1, gpu.vram) for gpu in gpus if gpu.gpu_id not in in_reshapeable)
+
+        # Proposed partition
+        plan = []
+        after_units = []
+        for gpus in groups.values():
+            cluster_groups = self._partition(gpus)
+            plan.extend(cluster_groups)
+            clustered = sum(len(group) for group in cluster_groups)
+            after_units.extend((len(group), group[0].vram) for group in cluster_groups)
+            after_units.extend([(1, gpus[0].vram)] * (len(gpus) - clustered))
+
+        util_before, hostable_before = self._score(before_units)
+        util_after, hostable_after = self._score(after_units)
+        applied = (util_after - util_before >= MIN_GAIN_PCT or
+                   hostable_after - hostable_before >= MIN_GAIN_PCT)
+
+        created = []
+        if applied:
+            game.cluster_manager.disband_clusters([c.cluster_id for c in reshapeable])
+            created = game.cluster_manager.add_clusters(
+                [[gpu.gpu_id for gpu in group] for group in plan], auto=True
+            )
+
+        self.last_report = {
+            'game_time': round(game.game_time, 1),
+            'applied': applied,
+            'idle_gpus': sum(len(gpus) for gpus in groups.values()),
+            'clusters_disbanded': len(reshapeable) if applied else 0,
+            'clusters_created': len(created),
+            'cluster_sizes': dict(Counter(len(group) for group in plan)) if applied else {},
+            'expected_utilization_pct': {'before': util_before, 'after': util_after},
+            'hostable_jobs_pct': {'before': hostable_before, 'after': hostable_after},
+            'utilization_gain_pct': round(util_after - util_before, 1),
+            'sla_gain_pct': round(hostable_after - hostable_before, 1)
+        }
+        return self.last_report
+
+    def _partition(self, gpus):
+        """Split same-type GPUs into clusters sized to the demand they can serve"""
+        vram = gpus[0].vram
+        demand = Counter()
+        for shape in self.recent_jobs:
+            if shape[1] <= MAX_CLUSTER_SIZE * vram:
+                size = natural_size(shape, vram)
+                demand[size] += size  # Weighted by GPUs asked for
+        total = sum(demand.values())
+        if not total:
+            return []
+
+        plan = []
+        remaining = list(gpus)
+        for size in sorted((s for s in demand if s > 1), reverse=True):
+            count = int(len(gpus) * demand[size] / total) // size
+            if count:
+                cluster_groups = group_compact(remaining, size, count)
+                plan.extend(cluster_groups)
+                taken = {gpu.gpu_id for group in cluster_groups for gpu in group}
+                remaining = [gpu for gpu in remaining if gpu.gpu_id not in taken]
+        return plan
+
+    def _score(self, units):
+        """Expected utilization and share of recent jobs hostable, for (size, vram) units
+
+        Utilization: per GPU model, how much of the idle capacity is shaped like
+        the demand for that model (sum over sizes of min(demand share,
+        capacity share)). Hostable: recent jobs that fit on at least one unit,
+        so they can start instead of waiting in the queue toward an SLA miss.
+
+        Returns:
+            tuple: (expected utilization %, hostable jobs %)
+        """
+        if not units:
+            return 0.0, 0.0
+
+        capacity = {}  # vram -> Counter(size -> GPUs)
+        for size, vram in units:
+            capacity.setdefault(vram, Counter())[size] += size
+
+        matched = 0.0
+        total_gpus = 0
+        for vram, by_size in capacity.items():
+            gpus = sum(by_size.values())
+            total_gpus += gpus
+            demand = Counter()
+            for shape in self.recent_jobs:
+                if shape[1] <= MAX_CLUSTER_SIZE * vram:
+                    size = natural_size(shape, vram)
+                    demand[size] += size
+            wanted = sum(demand.values())
+            if wanted:
+                share = sum(min(demand[size] / wanted, by_size[size] / gpus) for size in by_size)
+                matched += share * gpus
+
+        singles = Counter(vram for size, vram in units if size == 1)
+        cluster_vram = max((size * vram for size, vram in units if size > 1), default=0)
+        hostable = 0
+        for gpu_count, vram_per_gpu in self.recent_jobs:
+            if cluster_vram >= vram_per_gpu or \
+                    sum(n for vram, n in singles.items() if vram >= vram_per_gpu) >= gpu_count:
+                hostable += 1
+
+        return (round(matched / total_gpus * 100, 1),
+                round(hostable / len(self.recent_jobs) * 100, 1))
+
+    def to_dict(self):
+        return {
+            'enabled': self.enabled,
+            'interval': AUTO_CLUSTER_INTERVAL,
+            'last_report': self.last_report
+        }
@@ -16,6 +16,8 @@ class GPUCluster:
         self.gpu_ids = gpu_ids
         self.current_job = None
         self.max_size = 8  # Max GPUs per cluster (like DGX H100)
+        self.label = None  # Optional player-chosen tag
+        self.auto = False  # Created by the auto-clusterer (may be reshaped)
     
     def can_add_gpu(self, gpu_id):
         """Check if we can add another GPU to this cluster"""
@@ -86,7 +88,9 @@ class GPUCluster:
             'is_homogeneous': self.is_homogeneous(gpus),
             'gpu_types': self.get_gpu_types(gpus),
             'primary_type': self.get_primary_gpu_type(gpus),
-            'has_job': self.current_job is not None
+            'has_job': self.current_job is not None,
+            'label': self.label,
+            'auto': self.auto
         }
 
 
@@ -133,6 +137,11 @@ class ClusterManager:
             types_str = ', '.join(gpu_types)
             return False, f"Can only cluster same GPU types! ({types_str} are different)"
 
+        # Clusters need a local interconnect: all GPUs in one region
+        regions = set(g.region for g in cluster_gpus)
+        if len(regions) > 1:
+            return False, "Can only cluster GPUs in the same region!"
+
         cluster = GPUCluster(gpu_ids)
         self.clusters.append(cluster)
 
@@ -165,6 +174,8 @@ class ClusterManager:
             existing_type = cluster_gpus[0].gpu_type
             if new_gpu.gpu_type != existing_type:
                 return False, f"Can only add {existing_type} to this cluster (tried to add {new_gpu.gpu_type})"
+            if new_gpu.region != cluster_gpus[0].region:
+                return False, f"Can only add GPUs in {cluster_gpus[0].region} to this cluster"
 
         # Try to add
         if cluster.add_gpu(gpu_id):
@@ -208,6 +219,51 @@ class ClusterManager:
         self.clusters.remove(cluster)
         return True, "Cluster disbanded"
     
+    def add_clusters(self, gpu_id_groups, auto=False):
+        """Create clusters from pre-validated GPU ID groups in one pass
+        
+        Returns:
+            list: IDs of the new clusters
+        """
+        new_clusters = [GPUCluster(list(gpu_ids)) for gpu_ids in gpu_id_groups]
+        for cluster in new_clusters:
+            cluster.auto = auto
+        self.clusters.extend(new_clusters)
+        return [cluster.cluster_id for cluster in new_clusters]
+    
+    def disband_clusters(self, cluster_ids):
+        """Disband many clusters at once (busy clusters are kept)
+        
+        Returns:
+            tuple: (disbanded cluster IDs, busy cluster IDs)
+        """
+        wanted = set(cluster_ids)
+        disbanded, busy, kept = [], [], []
+        for cluster in self.clusters:
+            if cluster.cluster_id not in wanted:
+                kept.append(cluster)
+            elif cluster.current_job is not None:
+                busy.append(cluster.cluster_id)
+                kept.append(cluster)
+            else:
+                disbanded.append(cluster.cluster_id)
+        self.clusters = kept
+        return disbanded, busy
+    
+    def label_clusters(self, cluster_ids, label):
+        """Set the label of many clusters at once
+        
+        Returns:
+            list: IDs of the relabeled clusters
+        """
+        wanted = set(cluster_ids)
+        labeled = []
+        for cluster in self.clusters:
+            if cluster.cluster_id in wanted:
+                cluster.label = label
+                labeled.append(cluster.cluster_id)
+        return labeled
+    
     def get_cluster(self, cluster_id):
         """Get cluster by ID"""
         for cluster in self.clusters:
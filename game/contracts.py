@@ -1,4 +1,5 @@
 """Enterprise contract system"""
+import bisect
 import time
 
 # Contract definitions for enterprise GPU deals
@@ -237,14 +238,31 @@ class ContractManager:
     def __init__(self):
         self.contracts = {}
         self.initialize_contracts()
+        
+        # Eligibility cache - requirements only depend on the GPU fleet, revenue
+        # thresholds and contract status, so results are reused until one changes
+        self._revenue_thresholds = sorted(set(c.requires['min_revenue'] for c in self.contracts.values()))
+        self._eligibility = None  # Cached get_available_contracts() result
+        self._available_dicts = None  # Cached JSON for the 'available' section
+        self._revenue_band = None  # Number of revenue thresholds reached when cached
     
     def initialize_contracts(self):
         """Initialize all available contracts"""
         for contract_id in CONTRACTS_CATALOG.keys():
             self.contracts[contract_id] = Contract(contract_id)
     
+    def invalidate_eligibility(self):
+        """Drop cached eligibility (call when GPUs are bought/sold or a contract changes status)"""
+        self._eligibility = None
+        self._available_dicts = None
+    
     def get_available_contracts(self, game_state):
         """Get contracts that player is eligible for"""
+        # Crossing a revenue threshold is the only change we detect ourselves
+        revenue_band = bisect.bisect_right(self._revenue_thresholds, game_state.total_revenue)
+        if self._eligibility is not None and revenue_band == self._revenue_band:
+            return self._eligibility
+        
         available = []
         for contract in self.contracts.values():
             if contract.status == 'available':
@@ -254,7 +272,11 @@ class ContractManager:
                     'eligible': meets_reqs,
                     'issues': issues
                 })
-        return sorted(available, key=lambda x: x['contract'].priority)
+        
+        self._eligibility = sorted(available, key=lambda x: x['contract'].priority)
+        self._available_dicts = None
+        self._revenue_band = revenue_band
+        return self._eligibility
     
     def get_active_contracts(self):
         """Get all active contracts"""
@@ -282,16 +304,18 @@ class ContractManager:
     def to_dict(self, game_state):
         """Convert manager state to dictionary"""
         available = self.get_available_contracts(game_state)
-        
-        return {
-            'available': [
+        if self._available_dicts is None:
+            self._available_dicts = [
                 {
                     'contract': a['contract'].to_dict(),
                     'eligible': a['eligible'],
                     'issues': a['issues']
                 }
                 for a in available
-            ],
+            ]
+        
+        return {
+            'available': self._available_dicts,
             'active': [c.to_dict() for c in self.get_active_contracts()],
             'negotiating': [c.to_dict() for c in self.get_negotiating_contracts()],
             'total_reserved_gpus': self.get_total_reserved_gpus(),
@@ -0,0 +1,161 @@
+"""Analytic capacity planning: M/M/c (Erlang C) forecasts of the job queue
+
+Arrivals are measured per job class (job type and GPU count) over a sliding
+window of game time. Service times come from GPU_CATALOG performance, the
+same way Job.start computes a job's duration. The fleet is modelled as one
+M/M/c queue whose servers are blocks of the load-weighted mean GPU count:
+
+- Utilization: offered GPU load / GPUs
+- P(wait) via Erlang C, mean queue wait C * S / (n - A)
+- SLA attainment per class: P(wait <= SLA window) = 1 - C * e^(-(n - A) * w / S)
+
+Rates and service times are in game seconds. SLA windows are wall-clock
+seconds (see Job), so they are converted with the game's measured speed.
+
+A forecast is a handful of float operations per job class plus an Erlang B
+recursion over the servers, so it can be asked on every shop hover, for the
+current fleet or for the fleet plus N GPUs of some type.
+"""
+import math
+from collections import Counter, deque
+
+from .gpus import GPU_CATALOG
+
+ARRIVAL_WINDOW = 120.0  # Game seconds of arrivals measured
+MISSED_SLA_PAYOUT = 0.7  # Same penalty as Job.calculate_payout
+
+
+def erlang_c(servers, offered_load):
+    """Probability an arrival has to wait in an M/M/c queue (1.0 if overloaded)"""
+    if offered_load >= servers:
+        return 1.0
+    erlang_b = 1.0
+    for k in range(1, servers + 1):
+        erlang_b = offered_load * erlang_b / (k + offered_load * erlang_b)
+    rho = offered_load / servers
+    return erlang_b / (1.0 - rho * (1.0 - erlang_b))
+
+
+class CapacityForecaster:
+    """Measures arrivals per job class and forecasts queue behaviour analytically"""
+
+    def __init__(self):
+        self.arrivals = deque()  # (game_time, class key, job stats)
+        self.classes = {}  # class key -> [count, duration, vram, sla window, payout] sums
+        self.first_arrival = None
+
+    def record_arrival(self, job, game_time):
+        """Count an arriving job (offered load, whether or not it is admitted)"""
+        key = (job.job_type, job.gpu_count)
+        stats = (1, job.base_duration, job.vram_per_gpu, job.sla_deadline - job.created_at, job.base_payout)
+        self.arrivals.append((game_time, key, stats))
+        sums = self.classes.setdefault(key, [0.0] * len(stats))
+        for i, value in enumerate(stats):
+            sums[i] += value
+        if self.first_arrival is None:
+            self.first_arrival = game_time
+        self._expire(game_time)
+
+    def _expire(self, game_time):
+        while self.arrivals and game_time - self.arrivals[0][0] > ARRIVAL_WINDOW:
+            _, key, stats = self.arrivals.popleft()
+            sums = self.classes[key]
+            for i, value in enumerate(stats):
+                sums[i] -= value
+            if sums[0] < 0.5:
+                del self.classes[key]
+
+    def forecast(self, fleet, game_time, game_speed=1.0):
+        """Forecast utilization, queue wait and SLA attainment for a fleet
+
+        Args:
+            fleet: Counter of GPU type -> GPUs available for jobs
+            game_time: Current game time (sets the arrival measurement window)
+            game_speed: Game seconds per wall second (SLA windows are wall-clock)
+
+        Returns:
+            dict: Forecast, or None if no arrivals have been measured yet
+        """
+        self._expire(game_time)
+        if not self.classes or self.first_arrival is None:
+            return None
+        window = min(ARRIVAL_WINDOW, max(game_time - self.first_arrival, 1.0))
+        gpus = sum(fleet.values())
+
+        classes = []
+        for (job_type, gpu_count), sums in self.classes.items():
+            count, duration, vram, sla_window, payout = sums
+            rate = count / window
+            service = self._service_time(fleet, duration / count, vram / count)
+            # Mean SLA window, in game seconds like the rates and service times
+            classes.append((job_type, gpu_count, rate, service, sla_window / count * game_speed, payout / count))
+
+        servable = [c for c in classes if c[3] is not None and c[1] <= gpus]
+        total_rate = sum(c[2] for c in classes)
+        gpu_load = sum(rate * gpu_count * service for _, gpu_count, rate, service, _, _ in servable)
+        job_load = sum(rate * service for _, _, rate, service, _, _ in servable)
+
+        utilization = gpu_load / gpus if gpus else float('inf')
+        stable = utilization < 1.0
+        if servable and stable:
+            servers = max(1, int(gpus / (gpu_load / job_load)))  # Blocks of the mean GPU count
+            offered = servers * utilization  # Load rescaled to the whole number of servers
+            mean_service = job_load / sum(c[2] for c in servable)
+            p_wait = erlang_c(servers, offered)
+            drain_rate = (servers - offered) / mean_service
+            mean_wait = p_wait / drain_rate if drain_rate > 0 else float('inf')
+        else:
+            p_wait, drain_rate, mean_wait = 1.0, 0.0, float('inf')
+
+        by_class = {}
+        attained_rate = 0.0
+        revenue_rate = 0.0
+        served_share = min(1.0, 1.0 / utilization) if utilization > 0 else 1.0
+        for job_type, gpu_count, rate, service, sla_window, payout in classes:
+            if service is None or gpu_count > gpus:
+                sla = 0.0
+                served = 0.0
+            else:
+                sla = 1.0 - p_wait * math.exp(-drain_rate * sla_window) if stable else 0.0
+                served = served_share
+            attained_rate += rate * sla
+            revenue_rate += rate * served * payout * (sla + MISSED_SLA_PAYOUT * (1.0 - sla))
+            by_class[f'{job_type}_{gpu_count}gpu'] = {
+                'arrivals_per_min': round(rate * 60, 2),
+                'service_time': round(service, 2) if service is not None else None,
+                'sla_attainment_pct': round(sla * 100, 1)
+            }
+
+        return {
+            'gpus': gpus,
+            'utilization_pct': round(min(utilization, 1.0) * 100, 1),
+            'stable': stable,
+            'wait_probability_pct': round(p_wait * 100, 1),
+            'mean_queue_wait': round(mean_wait, 2) if math.isfinite(mean_wait) else None,
+            'sla_attainment_pct': round(attained_rate / total_rate * 100, 1),
+            'revenue_per_hour': round(revenue_rate * 3600, 2),
+            'classes': by_class
+        }
+
+    @staticmethod
+    def _service_time(fleet, base_duration, vram_per_gpu):
+        """Mean duration of a job on the GPU models that can hold it (None = none can)"""
+        eligible = {gpu_type: count for gpu_type, count in fleet.items()
+                    if count and GPU_CATALOG[gpu_type]['vram'] >= vram_per_gpu}
+        if not eligible:
+            # Too big for any single GPU: it runs on a cluster pooling every model's VRAM
+            eligible = {gpu_type: count for gpu_type, count in fleet.items() if count}
+        if not eligible:
+            return None
+
+        performance = sum(GPU_CATALOG[gpu_type]['performance'] * count
+                          for gpu_type, count in eligible.items())
+        return base_duration / (performance / sum(eligible.values()))
+
+
+def fleet_with(fleet, gpu_type=None, count=0):
+    """Copy of a fleet Counter with `count` more GPUs of `gpu_type`"""
+    fleet = Counter(fleet)
+    if gpu_type is not None and count:
+        fleet[gpu_type] += count
+    return fleet
@@ -1,18 +1,50 @@
 """Main game state management"""
 import time
-from collections import deque
+from collections import Counter, deque
 import random
 from .gpus import GPU, GPU_CATALOG
-from .jobs import Job, JobGenerator, Scheduler
+from .jobs import (Job, BatchJob, Scheduler,
+                   DEFAULT_BATCH_MAX_SIZE)
+from .workload import Workload
 from .economy import Economy, COOLING_TIERS, SCHEDULER_TIERS, get_network_penalty
 from .contracts import ContractManager
 from .marketing import MarketingManager
-from .clusters import ClusterManager
+from .clusters import ClusterManager, GPUCluster
+from .autocluster import AutoClusterer
+from .admission import AdmissionController
+from .forecast import CapacityForecaster, fleet_with
+from .history import MetricsHistory, METRICS as HISTORY_METRICS, RESOLUTIONS as HISTORY_RESOLUTIONS
+from .topology import group_compact
+from .regions import (REGIONS, DEFAULT_REGION, ROUTING_ORDER, RegionPool,
+                      region_latency, cross_region_penalty, get_unlocked_regions)
+
+MAX_BULK_GPUS = 500  # Largest single bulk purchase
+MAX_CLUSTER_LABEL = 32
+MAX_BATCH_SIZE = 32  # Upper bound for the tunable batch size
+MAX_HISTORY_POINTS = 1000  # Most points one history query returns
+MAX_GAME_SPEED = 20.0  # Fastest speed button (game seconds per wall second)
+SPEED_SMOOTHING = 0.2  # Weight of the newest sample in the measured game speed
+MAX_SPEED_SAMPLE_GAP = 2.0  # Wall seconds between updates beyond which the game was paused
+
+# Top-level sections of GameState.to_dict(), selectable with ?fields=
+STATE_SECTIONS = (
+    'cash', 'total_revenue', 'total_power_cost', 'gpus', 'job_queue', 'active_jobs',
+    'cooling_tier', 'scheduler_tier', 'network_penalty_pct', 'auto_assign', 'pue',
+    'capacity', 'stats', 'unlocks', 'contracts', 'marketing', 'achievements',
+    'victory', 'active_event', 'clusters', 'unclustered_gpus', 'regions', 'placement_mode',
+    'auto_cluster', 'batching', 'admission'
+)
 
 class GameState:
     """Central game state manager"""
     
-    def __init__(self):
+    def __init__(self, workload=None):
+        """
+        Args:
+            workload: Arrival process and job shapes (None = fixed-rate arrivals, stock shapes)
+        """
+        if workload is not None:
+            self.workload = workload
         self.reset()
     
     def reset(self):
@@ -23,8 +55,12 @@ class GameState:
         
         # GPU inventory
         self.gpus = []
+        self.gpu_index = {}  # gpu_id -> GPU
         self.next_gpu_id = 1
         
+        # Per-region GPU pools with free-capacity indexes
+        self.region_pools = {region: RegionPool(region) for region in REGIONS}
+        
         # Jobs
         self.job_queue = []
         self.active_jobs = []
@@ -35,8 +71,11 @@ class GameState:
         # Marketing
         self.marketing_manager = MarketingManager()
         
-        # GPU Clusters (drag-and-drop grouping)
+        # GPU Clusters (drag-and-drop grouping, or sized to demand automatically)
         self.cluster_manager = ClusterManager()
+        self.auto_clusterer = AutoClusterer()
+        self.admission = AdmissionController()
+        self.forecaster = CapacityForecaster()
         
         # Note: Cooling, networking, and schedulers are now AUTO-UPGRADED
         # - Cooling: Based on GPU inventory (auto-detected)
@@ -45,6 +84,10 @@ class GameState:
         
         # Job assignment mode
         self.auto_assign = True  # Start with automation (Paperclips style)
+        self.placement_mode = 'compact'  # Topology-aware packing (see topology.py)
+        self.batch_max_size = DEFAULT_BATCH_MAX_SIZE  # Inference batching (1 = off)
+        self.batches_completed = 0
+        self.batched_jobs_completed = 0
         
         # Timing - use game time instead of wall clock for speed consistency
         self.game_time = 0.0  # Accumulated game time
@@ -52,16 +95,26 @@ class GameState:
         self.base_job_spawn_interval = 2.0  # Base spawn interval (modified by marketing + GPU count) - faster for better pacing
         self.job_spawn_interval = 2.0  # Actual spawn interval
         self.last_event_check_time = 0.0  # Game time of last event check
+        # Game seconds per wall second as the client actually ticks (job SLAs are wall-clock)
+        self.game_speed = 1.0
+        self.last_update_wall = None
+        
+        # Workload: arrival process + job shapes (kept across resets so benchmarks stay configured)
+        if not hasattr(self, 'workload'):
+            self.workload = Workload()
         
         # Stats
         self.jobs_completed = 0
         self.sla_misses = 0
         # Rolling SLA history (recent jobs window)
         self.sla_history = deque(maxlen=200)
+        # Metrics over time for the capacity dashboard (constant size)
+        self.history = MetricsHistory()
         
         # Victory & Achievements
         self.victory_achieved = False
         self.victory_type = None
+        self.victory_time = None  # Game time the victory was achieved
         self.achievements = set()
         
         # Events
@@ -78,6 +131,7 @@ class GameState:
         
         # Accumulate game time (for speed-independent timing)
         self.game_time += dt
+        self._measure_game_speed(dt)
         
         # Check for random events (every 60 seconds of game time)
         if self.game_time - self.last_event_check_time >= 60:
@@ -90,11 +144,22 @@ class GameState:
             if self.active_event['time_remaining'] <= 0:
                 self.active_event = None
         
-        # Spawn new jobs (based on game time)
-        if self.game_time - self.last_job_spawn_time >= self.job_spawn_interval:
-            self._spawn_job()
+        # Spawn new jobs (based on game time) - several may arrive in one tick
+        for record in self.workload.arrivals(dt, 1.0 / self.job_spawn_interval):
+            self._spawn_job(record)
             self.last_job_spawn_time = self.game_time
         
+        # Admit deferred jobs that can now make their SLA, shed hopeless queued ones
+        admitted, shed, expired = self.admission.update(self)
+        self.job_queue.extend(admitted)
+        for job in shed:
+            self.job_queue.remove(job)
+            self.sla_history.append(0)
+        self.sla_history.extend(0 for _ in expired)  # Deferred until their deadline passed
+        
+        # Periodically re-shape idle GPUs into clusters (if enabled)
+        self.auto_clusterer.maybe_run(self)
+        
         # Update active jobs
         self._update_jobs(dt)
         
@@ -120,9 +185,99 @@ class GameState:
         # Check for victory conditions
         if not self.victory_achieved:
             self._check_victory()
+            if self.victory_achieved:
+                self.victory_time = self.game_time
+        
+        if self.history.due(self.game_time):
+            self.history.record(self.game_time, self._history_sample())
+    
+    def _measure_game_speed(self, dt):
+        """Smooth the ratio of game time to wall time between updates"""
+        now = time.time()
+        if self.last_update_wall is not None:
+            elapsed = now - self.last_update_wall
+            if 0 < elapsed <= MAX_SPEED_SAMPLE_GAP:  # Longer gaps are pauses, not pace
+                sample = min(dt / elapsed, MAX_GAME_SPEED)
+                self.game_speed += SPEED_SMOOTHING * (sample - self.game_speed)
+        self.last_update_wall = now
+    
+    def _history_sample(self):
+        """Current values of the metrics kept in self.history"""
+        total_gpus = len(self.gpus)
+        reserved_gpus = self.contract_manager.get_total_reserved_gpus()
+        utilization = sum(g.utilization for g in self.gpus) / max(total_gpus, 1)
+        sla_rate = sum(self.sla_history) / len(self.sla_history) if self.sla_history else 1.0
+        return {
+            'cash': self.cash,
+            'total_revenue': self.total_revenue,
+            'total_power_cost': self.total_power_cost,
+            'utilization_pct': utilization * 100,
+            'queue_depth': len(self.job_queue),
+            'reserved_gpus': reserved_gpus,
+            'available_gpus': total_gpus - reserved_gpus,
+            'sla_rate_pct': sla_rate * 100
+        }
     
-    def _spawn_job(self):
-        """Spawn a new job based on current phase"""
+    def get_history(self, window, points, metrics=None):
+        """Metrics over the last `window` game seconds, downsampled to `points` points
+        
+        Returns:
+            tuple: (success, history dict or error message)
+        """
+        max_window = HISTORY_RESOLUTIONS[-1][0] * HISTORY_RESOLUTIONS[-1][1]
+        try:
+            window = float(window)
+            points = int(points)
+        except (TypeError, ValueError):
+            return False, "Window and points must be numbers"
+        if not 0 < window <= max_window:
+            return False, f"Window must be between 0 and {max_window} seconds"
+        if not 1 <= points <= MAX_HISTORY_POINTS:
+            return False, f"Points must be between 1 and {MAX_HISTORY_POINTS}"
+        unknown = [metric for metric in metrics or [] if metric not in HISTORY_METRICS]
+        if unknown:
+            return False, f"Unknown metrics: {', '.join(unknown)}"
+        return True, self.history.query(self.game_time, window, points, metrics)
+    
+    def resume(self, idle_seconds, catch_up_seconds=0, step=1.0):
+        """Resume a game that was hibernated for idle_seconds of wall time
+
+        Job SLAs are tracked in wall-clock time, so the idle period is shifted
+        out of every job timestamp (the game was paused, not neglected). Then
+        up to catch_up_seconds of game time are simulated in `step` increments.
+        """
+        batch_members = [member for job in self.active_jobs for member in job.members if member is not job]
+        jobs = self.job_queue + self.active_jobs + batch_members + self.admission.deferred
+        
+        # ID counters are per process: after a restart they must not reuse this game's IDs
+        # (GPU.slice_jobs is keyed by job ID)
+        Job._next_id = max([Job._next_id] + [job.job_id + 1 for job in jobs])
+        GPUCluster._next_id = max([GPUCluster._next_id] +
+                                  [cluster.cluster_id + 1 for cluster in self.cluster_manager.clusters])
+        
+        for job in jobs:
+            job.created_at += idle_seconds
+            job.sla_deadline += idle_seconds
+            if job.started_at is not None:
+                job.started_at += idle_seconds
+            if job.last_sync_time is not None:
+                job.last_sync_time += idle_seconds
+
+        # Catch-up runs faster than real time: it must not count as the player's speed
+        game_speed = self.game_speed
+        remaining = min(idle_seconds, catch_up_seconds)
+        while remaining > 0:
+            self.update(min(step, remaining))
+            remaining -= step
+        self.game_speed = game_speed
+        self.last_update_wall = None
+
+    def _spawn_job(self, record=None):
+        """Spawn a new job based on current phase
+        
+        Args:
+            record: Arrival record from the workload (None = draw from the phase mix)
+        """
         # Apply marketing multipliers
         job_value_multiplier = self.marketing_manager.get_job_value_multiplier()
         sla_extension = self.marketing_manager.get_sla_extension()
@@ -137,22 +292,27 @@ class GameState:
 
         # Queue-aware backpressure to avoid SLA spiral when scaling
         backlog = len(self.job_queue)
-        target_queue_depth = 3 + max(0, available_gpu_count // 4)
-        
-        # Dynamic SLA extension when backlog grows
-        backlog_sla_extension = 0
-        if backlog > target_queue_depth:
-            backlog_sla_extension = min(20, (backlog - target_queue_depth) * 2)
+        target_queue_depth = self.target_queue_depth(available_gpu_count)
 
         # Generate job with awareness of current infrastructure
-        if backlog < target_queue_depth * 2:
-            job = JobGenerator.generate_job(
-                self.total_revenue, 
-                job_value_multiplier, 
-                sla_extension + backlog_sla_extension,
-                available_gpu_count
-            )
+        job = self.workload.create_job(
+            record,
+            self.total_revenue, 
+            job_value_multiplier, 
+            sla_extension,
+            available_gpu_count
+        )
+        if job.origin_region not in REGIONS:
+            job.origin_region = self._pick_origin_region()
+        self.auto_clusterer.record_job(job)  # Demand counts even if the job is turned away
+        self.forecaster.record_arrival(job, self.game_time)
+        
+        # Admission control: queue it only if it can start within its SLA
+        decision = self.admission.admit(self, job, target_queue_depth)
+        if decision == 'accept':
             self.job_queue.append(job)
+        elif decision == 'reject':
+            self.sla_history.append(0)
         
         # Update job spawn interval based on marketing AND GPU count
         # More GPUs = more jobs needed to keep them busy
@@ -190,21 +350,26 @@ class GameState:
         for job in completed:
             self.active_jobs.remove(job)
             
-            # Calculate payout
-            payout = job.calculate_payout()
-            self.cash += payout
-            self.total_revenue += payout
-            self.jobs_completed += 1
-            
-            if job.is_sla_missed():
-                self.sla_misses += 1
-                self.sla_history.append(0)
-            else:
-                self.sla_history.append(1)
+            # Pay out each request on its own (a batch settles all its members)
+            for member in job.members:
+                member.progress = 1.0
+                payout = member.calculate_payout()
+                self.cash += payout
+                self.total_revenue += payout
+                self.jobs_completed += 1
+                
+                if member.is_sla_missed():
+                    self.sla_misses += 1
+                    self.sla_history.append(0)
+                else:
+                    self.sla_history.append(1)
+            if job.batch_size > 1:
+                self.batches_completed += 1
+                self.batched_jobs_completed += job.batch_size
             
-            # Free up GPUs
+            # Free up GPUs (or just the job's MIG slices)
             for gpu in job.assigned_gpus:
-                gpu.clear_job()
+                gpu.release(job)
 
             # Also clear cluster busy flag if this job was running on a cluster
             # Find any cluster that contains all assigned GPUs
@@ -217,48 +382,150 @@ class GameState:
                     break
     
     def _schedule_jobs(self):
-        """Try to schedule waiting jobs - cluster-aware with EDF ordering"""
+        """Try to schedule waiting jobs - locality- and cluster-aware with EDF ordering
+        
+        Each job tries its origin region first, then the other regions nearest-first
+        while they are within its latency budget. Regions without enough idle GPUs
+        are skipped using their free-capacity index, without scanning their GPUs.
+        """
         if not self.job_queue or not self.gpus:
             return
 
-        # Get GPUs that are NOT reserved by contracts
-        available_gpus = self._get_available_gpus()
-        if not available_gpus:
-            return
+        # GPUs reserved by contracts and GPUs bound to clusters
+        reserved_ids = self._get_reserved_gpu_ids()
+        clusters_by_region = self._get_clusters_by_region()
+        clustered_ids = {gpu_id for cluster in self.cluster_manager.clusters for gpu_id in cluster.gpu_ids}
 
-        # Get current network penalty (auto-scales with GPU count)
-        network_penalty = get_network_penalty(len(self.gpus))
-
-        # New cluster-aware scheduling with earliest-deadline-first (EDF)
         placed = []
-        for job in sorted(self.job_queue[:], key=lambda j: j.sla_deadline):
+        for job in sorted(self._plan_batches(), key=lambda j: j.sla_deadline):
             if job.started_at is not None:  # Skip already placed
                 continue
 
-            # Try to place on a cluster first (preferred)
-            cluster_placed = self._try_place_on_cluster(job, available_gpus, network_penalty)
+            for region in ROUTING_ORDER[job.origin_region]:
+                if region_latency(job.origin_region, region) > job.latency_budget_ms:
+                    break  # Regions are sorted nearest-first: the rest are too far
+                if self._try_place_in_region(job, region, reserved_ids,
+                                             clusters_by_region.get(region, []), clustered_ids):
+                    placed.append(job)
+                    break
+
+        # Move placed jobs to active (a batch takes its members off the queue)
+        for job in placed:
+            for member in job.members:
+                if member in self.job_queue:
+                    self.job_queue.remove(member)
+            self.active_jobs.append(job)
+    
+    def _plan_batches(self):
+        """Coalesce queued single-GPU inference jobs into batches (see BatchJob)
+        
+        Compatible jobs (same origin region and latency budget) are grouped in
+        deadline order, up to batch_max_size jobs whose combined VRAM fits the
+        largest idle GPU. Batches are dispatched as soon as they are formed: a
+        partial batch holds every compatible queued job, so holding it back would
+        only idle a GPU. Plans are rebuilt every tick, so a batch that can't be
+        placed yet picks up new arrivals until a GPU frees up.
+        
+        Returns:
+            list: Jobs and batches to try to place this tick
+        """
+        if self.batch_max_size <= 1:
+            return list(self.job_queue)
 
-            if not cluster_placed:
-                # Fall back to individual GPU scheduling
-                # CRITICAL: Only use GPUs that are NOT in clusters for individual scheduling
-                # Clustered GPUs must only be used as complete units
-                unclustered_gpus = [gpu for gpu in available_gpus
-                                   if self.cluster_manager.get_cluster_for_gpu(gpu.gpu_id) is None]
+        max_vram = max((vram for pool in self.region_pools.values()
+                        for vram, count in pool.free_by_vram.items() if count > 0), default=0)
 
-                if unclustered_gpus:
-                    individual_placed = Scheduler.schedule_fifo([job], unclustered_gpus, network_penalty)
-                    if individual_placed:
-                        placed.append(job)
+        plan = []
+        groups = {}
+        for job in self.job_queue:
+            if job.started_at is None and job.job_type == 'inference' and job.gpu_count == 1:
+                groups.setdefault((job.origin_region, job.latency_budget_ms), []).append(job)
             else:
-                placed.append(job)
+                plan.append(job)
 
-        # Move placed jobs to active
-        for job in placed:
-            if job in self.job_queue:
-                self.job_queue.remove(job)
-                self.active_jobs.append(job)
+        for members in groups.values():
+            members.sort(key=lambda j: j.sla_deadline)
+            chunks = []
+            chunk, chunk_vram = [], 0
+            for job in members:
+                if chunk and (len(chunk) == self.batch_max_size or chunk_vram + job.vram_per_gpu > max_vram):
+                    chunks.append(chunk)
+                    chunk, chunk_vram = [], 0
+                chunk.append(job)
+                chunk_vram += job.vram_per_gpu
+            chunks.append(chunk)
+
+            for chunk in chunks:
+                plan.append(chunk[0] if len(chunk) == 1 else BatchJob(chunk))
+        return plan
+    
+    def _try_place_in_region(self, job, region, reserved_ids, clusters, clustered_ids):
+        """Try to place a job in one region: on a cluster first, then on individual GPUs
+        
+        Returns True if job was placed, False otherwise.
+        """
+        pool = self.region_pools[region]
+        if not pool.free and not pool.sliced:
+            return False
+
+        # Network tier scales with the region's own fleet, not the global one
+        network_penalty = get_network_penalty(len(pool.gpus))
+        region_penalty = cross_region_penalty(job.origin_region, region)
+
+        # Small inference jobs share partitioned GPUs (MIG slices) first
+        if job.job_type == 'inference' and job.gpu_count == 1:
+            if self._try_place_on_slices(job, pool, reserved_ids, clustered_ids, region_penalty):
+                return True
+        if not pool.free:
+            return False
+
+        # Try to place on a cluster first (preferred)
+        if clusters and self._try_place_on_cluster(job, clusters, reserved_ids,
+                                                   network_penalty, region_penalty):
+            return True
+
+        # Fall back to individual GPU scheduling
+        if pool.free_count(job.vram_per_gpu) < job.gpu_count:
+            return False
+
+        # CRITICAL: Only use GPUs that are NOT in clusters for individual scheduling
+        # Clustered GPUs must only be used as complete units
+        candidates = [gpu for gpu in pool.free.values()
+                      if gpu.gpu_id not in reserved_ids and gpu.gpu_id not in clustered_ids]
+        return Scheduler.schedule_fifo([job], candidates, network_penalty, region_penalty,
+                                       self.placement_mode)
     
-    def _try_place_on_cluster(self, job, available_gpus, network_penalty):
+    def _try_place_on_slices(self, job, pool, reserved_ids, clustered_ids, region_penalty):
+        """Try to place a single-GPU job on MIG slices in a region
+        
+        Already-partitioned GPUs are packed first (tightest fit). A free
+        partitionable GPU is split only when more jobs are queued than the
+        region has free GPUs, since one job runs faster on the whole GPU. Only
+        GPU models where slicing keeps most of the GPU's throughput are used.
+        
+        Returns True if job was placed, False otherwise.
+        """
+        def candidates(gpus):
+            for gpu in gpus:
+                if (not gpu.mig_slices or gpu.gpu_id in reserved_ids or gpu.gpu_id in clustered_ids
+                        or job.vram_per_gpu > gpu.vram):
+                    continue
+                slices = gpu.slices_for(job.vram_per_gpu)
+                if slices <= gpu.free_slices() and Scheduler.slicing_pays_off(job, gpu, slices):
+                    yield gpu.free_slices() - slices, gpu, slices
+
+        best = min(candidates(pool.sliced.values()), key=lambda c: c[0], default=None)
+        if best is None and len(self.job_queue) > len(pool.free):
+            best = next(candidates(pool.free.values()), None)
+        if best is None:
+            return False
+
+        _, gpu, slices = best
+        job.start([gpu], 0.0, region_penalty, slices=slices)
+        gpu.assign_slices(job, slices)
+        return True
+    
+    def _try_place_on_cluster(self, job, clusters, reserved_ids, network_penalty, region_penalty=0.0):
         """Try to place a job on a suitable cluster.
 
         New semantics: clusters function as unified units that run a single task at a time
@@ -273,9 +540,10 @@ class GameState:
         required_total_vram = job.vram_per_gpu
 
         suitable_clusters = []
-        for cluster in self.cluster_manager.clusters:
+        for cluster in clusters:
             # Check availability of entire cluster
-            cluster_gpus = [g for g in available_gpus if g.gpu_id in cluster.gpu_ids]
+            cluster_gpus = [self.gpu_index[gpu_id] for gpu_id in cluster.gpu_ids
+                            if gpu_id in self.gpu_index and gpu_id not in reserved_ids]
             if len(cluster_gpus) != len(cluster.gpu_ids):
                 continue  # Some GPUs in cluster are reserved or missing
 
@@ -308,7 +576,7 @@ class GameState:
             cross_penalty = network_penalty
 
         # Start the job and distribute VRAM needs across the cluster
-        job.start(assigned_gpus, cross_penalty)
+        job.start(assigned_gpus, cross_penalty, region_penalty)
 
         remaining = required_total_vram
         # Greedy distribution by GPU VRAM capacity (largest first)
@@ -325,14 +593,66 @@ class GameState:
 
         return True
     
-    def _get_available_gpus(self):
-        """Get GPUs that are not reserved by contracts"""
+    def _get_reserved_gpu_ids(self):
+        """Get IDs of GPUs reserved by active contracts"""
         reserved_ids = set()
         for contract in self.contract_manager.get_active_contracts():
             reserved_ids.update(contract.reserved_gpu_ids)
+        return reserved_ids
+    
+    def forecast_capacity(self, gpu_type=None, count=0):
+        """Forecast the queue for the current fleet and with `count` more `gpu_type` GPUs
         
+        Returns:
+            tuple: (success, {'current': ..., 'proposed': ...} or error message)
+        """
+        if gpu_type is not None and gpu_type not in GPU_CATALOG:
+            return False, "Invalid GPU type"
+        try:
+            count = int(count)
+        except (TypeError, ValueError):
+            return False, "Count must be a number"
+        if not 0 <= count <= MAX_BULK_GPUS:
+            return False, f"Count must be between 0 and {MAX_BULK_GPUS}"
+        
+        fleet = self._available_fleet()
+        current = self.forecaster.forecast(fleet, self.game_time, self.game_speed)
+        proposed = current
+        if gpu_type is not None and count:
+            proposed = self.forecaster.forecast(fleet_with(fleet, gpu_type, count), self.game_time,
+                                                    self.game_speed)
+        return True, {'gpu_type': gpu_type, 'count': count, 'current': current, 'proposed': proposed}
+    
+    def _available_fleet(self):
+        """GPU type -> count of GPUs not reserved by contracts"""
+        reserved_ids = self._get_reserved_gpu_ids()
+        return Counter(gpu.gpu_type for gpu in self.gpus if gpu.gpu_id not in reserved_ids)
+    
+    def target_queue_depth(self, available_gpu_count=None):
+        """Queue length the fleet can work through without SLA spirals"""
+        if available_gpu_count is None:
+            available_gpu_count = len(self._get_available_gpus())
+        return 3 + max(0, available_gpu_count // 4)
+    
+    def _get_available_gpus(self):
+        """Get GPUs that are not reserved by contracts"""
+        reserved_ids = self._get_reserved_gpu_ids()
         return [gpu for gpu in self.gpus if gpu.gpu_id not in reserved_ids]
     
+    def _get_clusters_by_region(self):
+        """Group clusters by the region their GPUs are in"""
+        clusters_by_region = {}
+        for cluster in self.cluster_manager.clusters:
+            gpu = self.gpu_index.get(cluster.gpu_ids[0]) if cluster.gpu_ids else None
+            if gpu is not None:
+                clusters_by_region.setdefault(gpu.region, []).append(cluster)
+        return clusters_by_region
+    
+    def _pick_origin_region(self):
+        """Pick where a new job comes from: any region the player operates in"""
+        open_regions = [region for region, pool in self.region_pools.items() if pool.gpus]
+        return random.choice(open_regions) if open_regions else DEFAULT_REGION
+    
     def _check_for_event(self):
         """Randomly trigger demand spike events"""
         # Don't trigger if event already active or if too early in game
@@ -453,25 +773,55 @@ class GameState:
                 self.victory_type = 'efficiency_master'
                 return
     
-    def purchase_gpu(self, gpu_type):
-        """Purchase a new GPU (cooling costs auto-bundled)"""
+    def purchase_gpu(self, gpu_type, region=DEFAULT_REGION):
+        """Purchase a new GPU (cooling costs auto-bundled) in a datacenter region"""
+        success, result = self.purchase_gpus(gpu_type, 1, region)
+        if not success:
+            return False, result
+        
+        message = f"Purchased {GPU_CATALOG[gpu_type]['name']}"
+        if region != DEFAULT_REGION:
+            message += f" in {REGIONS[region]['name']}"
+        
+        return True, message
+    
+    def purchase_gpus(self, gpu_type, count, region=DEFAULT_REGION):
+        """Purchase up to `count` GPUs of one type as a single transaction
+        
+        Validated once, paid with one cash debit and indexed in one pass.
+        All or nothing: an order the player can't afford in full is rejected.
+        
+        Returns:
+            tuple: (success, list of new GPU IDs or error message)
+        """
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            return False, "Count must be a positive integer"
+        if count > MAX_BULK_GPUS:
+            return False, f"At most {MAX_BULK_GPUS} GPUs per purchase"
+        if region not in REGIONS:
+            return False, f"Unknown region: {region}"
+        if region not in get_unlocked_regions(self.total_revenue):
+            return False, f"{REGIONS[region]['name']} unlocks at ${REGIONS[region]['unlock_revenue']:,} revenue"
+        
         can_buy, reason = Economy.can_purchase('gpu', gpu_type, self.cash, self.total_revenue)
         
         if not can_buy:
             return False, reason
         
         cost = GPU_CATALOG[gpu_type]['cost']
-        self.cash -= cost
-        
-        gpu = GPU(gpu_type, self.next_gpu_id)
-        self.next_gpu_id += 1
-        self.gpus.append(gpu)
-        
-        # Check if cooling tier upgraded automatically
-        new_cooling = Economy.get_current_cooling_tier(self.gpus)
-        message = f"Purchased {gpu.name}"
-        
-        return True, message
+        if cost * count > self.cash:
+            return False, (f"{count}x {GPU_CATALOG[gpu_type]['name']} costs ${cost * count:,}; "
+                           f"you can afford {int(self.cash // cost)}")
+        self.cash -= cost * count
+        
+        new_gpus = [GPU(gpu_type, self.next_gpu_id + i, region) for i in range(count)]
+        self.next_gpu_id += count
+        self.gpus.extend(new_gpus)
+        self.gpu_index.update((gpu.gpu_id, gpu) for gpu in new_gpus)
+        self.region_pools[region].add_many(new_gpus)
+        self.contract_manager.invalidate_eligibility()
+        
+        return True, [gpu.gpu_id for gpu in new_gpus]
     
     def upgrade_marketing(self):
         """Upgrade marketing to next level"""
@@ -497,11 +847,7 @@ class GameState:
         # Find the specified GPUs
         selected_gpus = []
         for gpu_id in gpu_ids:
-            gpu = None
-            for g in self.gpus:
-                if g.gpu_id == gpu_id:
-                    gpu = g
-                    break
+            gpu = self.gpu_index.get(gpu_id)
             if gpu is None:
                 return False, f"GPU #{gpu_id} not found"
             selected_gpus.append(gpu)
@@ -562,14 +908,18 @@ class GameState:
                 if gpu.vram < job.vram_per_gpu:
                     return False, f"GPU #{gpu.gpu_id} ({gpu.name}) has insufficient VRAM ({gpu.vram}GB < {job.vram_per_gpu}GB required)"
 
+        # Manual placement may ignore the latency budget, but still pays for distance
+        region_penalty = max(cross_region_penalty(job.origin_region, g.region) for g in selected_gpus)
+        network_penalty = get_network_penalty(len(self.region_pools[selected_gpus[0].region].gpus))
+
         # Calculate cross-node penalty (if GPUs are different types)
         cross_node_penalty = 0.0
         if is_cluster_selection:
             cluster_gpus = [g for g in self.gpus if g.gpu_id in selected_cluster.gpu_ids]
             if job.gpu_count > 1 and len(set(g.gpu_type for g in cluster_gpus)) > 1:
-                cross_node_penalty = get_network_penalty(len(self.gpus))
+                cross_node_penalty = network_penalty
             # Start the job across the entire cluster and distribute VRAM needs
-            job.start(cluster_gpus, cross_node_penalty)
+            job.start(cluster_gpus, cross_node_penalty, region_penalty)
 
             # Cluster-as-one semantics: pooled VRAM must cover vram_per_gpu (not multiplied by gpu_count)
             required_total_vram = job.vram_per_gpu
@@ -583,10 +933,10 @@ class GameState:
             selected_cluster.current_job = job
         else:
             if job.gpu_count > 1 and len(set(g.gpu_type for g in selected_gpus)) > 1:
-                cross_node_penalty = get_network_penalty(len(self.gpus))
+                cross_node_penalty = network_penalty
 
             # Assign the job
-            job.start(selected_gpus, cross_node_penalty)
+            job.start(selected_gpus, cross_node_penalty, region_penalty)
             for gpu in selected_gpus:
                 gpu.assign_job(job)
 
@@ -602,6 +952,33 @@ class GameState:
         self.auto_assign = not self.auto_assign
         return self.auto_assign
     
+    def toggle_auto_cluster(self):
+        """Toggle automatic cluster formation"""
+        self.auto_clusterer.enabled = not self.auto_clusterer.enabled
+        if self.auto_clusterer.enabled:
+            self.auto_clusterer.run(self)  # Don't wait a full interval for the first plan
+            self.auto_clusterer.last_run = self.game_time
+        return self.auto_clusterer.enabled
+    
+    def set_batching(self, max_size):
+        """Tune inference batching (max_size 1 turns it off)"""
+        try:
+            max_size = int(max_size)
+        except (TypeError, ValueError):
+            return False, "Batch size must be a number"
+        if not 1 <= max_size <= MAX_BATCH_SIZE:
+            return False, f"Batch size must be between 1 and {MAX_BATCH_SIZE}"
+        
+        self.batch_max_size = max_size
+        if max_size == 1:
+            return True, "Inference batching: OFF"
+        return True, f"Inference batching: up to {max_size} requests"
+    
+    def toggle_placement_mode(self):
+        """Toggle between compact (topology-aware) and first-fit placement"""
+        self.placement_mode = 'first_fit' if self.placement_mode == 'compact' else 'compact'
+        return self.placement_mode
+    
     def create_gpu_cluster(self, gpu_ids):
         """Create a new GPU cluster from dragged GPUs"""
         # Validate GPUs exist and are not reserved
@@ -630,6 +1007,73 @@ class GameState:
         """Disband an entire cluster"""
         return self.cluster_manager.disband_cluster(cluster_id)
     
+    def create_gpu_clusters(self, gpu_type, size, count, region=None):
+        """Create up to `count` clusters of `size` idle GPUs of one type
+        
+        Idle, unreserved, unclustered GPUs are taken in topology order (node by
+        node), so each cluster is as compact as possible and never spans regions.
+        
+        Args:
+            gpu_type: GPU type for every cluster (clusters are homogeneous)
+            size: GPUs per cluster (2-8)
+            count: Number of clusters wanted
+            region: Only use GPUs in this region (None = any region)
+        
+        Returns:
+            tuple: (success, list of new cluster IDs or error message)
+        """
+        if not isinstance(size, int) or isinstance(size, bool) or not 2 <= size <= 8:
+            return False, "Cluster size must be between 2 and 8 GPUs"
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            return False, "Count must be a positive integer"
+        if region is not None and region not in REGIONS:
+            return False, f"Unknown region: {region}"
+        
+        reserved_ids = self._get_reserved_gpu_ids()
+        clustered_ids = {gpu_id for cluster in self.cluster_manager.clusters for gpu_id in cluster.gpu_ids}
+        
+        groups = []
+        pools = [self.region_pools[region]] if region else self.region_pools.values()
+        for pool in pools:
+            idle = [gpu for gpu in pool.free.values()
+                    if gpu.gpu_type == gpu_type and gpu.gpu_id not in reserved_ids
+                    and gpu.gpu_id not in clustered_ids]
+            for group in group_compact(idle, size, count - len(groups)):
+                groups.append([gpu.gpu_id for gpu in group])
+            if len(groups) == count:
+                break
+        
+        if not groups:
+            return False, f"Need {size} idle unclustered {gpu_type} GPUs in one region"
+        
+        return True, self.cluster_manager.add_clusters(groups)
+    
+    def disband_clusters(self, cluster_ids):
+        """Disband many clusters at once (busy clusters are skipped)"""
+        if not isinstance(cluster_ids, list) or not all(
+                isinstance(cid, int) and not isinstance(cid, bool) for cid in cluster_ids):
+            return False, "cluster_ids must be a list of cluster ids"
+        disbanded, busy = self.cluster_manager.disband_clusters(cluster_ids)
+        if not disbanded:
+            return False, "No idle clusters to disband" if busy else "Clusters not found"
+        message = f"Disbanded {len(disbanded)} cluster(s)"
+        if busy:
+            message += f" ({len(busy)} busy, skipped)"
+        return True, message
+    
+    def label_clusters(self, cluster_ids, label):
+        """Tag many clusters with the same label (empty label clears it)"""
+        if not isinstance(cluster_ids, list) or not all(
+                isinstance(cid, int) and not isinstance(cid, bool) for cid in cluster_ids):
+            return False, "cluster_ids must be a list of cluster ids"
+        if label is not None and not isinstance(label, str):
+            return False, "Label must be text"
+        label = (label or '').strip()[:MAX_CLUSTER_LABEL] or None
+        labeled = self.cluster_manager.label_clusters(cluster_ids, label)
+        if not labeled:
+            return False, "Clusters not found"
+        return True, f"Relabeled {len(labeled)} cluster(s)"
+    
     def start_contract_negotiation(self, contract_id):
         """Start negotiating a contract"""
         if contract_id not in self.contract_manager.contracts:
@@ -643,6 +1087,8 @@ class GameState:
             return False, f"Requirements not met: {', '.join(issues)}"
         
         success, message = contract.start_negotiation()
+        if success:
+            self.contract_manager.invalidate_eligibility()
         return success, message
     
     def invest_in_contract(self, contract_id, amount):
@@ -682,81 +1128,141 @@ class GameState:
         selected_gpu_ids = [g.gpu_id for g in sorted_gpus[:contract.reserves_gpus]]
         
         success, message = contract.activate(selected_gpu_ids)
+        if success:
+            self.contract_manager.invalidate_eligibility()
         return success, message
     
-    def to_dict(self):
-        """Convert game state to dictionary for JSON"""
-        # Auto-calculate current infrastructure
-        cooling_tier = Economy.get_current_cooling_tier(self.gpus)
-        pue = Economy.get_current_pue(self.gpus)
-        scheduler_tier = Economy.get_current_scheduler(self.total_revenue)
-        network_penalty = get_network_penalty(len(self.gpus))
+    def to_dict(self, fields=None):
+        """Convert game state to dictionary for JSON
+        
+        Args:
+            fields: Optional collection of top-level section names (see STATE_SECTIONS).
+                Only those sections are computed; None returns everything.
+        """
+        want = STATE_SECTIONS.__contains__ if fields is None else set(fields).__contains__
+        state = {}
+        
+        if want('cash'):
+            state['cash'] = round(self.cash, 2)
+        if want('total_revenue'):
+            state['total_revenue'] = round(self.total_revenue, 2)
+        if want('total_power_cost'):
+            state['total_power_cost'] = round(self.total_power_cost, 2)
+        if want('gpus'):
+            state['gpus'] = [g.to_dict() for g in self.gpus]
+        if want('job_queue'):
+            state['job_queue'] = [j.to_dict() for j in self.job_queue]
+        if want('active_jobs'):
+            state['active_jobs'] = [j.to_dict() for j in self.active_jobs]
         
+        # Auto-calculate current infrastructure
+        if want('cooling_tier'):
+            state['cooling_tier'] = Economy.get_current_cooling_tier(self.gpus)
+        if want('scheduler_tier'):
+            state['scheduler_tier'] = Economy.get_current_scheduler(self.total_revenue)
+        if want('network_penalty_pct'):
+            state['network_penalty_pct'] = round(get_network_penalty(len(self.gpus)) * 100, 1)
+        if want('auto_assign'):
+            state['auto_assign'] = self.auto_assign
+        if want('placement_mode'):
+            state['placement_mode'] = self.placement_mode
+        if want('auto_cluster'):
+            state['auto_cluster'] = self.auto_clusterer.to_dict()
+        if want('admission'):
+            state['admission'] = self.admission.to_dict()
+        if want('batching'):
+            state['batching'] = {
+                'max_size': self.batch_max_size,
+                'batches_completed': self.batches_completed,
+                'avg_batch_size': round(self.batched_jobs_completed / self.batches_completed, 1)
+                                  if self.batches_completed else 0
+            }
+        if want('pue'):
+            state['pue'] = round(Economy.get_current_pue(self.gpus), 2)
+        
+        if want('capacity') or want('stats'):
+            state.update(self._capacity_and_stats(want))
+        
+        if want('regions'):
+            state['regions'] = [pool.to_dict(self.total_revenue) for pool in self.region_pools.values()]
+        
+        if want('unlocks'):
+            state['unlocks'] = self._get_unlocks()
+        if want('contracts'):
+            state['contracts'] = self.contract_manager.to_dict(self)
+        if want('marketing'):
+            state['marketing'] = self.marketing_manager.to_dict()
+        if want('achievements'):
+            state['achievements'] = list(self.achievements)
+        if want('victory'):
+            state['victory'] = {
+                'achieved': self.victory_achieved,
+                'type': self.victory_type,
+                'time': self.victory_time
+            }
+        if want('active_event'):
+            state['active_event'] = self.active_event
+        if want('clusters'):
+            state['clusters'] = self.cluster_manager.to_dict(self.gpus)
+        if want('unclustered_gpus'):
+            state['unclustered_gpus'] = self.cluster_manager.get_unclustered_gpus(self.gpus)
+        
+        return state
+    
+    def _capacity_and_stats(self, want):
+        """Build the 'capacity' and 'stats' sections (they share utilization math)"""
         # Calculate stats
         total_gpus = len(self.gpus)
         reserved_gpus = self.contract_manager.get_total_reserved_gpus()
         available_gpus = total_gpus - reserved_gpus
         
         avg_utilization = sum(g.utilization for g in self.gpus) / max(total_gpus, 1)
-        # Rolling-window SLA compliance for UX-friendly pacing
-        if len(getattr(self, 'sla_history', [])) > 0:
-            sla_compliance = (sum(self.sla_history) / len(self.sla_history)) * 100.0
-        else:
-            sla_compliance = 100.0
+        sections = {}
         
-        # Calculate revenue rate (per hour) - includes contract passive income
-        revenue_per_hour = 0
-        if self.jobs_completed > 0:
-            avg_job_value = self.total_revenue / self.jobs_completed
-            jobs_per_hour_per_gpu = 3600 / 10  # Rough estimate
-            revenue_per_hour = avg_job_value * jobs_per_hour_per_gpu * available_gpus * avg_utilization
-        
-        # Add contract passive income (monthly to hourly)
-        contract_monthly = self.contract_manager.get_total_monthly_income()
-        revenue_per_hour += contract_monthly / (30 * 24)  # Convert monthly to hourly
-        
-        return {
-            'cash': round(self.cash, 2),
-            'total_revenue': round(self.total_revenue, 2),
-            'total_power_cost': round(self.total_power_cost, 2),
-            'gpus': [g.to_dict() for g in self.gpus],
-            'job_queue': [j.to_dict() for j in self.job_queue],
-            'active_jobs': [j.to_dict() for j in self.active_jobs],
-            'cooling_tier': cooling_tier,
-            'scheduler_tier': scheduler_tier,
-            'network_penalty_pct': round(network_penalty * 100, 1),
-            'auto_assign': self.auto_assign,
-            'pue': round(pue, 2),
-            'capacity': {
+        if want('capacity'):
+            sections['capacity'] = {
                 'total': total_gpus,
                 'reserved': reserved_gpus,
                 'available': available_gpus,
                 'utilization_pct': round(avg_utilization * 100, 1)
-            },
-            'stats': {
+            }
+        
+        if want('stats'):
+            # Rolling-window SLA compliance for UX-friendly pacing
+            if len(getattr(self, 'sla_history', [])) > 0:
+                sla_compliance = (sum(self.sla_history) / len(self.sla_history)) * 100.0
+            else:
+                sla_compliance = 100.0
+            
+            # Calculate revenue rate (per hour) - includes contract passive income
+            revenue_per_hour = 0
+            forecast = self.forecaster.forecast(self._available_fleet(), self.game_time, self.game_speed)
+            if forecast is not None:
+                revenue_per_hour = forecast['revenue_per_hour']
+            elif self.jobs_completed > 0:
+                avg_job_value = self.total_revenue / self.jobs_completed
+                jobs_per_hour_per_gpu = 3600 / 10  # Rough estimate
+                revenue_per_hour = avg_job_value * jobs_per_hour_per_gpu * available_gpus * avg_utilization
+            
+            # Add contract passive income (monthly to hourly)
+            contract_monthly = self.contract_manager.get_total_monthly_income()
+            revenue_per_hour += contract_monthly / (30 * 24)  # Convert monthly to hourly
+            
+            sections['stats'] = {
                 'total_gpus': total_gpus,
                 'utilization': round(avg_utilization * 100, 1),
                 'sla_compliance': round(sla_compliance, 1),
                 'jobs_completed': self.jobs_completed,
                 'sla_misses': self.sla_misses,
                 'revenue_per_hour': round(revenue_per_hour, 2)
-            },
-            'unlocks': self._get_unlocks(),
-            'contracts': self.contract_manager.to_dict(self),
-            'marketing': self.marketing_manager.to_dict(),
-            'achievements': list(self.achievements),
-            'victory': {
-                'achieved': self.victory_achieved,
-                'type': self.victory_type
-            },
-            'active_event': self.active_event,
-            'clusters': self.cluster_manager.to_dict(self.gpus),
-            'unclustered_gpus': self.cluster_manager.get_unclustered_gpus(self.gpus)
-        }
+            }
+        
+        return sections
     
     def _get_unlocks(self):
         """Get all unlocked items"""
         return {
-            'gpus': Economy.get_unlocked_gpus(self.total_revenue)
+            'gpus': Economy.get_unlocked_gpus(self.total_revenue),
+            'regions': get_unlocked_regions(self.total_revenue)
         }
 
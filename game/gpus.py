@@ -1,9 +1,11 @@
 """GPU specifications and management"""
 import random
 
+from .regions import DEFAULT_REGION
+
 class GPU:
     """Represents a single GPU instance"""
-    def __init__(self, gpu_type, gpu_id):
+    def __init__(self, gpu_type, gpu_id, region=DEFAULT_REGION):
         self.gpu_id = gpu_id
         self.gpu_type = gpu_type
         spec = GPU_CATALOG[gpu_type]
@@ -12,36 +14,96 @@ class GPU:
         self.tdp = spec['tdp']
         self.performance = spec['performance']
         self.cost = spec['cost']
+        self.mig_slices = spec.get('mig_slices', 0)  # 0 = can't be partitioned
+        
+        # Location (set by RegionPool.add)
+        self.region = region
+        self.node = 0
+        self.rack = 0
+        self.pool = None
         
         # Runtime state
-        self.current_job = None
+        self.current_job = None  # Job holding the whole GPU
+        self.slice_jobs = {}  # job_id -> (job, slices) for jobs on MIG slices
+        self.slices_used = 0
         self.utilization = 0.0
         self.vram_used = 0
     
     def is_available(self):
-        return self.current_job is None
+        """True if the whole GPU is free (no job and no slices in use)"""
+        return self.current_job is None and not self.slice_jobs
+    
+    @property
+    def slice_vram(self):
+        """VRAM of one MIG slice in GB"""
+        return self.vram // self.mig_slices if self.mig_slices else 0
+    
+    def slices_for(self, vram):
+        """MIG slices needed to hold `vram` GB"""
+        return -(-vram // self.slice_vram)  # Ceiling division
+    
+    def free_slices(self):
+        """MIG slices still free (0 if the GPU is not partitionable or fully taken)"""
+        if not self.mig_slices or self.current_job is not None:
+            return 0
+        return self.mig_slices - self.slices_used
     
     def assign_job(self, job, vram_override=None):
         self.current_job = job
         # Allow cluster assignments to distribute memory across GPUs
         self.vram_used = vram_override if vram_override is not None else job.vram_per_gpu
         self.utilization = 1.0
+        if self.pool is not None:
+            self.pool.mark_busy(self)
+    
+    def assign_slices(self, job, slices):
+        """Run a job on `slices` MIG slices, alongside other slice jobs"""
+        self.slice_jobs[job.job_id] = (job, slices)
+        self.slices_used += slices
+        self.vram_used += job.vram_per_gpu
+        self.utilization = self.slices_used / self.mig_slices
+        if self.pool is not None:
+            self.pool.mark_sliced(self)
     
     def clear_job(self):
         self.current_job = None
         self.vram_used = 0
         self.utilization = 0.0
+        if self.pool is not None:
+            self.pool.mark_free(self)
+    
+    def release(self, job):
+        """Free whatever this GPU gave to `job` (the whole GPU or its slices)"""
+        entry = self.slice_jobs.pop(job.job_id, None)
+        if entry is None:
+            self.clear_job()
+            return
+        
+        self.slices_used -= entry[1]
+        self.vram_used -= job.vram_per_gpu
+        self.utilization = self.slices_used / self.mig_slices
+        if self.slice_jobs:
+            if self.pool is not None:
+                self.pool.mark_sliced(self)
+        else:
+            self.clear_job()
     
     def to_dict(self):
         return {
             'id': self.gpu_id,
             'type': self.gpu_type,
             'name': self.name,
+            'region': self.region,
+            'node': self.node,
+            'rack': self.rack,
             'vram': self.vram,
             'vram_used': self.vram_used,
             'tdp': self.tdp,
             'utilization': self.utilization,
-            'current_job': self.current_job.job_id if self.current_job else None
+            'current_job': self.current_job.job_id if self.current_job else next(iter(self.slice_jobs), None),
+            'slice_jobs': list(self.slice_jobs),
+            'mig_slices': self.mig_slices,
+            'slices_used': self.slices_used
         }
 
 
@@ -66,6 +128,7 @@ GPU_CATALOG = {
         'cost': 18000,  # Includes liquid cooling costs (+$6K bundled)
         'unlock_revenue': 30000,
         'cooling_tier': 'liquid',
+        'mig_slices': 7,  # Multi-Instance GPU: up to 7 isolated slices
         'description': 'First pro GPU. Ampere architecture with 80GB HBM2e memory. Multi-Instance GPU support. Liquid cooling included. Great for training and high-throughput inference.'
     },
     'H100': {
@@ -76,6 +139,7 @@ GPU_CATALOG = {
         'cost': 40000,  # Includes liquid cooling costs (+$15K bundled)
         'unlock_revenue': 150000,
         'cooling_tier': 'liquid',
+        'mig_slices': 7,
         'description': 'AI training beast. Hopper architecture with Transformer Engine and FP8 precision. 9x faster training for LLMs. NVLink Gen 4 for multi-GPU workloads.'
     },
     'GB200': {
@@ -86,6 +150,7 @@ GPU_CATALOG = {
         'cost': 120000,  # Includes advanced cooling costs (+$50K bundled)
         'unlock_revenue': 500000,
         'cooling_tier': 'advanced_liquid',
+        'mig_slices': 7,
         'description': 'Endgame superchip. Grace Blackwell with 72-core ARM CPU + Blackwell GPU. 672GB unified memory. For trillion-parameter models. Advanced cooling included.'
     }
 }
@@ -0,0 +1,145 @@
+"""Per-session metrics history in fixed-size ring buffers
+
+Once per game second the game records a sample of its headline metrics.
+Samples go into three array-backed rings: raw 1 s samples, 10 s rollups and
+60 s rollups. The rings are allocated up front, so a session's history
+costs the same after five minutes of play as after five hours. Gauges roll
+up as means. Running totals (revenue, power cost) roll up as the last value
+of each bucket.
+
+A query picks the finest ring that covers the requested window, then
+averages neighbouring points down to the requested point count. A rollup
+bucket only shows up in queries after it ends.
+"""
+import math
+from array import array
+
+# Metric -> how a rollup combines samples ('mean' for gauges, 'last' for running totals)
+METRICS = {
+    'cash': 'mean',
+    'total_revenue': 'last',
+    'total_power_cost': 'last',
+    'utilization_pct': 'mean',
+    'queue_depth': 'mean',
+    'reserved_gpus': 'mean',
+    'available_gpus': 'mean',
+    'sla_rate_pct': 'mean'
+}
+
+# (seconds per point, points kept): 5 minutes of 1 s, 1 hour of 10 s, 12 hours of 60 s
+RESOLUTIONS = ((1, 300), (10, 360), (60, 720))
+
+SAMPLE_INTERVAL = RESOLUTIONS[0][0]  # Game seconds between samples
+DEFAULT_POINTS = 120
+
+
+class RingSeries:
+    """Fixed-capacity ring of timestamped rows, one float32 array per metric"""
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.values = {metric: array('f', bytes(4 * capacity)) for metric in METRICS}
+        self.next = 0  # Slot the next row is written to
+        self.count = 0
+
+        # Rollup accumulator for the bucket in progress
+        self.bucket = None
+        self.sums = dict.fromkeys(METRICS, 0.0)
+        self.samples = 0
+
+    def append(self, game_time, row):
+        self.times[self.next] = game_time
+        for metric, value in row.items():
+            self.values[metric][self.next] = value
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def add_sample(self, game_time, sample):
+        """Fold a sample into the current bucket, writing out the previous one when it ends"""
+        bucket = int(game_time // self.resolution)
+        if bucket != self.bucket:
+            self.flush()
+            self.bucket = bucket
+        for metric, value in sample.items():
+            if METRICS[metric] == 'mean':
+                self.sums[metric] += value
+            else:
+                self.sums[metric] = value
+        self.samples += 1
+
+    def flush(self):
+        """Write the bucket in progress as one row"""
+        if not self.samples:
+            return
+        self.append(self.bucket * self.resolution, {
+            metric: total / self.samples if METRICS[metric] == 'mean' else total
+            for metric, total in self.sums.items()
+        })
+        self.sums = dict.fromkeys(METRICS, 0.0)
+        self.samples = 0
+
+    def span(self):
+        """Seconds of history the ring can hold"""
+        return self.resolution * self.capacity
+
+    def rows_since(self, start_time):
+        """Slot indexes of rows at or after start_time, oldest first"""
+        first = (self.next - self.count) % self.capacity
+        slots = [(first + i) % self.capacity for i in range(self.count)]
+        return [slot for slot in slots if self.times[slot] >= start_time]
+
+
+class MetricsHistory:
+    """1 s samples with 10 s and 60 s rollups of one game's metrics"""
+
+    def __init__(self):
+        self.rings = [RingSeries(resolution, capacity) for resolution, capacity in RESOLUTIONS]
+        self.next_sample_at = 0.0
+
+    def due(self, game_time):
+        """Whether a sample should be recorded at this game time"""
+        return game_time >= self.next_sample_at
+
+    def record(self, game_time, sample):
+        """Record one sample (a dict with every metric in METRICS)"""
+        self.next_sample_at = (math.floor(game_time / SAMPLE_INTERVAL) + 1) * SAMPLE_INTERVAL
+        raw, *rollups = self.rings
+        raw.append(game_time, sample)
+        for ring in rollups:
+            ring.add_sample(game_time, sample)
+
+    def query(self, game_time, window, points=DEFAULT_POINTS, metrics=None):
+        """The last `window` game seconds, averaged down to at most `points` points
+
+        Returns:
+            dict: resolution used, timestamps and one list of values per metric
+        """
+        metrics = list(metrics or METRICS)
+        ring = next((r for r in self.rings if r.span() >= window), self.rings[-1])
+        slots = ring.rows_since(game_time - window)
+
+        # Rows per output point, so at most `points` points are returned
+        group = max(1, math.ceil(len(slots) / points))
+        times = []
+        series = {metric: [] for metric in metrics}
+        for start in range(0, len(slots), group):
+            chunk = slots[start:start + group]
+            times.append(round(ring.times[chunk[-1]], 1))
+            for metric in metrics:
+                values = ring.values[metric]
+                if METRICS[metric] == 'mean':
+                    value = sum(values[slot] for slot in chunk) / len(chunk)
+                else:
+                    value = values[chunk[-1]]
+                series[metric].append(round(value, 2))
+
+        return {
+            'window': window,
+            'resolution': ring.resolution * group,
+            'source_resolution': ring.resolution,
+            'game_time': round(game_time, 1),
+            'times': times,
+            'series': series
+        }
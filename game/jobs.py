@@ -2,6 +2,19 @@
 import random
 import time
 
+from .regions import LATENCY_BUDGET_MS
+from .topology import LINK_BANDWIDTH_GBPS, placement_spread, topology_penalty, pick_compact
+
+# Compute one inference stream can use on a MIG slice (~an A100); whole GPUs are uncapped
+INFERENCE_PERF_CAP = 4.0
+# Share of a whole GPU's throughput that jobs packed onto its MIG slices must keep
+MIN_SLICED_THROUGHPUT = 0.8
+
+# Inference batching: a batch of n requests takes n ** exponent times as long as
+# one request, and on a MIG slice can use n times the compute of a single stream
+BATCH_SCALING_EXPONENT = 0.5
+DEFAULT_BATCH_MAX_SIZE = 8
+
 # Fictional GPU cloud customers by job type
 INFERENCE_CUSTOMERS = [
     'QueryMind AI',
@@ -48,9 +61,11 @@ class Job:
     """Represents a compute job"""
     _next_id = 1
     
-    def __init__(self, job_type, base_duration, vram_per_gpu, base_payout, sla_window, gpu_count, customer_name, task_description):
-        self.job_id = Job._next_id
-        Job._next_id += 1
+    def __init__(self, job_type, base_duration, vram_per_gpu, base_payout, sla_window, gpu_count, customer_name, task_description, job_id=None):
+        if job_id is None:
+            job_id = Job._next_id
+            Job._next_id += 1
+        self.job_id = job_id
         
         self.job_type = job_type  # 'inference' or 'training'
         # Size classification: S (1 GPU), M (2 GPUs), L (4 GPUs)
@@ -74,9 +89,23 @@ class Job:
         self.started_at = None
         self.progress = 0.0
         
+        # Locality: where the request comes from and how far away it may run
+        self.origin_region = None  # Set by the game when the job arrives
+        self.latency_budget_ms = LATENCY_BUDGET_MS.get(job_type, 0)
+        self.region = None  # Region the job was placed in
+        
         # Assigned GPUs
         self.assigned_gpus = []
         self.cross_node_penalty = 0.0
+        self.region_penalty = 0.0
+        
+        # Intra-datacenter placement (see topology.py)
+        self.spread = 'gpu'
+        self.effective_bandwidth_gbps = None
+        self.topology_penalty = 0.0
+        self.compact_gain_pct = 0.0  # Speedup vs first-fit placement
+        self.slices = None  # MIG slices used (None = whole GPUs)
+        self.batch_size = 1  # Requests served together (see BatchJob)
         
         # Multi-GPU coordination (for 2+ GPU jobs)
         self.is_multi_gpu = gpu_count > 1
@@ -84,17 +113,31 @@ class Job:
         self.last_sync_time = None
         self.performance_multiplier = 1.0  # Bonus for well-matched GPUs
     
-    def start(self, gpus, cross_node_penalty=0.0):
-        """Start job on assigned GPUs"""
+    def start(self, gpus, cross_node_penalty=0.0, region_penalty=0.0, slices=None):
+        """Start job on assigned GPUs
+        
+        Args:
+            gpus: GPUs to run on
+            cross_node_penalty: Slowdown from mixed GPU types within a region
+            region_penalty: Slowdown from running outside the job's origin region
+            slices: MIG slices of the (single) GPU to run on, None for the whole GPU
+        """
         self.started_at = time.time()
         self.assigned_gpus = gpus
         self.cross_node_penalty = cross_node_penalty
+        self.region_penalty = region_penalty
+        self.slices = slices
+        if gpus:
+            self.region = gpus[0].region
         
         # Multi-GPU performance calculation
         if gpus:
             if len(gpus) == 1:
-                # Single GPU: straightforward
+                # Single GPU: straightforward (a MIG slice gets its share of the GPU)
                 avg_performance = gpus[0].performance
+                if slices:
+                    avg_performance *= slices / gpus[0].mig_slices
+                    avg_performance = min(avg_performance, INFERENCE_PERF_CAP * self.batch_size)
                 self.performance_multiplier = 1.0
             else:
                 # Multi-GPU: Calculate based on parallelism type
@@ -137,6 +180,15 @@ class Job:
         
         # Apply cross-node penalty (network bandwidth limitations)
         self.duration = self.duration * (1 + cross_node_penalty)
+        
+        # Apply cross-region penalty (WAN latency and bandwidth)
+        self.duration = self.duration * (1 + region_penalty)
+        
+        # Apply topology penalty (collectives run at the slowest link crossed)
+        self.spread = placement_spread(gpus)
+        self.effective_bandwidth_gbps = LINK_BANDWIDTH_GBPS[self.spread]
+        self.topology_penalty = topology_penalty(self.job_type, self.spread)
+        self.duration = self.duration * (1 + self.topology_penalty)
     
     def update(self, dt):
         """Update job progress, returns True if completed"""
@@ -159,6 +211,11 @@ class Job:
             return True
         return False
     
+    @property
+    def members(self):
+        """Jobs settled when this one completes (just itself; batches override)"""
+        return [self]
+    
     def calculate_payout(self):
         """Calculate final payout including SLA penalty"""
         payout = self.base_payout
@@ -206,15 +263,134 @@ class Job:
             'is_multi_gpu': self.is_multi_gpu,
             'is_syncing': is_syncing,
             'gpu_coordination': gpu_coordination,
-            'performance_multiplier': round(self.performance_multiplier, 2)
+            'performance_multiplier': round(self.performance_multiplier, 2),
+            'origin_region': self.origin_region,
+            'region': self.region,
+            'latency_budget_ms': self.latency_budget_ms,
+            'region_penalty_pct': round(self.region_penalty * 100, 1),
+            'spread': self.spread,
+            'effective_bandwidth_gbps': self.effective_bandwidth_gbps,
+            'topology_penalty_pct': round(self.topology_penalty * 100, 1),
+            'compact_gain_pct': round(self.compact_gain_pct, 1),
+            'mig_slices': self.slices,
+            'batch_size': self.batch_size
         }
 
 
+class BatchJob(Job):
+    """Several queued inference requests served as one batch on one GPU
+    
+    The batch is placed and progresses like a single job: its VRAM is the sum
+    of its members', its duration grows sublinearly with the batch size and
+    its deadline is the earliest member deadline. On completion each member
+    is paid and SLA-checked on its own, with the batch start as its start.
+    """
+    
+    def __init__(self, members):
+        lead = members[0]
+        super().__init__(
+            job_type=lead.job_type,
+            base_duration=max(m.base_duration for m in members) * len(members) ** BATCH_SCALING_EXPONENT,
+            vram_per_gpu=sum(m.vram_per_gpu for m in members),
+            base_payout=sum(m.base_payout for m in members),
+            sla_window=0,
+            gpu_count=1,
+            customer_name=f'Batch of {len(members)} requests',
+            task_description=', '.join(sorted(set(m.customer_name for m in members))),
+            job_id=lead.job_id  # The lead request leaves the queue, so its ID is free
+        )
+        self.batch = list(members)
+        self.batch_size = len(members)
+        self.created_at = min(m.created_at for m in members)
+        self.sla_deadline = min(m.sla_deadline for m in members)
+        self.origin_region = lead.origin_region
+        self.latency_budget_ms = lead.latency_budget_ms
+    
+    @property
+    def members(self):
+        return self.batch
+    
+    def start(self, gpus, cross_node_penalty=0.0, region_penalty=0.0, slices=None):
+        super().start(gpus, cross_node_penalty, region_penalty, slices)
+        for member in self.batch:
+            member.started_at = self.started_at
+            member.assigned_gpus = gpus
+            member.region = self.region
+    
+    def to_dict(self):
+        data = super().to_dict()
+        data['member_ids'] = [m.job_id for m in self.batch]
+        return data
+
+
+# Job shape catalog - the job sizes customers submit
+# 'customers' lists the customer pools a shape draws from (one is picked at random)
+JOB_SHAPES = {
+    'small': {
+        'description': 'Small (1 GPU), short, latency-sensitive',
+        'customers': ['inference'],
+        'base_duration': 5,  # Faster for better visual feedback (was 8)
+        'vram_per_gpu': 16,  # Modest VRAM needs
+        'base_payout': 45,  # Slightly lower to balance faster completion
+        'sla_window': 20,  # Tight SLA
+        'gpu_count': 1
+    },
+    'medium': {
+        'description': 'Medium (2 GPUs), medium duration - the sweet spot for mid-game',
+        'customers': ['inference', 'training'],  # Mix of inference and training customers
+        'base_duration': 12,
+        'vram_per_gpu': 32,
+        'base_payout': 120,  # ~2.6x per GPU vs small jobs
+        'sla_window': 35,
+        'gpu_count': 2
+    },
+    'large': {
+        'description': 'Large (4 GPUs), long, high VRAM',
+        'customers': ['training'],
+        'base_duration': 20,  # Shorter for better pacing (was 25)
+        'vram_per_gpu': 50,  # High VRAM needs
+        'base_payout': 220,  # ~2.4x per GPU vs medium
+        'sla_window': 50,  # More relaxed SLA
+        'gpu_count': 4
+    }
+}
+
+CUSTOMER_POOLS = {
+    'inference': INFERENCE_CUSTOMERS,
+    'training': TRAINING_CUSTOMERS
+}
+
+# Job mix per game phase: (revenue below which the phase applies, tiers)
+# Each tier is (minimum available GPUs, {shape: probability}); the last matching tier wins.
+# Adaptive job sizing based on GPU count avoids queue blockage - we only generate
+# jobs that can actually run on current infrastructure.
+JOB_MIX = [
+    # Phase 1 (0-30K): Early game, mostly small jobs, some medium to encourage GPU purchases
+    (30000, [
+        (0, {'small': 1.0}),
+        (2, {'small': 0.7, 'medium': 0.3})
+    ]),
+    # Phase 2 (30K-150K): Introduce large jobs when infrastructure supports it
+    (150000, [
+        (0, {'small': 1.0}),
+        (2, {'small': 0.6, 'medium': 0.4}),  # No large jobs yet
+        (4, {'small': 0.5, 'medium': 0.3, 'large': 0.2})  # Full mix
+    ]),
+    # Phase 3 (150K+): More large jobs, but still balanced
+    (None, [
+        (0, {'small': 1.0}),
+        (2, {'small': 0.5, 'medium': 0.5}),
+        (4, {'small': 0.3, 'medium': 0.3, 'large': 0.4})  # Favor large jobs
+    ])
+]
+
+
 class JobGenerator:
     """Generates jobs based on game progression"""
     
     @staticmethod
-    def generate_job(total_revenue, value_multiplier=1.0, sla_extension=0, available_gpu_count=1):
+    def generate_job(total_revenue, value_multiplier=1.0, sla_extension=0, available_gpu_count=1,
+                     shapes=None, mix=None):
         """Generate a random job appropriate for current phase
         
         Args:
@@ -222,146 +398,129 @@ class JobGenerator:
             value_multiplier: Multiplier for job payouts (from marketing)
             sla_extension: Additional seconds added to SLA window (from marketing)
             available_gpu_count: Number of available GPUs (affects job size distribution)
+            shapes: Job shape catalog (defaults to JOB_SHAPES)
+            mix: Phase job mix table (defaults to JOB_MIX)
         """
+        shape_name = JobGenerator.pick_shape(total_revenue, available_gpu_count, mix)
+        return JobGenerator.create_job(shape_name, value_multiplier, sla_extension, shapes)
+    
+    @staticmethod
+    def pick_shape(total_revenue, available_gpu_count=1, mix=None):
+        """Pick a job shape name from the phase mix table"""
+        mix = mix or JOB_MIX
         
-        # Adaptive job sizing based on GPU count to avoid queue blockage
-        # This ensures we generate jobs that can actually run on current infrastructure
+        # Find the current phase (last entry catches everything above)
+        tiers = mix[-1][1]
+        for max_revenue, phase_tiers in mix:
+            if max_revenue is None or total_revenue < max_revenue:
+                tiers = phase_tiers
+                break
         
-        # Phase 1 (0-30K): Mix of small and medium jobs
-        if total_revenue < 30000:
-            # Early game: mostly small jobs, some medium to encourage GPU purchases
-            if available_gpu_count < 2:
-                return JobGenerator._create_inference_job(value_multiplier, sla_extension)
-            else:
-                # 70% small, 30% medium once you have 2+ GPUs
-                if random.random() < 0.7:
-                    return JobGenerator._create_inference_job(value_multiplier, sla_extension)
-                else:
-                    return JobGenerator._create_medium_job(value_multiplier, sla_extension)
+        weights = tiers[0][1]
+        for min_gpus, tier_weights in tiers:
+            if available_gpu_count >= min_gpus:
+                weights = tier_weights
         
-        # Phase 2 (30K-150K): Introduce large jobs when infrastructure supports it
-        elif total_revenue < 150000:
-            if available_gpu_count < 2:
-                # Only small jobs if limited GPUs
-                return JobGenerator._create_inference_job(value_multiplier, sla_extension)
-            elif available_gpu_count < 4:
-                # 60% small, 40% medium - no large jobs yet
-                if random.random() < 0.6:
-                    return JobGenerator._create_inference_job(value_multiplier, sla_extension)
-                else:
-                    return JobGenerator._create_medium_job(value_multiplier, sla_extension)
-            else:
-                # 50% small, 30% medium, 20% large - full mix
-                roll = random.random()
-                if roll < 0.5:
-                    return JobGenerator._create_inference_job(value_multiplier, sla_extension)
-                elif roll < 0.8:
-                    return JobGenerator._create_medium_job(value_multiplier, sla_extension)
-                else:
-                    return JobGenerator._create_training_job(value_multiplier, sla_extension)
+        if len(weights) == 1:
+            return next(iter(weights))
         
-        # Phase 3 (150K+): More large jobs, but still balanced
-        else:
-            if available_gpu_count < 2:
-                return JobGenerator._create_inference_job(value_multiplier, sla_extension)
-            elif available_gpu_count < 4:
-                # 50% small, 50% medium
-                if random.random() < 0.5:
-                    return JobGenerator._create_inference_job(value_multiplier, sla_extension)
-                else:
-                    return JobGenerator._create_medium_job(value_multiplier, sla_extension)
-            else:
-                # 30% small, 30% medium, 40% large - favor large jobs
-                roll = random.random()
-                if roll < 0.3:
-                    return JobGenerator._create_inference_job(value_multiplier, sla_extension)
-                elif roll < 0.6:
-                    return JobGenerator._create_medium_job(value_multiplier, sla_extension)
-                else:
-                    return JobGenerator._create_training_job(value_multiplier, sla_extension)
+        roll = random.random() * sum(weights.values())
+        for shape_name, weight in weights.items():
+            if roll < weight:
+                return shape_name
+            roll -= weight
+        return shape_name
     
     @staticmethod
-    def _create_inference_job(value_multiplier=1.0, sla_extension=0):
-        """Small (1 GPU), short, latency-sensitive"""
-        customer = random.choice(INFERENCE_CUSTOMERS)
-        return Job(
-            job_type='inference',
-            base_duration=5,  # Faster for better visual feedback (was 8)
-            vram_per_gpu=16,  # Modest VRAM needs
-            base_payout=int(45 * value_multiplier),   # Slightly lower to balance faster completion
-            sla_window=20 + sla_extension,    # Tight SLA + marketing extension
-            gpu_count=1,
-            customer_name=customer,
-            task_description=CUSTOMER_TASKS[customer]
-        )
-    
-    @staticmethod
-    def _create_medium_job(value_multiplier=1.0, sla_extension=0):
-        """Medium (2 GPUs), medium duration - the sweet spot for mid-game"""
-        # Mix of inference and training customers for medium jobs
-        if random.random() < 0.5:
-            customer = random.choice(INFERENCE_CUSTOMERS)
-            task_type = 'inference'
-        else:
-            customer = random.choice(TRAINING_CUSTOMERS)
-            task_type = 'training'
+    def create_job(shape_name, value_multiplier=1.0, sla_extension=0, shapes=None, overrides=None):
+        """Create a job from a shape in the catalog
         
-        return Job(
-            job_type=task_type,
-            base_duration=12,  # Medium duration
-            vram_per_gpu=32,   # Medium VRAM needs
-            base_payout=int(120 * value_multiplier),   # ~2.6x per GPU vs small jobs
-            sla_window=35 + sla_extension,    # Medium SLA
-            gpu_count=2,
-            customer_name=customer,
-            task_description=CUSTOMER_TASKS[customer]
-        )
-    
-    @staticmethod
-    def _create_training_job(value_multiplier=1.0, sla_extension=0):
-        """Large (4 GPUs), long, high VRAM"""
-        customer = random.choice(TRAINING_CUSTOMERS)
-        return Job(
-            job_type='training',
-            base_duration=20,  # Shorter for better pacing (was 25)
-            vram_per_gpu=50,   # High VRAM needs
-            base_payout=int(220 * value_multiplier),   # ~2.4x per GPU vs medium
-            sla_window=50 + sla_extension,    # More relaxed SLA
-            gpu_count=4,
+        Args:
+            shape_name: Key into the shape catalog
+            value_multiplier: Multiplier for job payouts (from marketing)
+            sla_extension: Additional seconds added to SLA window (from marketing)
+            shapes: Job shape catalog (defaults to JOB_SHAPES)
+            overrides: Optional dict of explicit job fields (e.g. from a recorded trace)
+        """
+        shapes = shapes or JOB_SHAPES
+        if shape_name not in shapes:
+            raise ValueError(f"Unknown job shape: {shape_name}")
+        
+        spec = dict(shapes[shape_name])
+        if overrides:
+            spec.update(overrides)
+        
+        job_type = spec.get('job_type')
+        customer = spec.get('customer_name')
+        if customer is None:
+            job_type = job_type or random.choice(spec['customers'])
+            customer = random.choice(CUSTOMER_POOLS[job_type])
+        elif job_type is None:
+            job_type = 'training' if customer in TRAINING_CUSTOMERS else 'inference'
+        
+        job = Job(
+            job_type=job_type,
+            base_duration=spec['base_duration'],
+            vram_per_gpu=spec['vram_per_gpu'],
+            base_payout=int(spec['base_payout'] * value_multiplier),
+            sla_window=spec['sla_window'] + sla_extension,
+            gpu_count=spec['gpu_count'],
             customer_name=customer,
-            task_description=CUSTOMER_TASKS[customer]
+            task_description=spec.get('task_description') or CUSTOMER_TASKS.get(customer, job_type.title())
         )
+        job.origin_region = spec.get('origin_region')
+        if 'latency_budget_ms' in spec:
+            job.latency_budget_ms = spec['latency_budget_ms']
+        return job
 
 
 class Scheduler:
     """Simple FIFO job scheduler"""
     
     @staticmethod
-    def schedule_fifo(job_queue, gpus, network_penalty=0.25):
+    def schedule_fifo(job_queue, gpus, network_penalty=0.25, region_penalty=0.0, placement_mode='first_fit'):
         """First In First Out - simplest scheduler"""
         for job in job_queue:
-            if Scheduler._try_place_job(job, gpus, network_penalty):
+            if Scheduler._try_place_job(job, gpus, network_penalty, region_penalty, placement_mode):
                 return True
         return False
     
     @staticmethod
-    def _try_place_job(job, gpus, network_penalty=0.25):
-        """Try to place a job on available GPUs with enough VRAM"""
+    def slicing_pays_off(job, gpu, slices):
+        """True if packing jobs like this onto MIG slices keeps most of the GPU's throughput"""
+        per_slice_job = min(gpu.performance * slices / gpu.mig_slices, INFERENCE_PERF_CAP * job.batch_size)
+        return (gpu.mig_slices // slices) * per_slice_job >= MIN_SLICED_THROUGHPUT * gpu.performance
+    
+    @staticmethod
+    def _try_place_job(job, gpus, network_penalty=0.25, region_penalty=0.0, placement_mode='first_fit'):
+        """Try to place a job on available GPUs with enough VRAM
+        
+        placement_mode 'first_fit' takes the first free GPUs; 'compact' packs the
+        job into as few nodes and racks as possible.
+        """
         available_gpus = [g for g in gpus if g.is_available() and g.vram >= job.vram_per_gpu]
         
         if len(available_gpus) >= job.gpu_count:
             # Assign job to GPUs
-            assigned = available_gpus[:job.gpu_count]
+            first_fit = available_gpus[:job.gpu_count]
+            if placement_mode == 'compact':
+                assigned = pick_compact(available_gpus, job.gpu_count)
+            else:
+                assigned = first_fit
             
             # Calculate cross-node penalty (simplified: assume penalty if not all same type)
             cross_node_penalty = 0.0
             if job.gpu_count > 1 and len(set(g.gpu_type for g in assigned)) > 1:
                 cross_node_penalty = network_penalty
             
-            job.start(assigned, cross_node_penalty)
+            job.start(assigned, cross_node_penalty, region_penalty)
             for gpu in assigned:
                 gpu.assign_job(job)
             
+            # Throughput gained over what first-fit would have picked
+            first_fit_penalty = topology_penalty(job.job_type, placement_spread(first_fit))
+            job.compact_gain_pct = ((1 + first_fit_penalty) / (1 + job.topology_penalty) - 1) * 100
+            
             return True
         
         return False
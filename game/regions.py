@@ -0,0 +1,142 @@
+"""Datacenter regions, inter-region latency and per-region GPU pools"""
+from collections import Counter
+
+from .economy import get_network_penalty
+from .topology import node_and_rack
+
+DEFAULT_REGION = 'us-east'
+
+# Regions unlock with revenue, like GPU tiers
+REGIONS = {
+    'us-east': {
+        'name': 'US East (Virginia)',
+        'unlock_revenue': 0
+    },
+    'us-west': {
+        'name': 'US West (Oregon)',
+        'unlock_revenue': 50000
+    },
+    'eu-west': {
+        'name': 'EU West (Dublin)',
+        'unlock_revenue': 150000
+    },
+    'ap-northeast': {
+        'name': 'Asia Pacific (Tokyo)',
+        'unlock_revenue': 400000
+    }
+}
+
+# Round-trip latency between regions in ms (symmetric)
+REGION_LATENCY_MS = {
+    ('us-east', 'us-west'): 65,
+    ('us-east', 'eu-west'): 75,
+    ('us-east', 'ap-northeast'): 160,
+    ('us-west', 'eu-west'): 135,
+    ('us-west', 'ap-northeast'): 100,
+    ('eu-west', 'ap-northeast'): 220
+}
+
+# How far from its origin a job may run: inference serves end users,
+# training only needs its dataset shipped once
+LATENCY_BUDGET_MS = {
+    'inference': 80,
+    'training': 250
+}
+
+# Remote placement slows a job down: fixed overhead + 10% per 100ms RTT
+CROSS_REGION_BASE_PENALTY = 0.05
+CROSS_REGION_PENALTY_PER_MS = 0.001
+
+
+def region_latency(origin, region):
+    """Round-trip latency in ms between two regions"""
+    if origin == region:
+        return 0
+    return REGION_LATENCY_MS.get((origin, region), REGION_LATENCY_MS.get((region, origin), 0))
+
+
+def cross_region_penalty(origin, region):
+    """Duration penalty for running a job from `origin` in `region`"""
+    if origin == region:
+        return 0.0
+    return CROSS_REGION_BASE_PENALTY + region_latency(origin, region) * CROSS_REGION_PENALTY_PER_MS
+
+
+# Regions ordered nearest-first from each origin (the routing order)
+ROUTING_ORDER = {
+    origin: sorted(REGIONS, key=lambda region: region_latency(origin, region))
+    for origin in REGIONS
+}
+
+
+def get_unlocked_regions(total_revenue):
+    """Return list of regions that are unlocked based on revenue"""
+    return [region for region, spec in REGIONS.items() if total_revenue >= spec['unlock_revenue']]
+
+
+class RegionPool:
+    """GPUs owned in one region plus an index of the idle ones
+
+    GPUs report their own busy/idle transitions (GPU.assign_job/clear_job), so
+    the scheduler can reject a region with a couple of dict lookups instead of
+    scanning its GPUs.
+    """
+
+    def __init__(self, region):
+        self.region = region
+        self.gpus = []
+        self.free = {}  # gpu_id -> GPU, idle GPUs in purchase order
+        self.free_by_vram = Counter()  # VRAM size -> idle GPU count
+        self.sliced = {}  # gpu_id -> GPU, partitioned GPUs with free MIG slices
+        self.performance = 0.0  # Total compute of the region's GPUs
+
+    def add(self, gpu):
+        """Add a newly purchased GPU to this region"""
+        self.add_many([gpu])
+
+    def add_many(self, gpus):
+        """Add newly purchased GPUs, updating the indexes in one pass"""
+        for slot, gpu in enumerate(gpus, len(self.gpus)):
+            gpu.region = self.region
+            gpu.node, gpu.rack = node_and_rack(slot)
+            gpu.pool = self
+        self.gpus.extend(gpus)
+        self.performance += sum(gpu.performance for gpu in gpus)
+
+        idle = [gpu for gpu in gpus if gpu.is_available()]
+        self.free.update((gpu.gpu_id, gpu) for gpu in idle)
+        self.free_by_vram.update(gpu.vram for gpu in idle)
+
+    def mark_sliced(self, gpu):
+        """A partitioned GPU's slice usage changed"""
+        self.mark_busy(gpu)
+        if gpu.free_slices() > 0:
+            self.sliced[gpu.gpu_id] = gpu
+        else:
+            self.sliced.pop(gpu.gpu_id, None)
+
+    def mark_free(self, gpu):
+        self.sliced.pop(gpu.gpu_id, None)
+        if gpu.gpu_id not in self.free:
+            self.free[gpu.gpu_id] = gpu
+            self.free_by_vram[gpu.vram] += 1
+
+    def mark_busy(self, gpu):
+        if self.free.pop(gpu.gpu_id, None) is not None:
+            self.free_by_vram[gpu.vram] -= 1
+
+    def free_count(self, min_vram=0):
+        """Idle GPUs with at least min_vram GB (one entry per GPU model)"""
+        return sum(count for vram, count in self.free_by_vram.items() if vram >= min_vram)
+
+    def to_dict(self, total_revenue):
+        spec = REGIONS[self.region]
+        return {
+            'id': self.region,
+            'name': spec['name'],
+            'unlocked': total_revenue >= spec['unlock_revenue'],
+            'unlock_revenue': spec['unlock_revenue'],
+            'gpu_count': len(self.gpus),
+            'free_gpus': len(self.free),
+            'network_penalty_pct': round(get_network_penalty(len(self.gpus)) * 100, 1)
+        }
@@ -0,0 +1,122 @@
+"""Intra-datacenter topology: 8-GPU nodes, racks and the spine
+
+GPUs fill each region's datacenter in purchase order: 8 GPUs per node
+(NVLink/NVSwitch inside), NODES_PER_RACK nodes per rack (leaf switch), and
+racks joined by the spine. A multi-GPU job's collective traffic runs at the
+bandwidth of the slowest link its placement crosses, so spread-out jobs run
+slower than ones packed into a single node.
+"""
+from collections import defaultdict
+
+GPUS_PER_NODE = 8  # DGX/HGX-style node
+NODES_PER_RACK = 4
+
+# Per-GPU bandwidth of the slowest link crossed (GB/s)
+LINK_BANDWIDTH_GBPS = {
+    'gpu': None,  # Single GPU - no collective traffic
+    'node': 900,  # NVLink / NVSwitch
+    'rack': 100,  # Leaf switch (8x 400Gb/s NICs per node)
+    'spine': 50  # Spine, 2:1 oversubscribed
+}
+
+# Share of step time spent in collectives at full NVLink speed
+COMM_SHARE = {
+    'training': 0.02,  # Gradient all-reduce every step
+    'inference': 0.005  # Tensor-parallel activations only
+}
+
+PLACEMENT_MODES = ('compact', 'first_fit')
+
+
+def node_and_rack(slot):
+    """(node, rack) of the GPU in the given purchase slot of a region"""
+    node = slot // GPUS_PER_NODE
+    return node, node // NODES_PER_RACK
+
+
+def placement_spread(gpus):
+    """Widest topology level a set of GPUs spans: 'gpu', 'node', 'rack' or 'spine'"""
+    if len(gpus) <= 1:
+        return 'gpu'
+    if len(set(g.rack for g in gpus)) > 1:
+        return 'spine'
+    if len(set(g.node for g in gpus)) > 1:
+        return 'rack'
+    return 'node'
+
+
+def topology_penalty(job_type, spread):
+    """Duration penalty for a placement spread (0 within a node)"""
+    bandwidth = LINK_BANDWIDTH_GBPS[spread]
+    if bandwidth is None:
+        return 0.0
+    comm_share = COMM_SHARE.get(job_type, 0.0)
+    return comm_share * (LINK_BANDWIDTH_GBPS['node'] / bandwidth - 1)
+
+
+def pick_compact(gpus, count):
+    """Pick `count` GPUs spanning as few nodes and racks as possible
+
+    Best fit at each level: the fullest-fitting node (or rack) with room for
+    the whole job is used, so larger free blocks stay intact for larger jobs.
+
+    Returns:
+        list: Chosen GPUs, or None if there are fewer than `count`
+    """
+    if len(gpus) < count:
+        return None
+
+    nodes = defaultdict(list)
+    for gpu in gpus:
+        nodes[(gpu.rack, gpu.node)].append(gpu)
+
+    # One node
+    fitting = [members for members in nodes.values() if len(members) >= count]
+    if fitting:
+        return min(fitting, key=len)[:count]
+
+    # One rack, largest nodes first
+    racks = defaultdict(list)
+    for (rack, _), members in nodes.items():
+        racks[rack].append(members)
+    fitting = [rack_nodes for rack_nodes in racks.values()
+               if sum(len(members) for members in rack_nodes) >= count]
+    if fitting:
+        rack_nodes = min(fitting, key=lambda r: sum(len(m) for m in r))
+        return _take_largest_first(rack_nodes, count)
+
+    # Across the spine: fullest nodes first to touch as few as possible
+    return _take_largest_first(list(nodes.values()), count)
+
+
+def group_compact(gpus, size, count):
+    """Split GPUs into up to `count` groups of `size`, as compact as possible
+
+    Whole groups are cut inside single nodes first; the leftovers of all
+    nodes are then grouped in rack/node order.
+
+    Returns:
+        list: Lists of GPUs, one per group
+    """
+    by_node = defaultdict(list)
+    for gpu in sorted(gpus, key=lambda g: (g.rack, g.node, g.gpu_id)):
+        by_node[(gpu.rack, gpu.node)].append(gpu)
+
+    ordered, leftovers = [], []
+    for members in by_node.values():
+        whole = len(members) - len(members) % size
+        ordered.extend(members[:whole])
+        leftovers.extend(members[whole:])
+    ordered.extend(leftovers)
+
+    groups = [ordered[start:start + size] for start in range(0, len(ordered) - size + 1, size)]
+    return groups[:count]
+
+
+def _take_largest_first(node_groups, count):
+    chosen = []
+    for members in sorted(node_groups, key=len, reverse=True):
+        chosen.extend(members[:count - len(chosen)])
+        if len(chosen) == count:
+            break
+    return chosen
@@ -0,0 +1,257 @@
+"""Workload generation - pluggable arrival processes and trace replay
+
+An arrival process decides how many jobs arrive during a tick. The game's
+spawn rate (jobs per second of game time, derived from marketing, fleet size
+and events) is passed in on every tick, so processes scale with the game.
+Unlike the old one-spawn-per-interval check, several jobs can arrive in a
+single tick when the rate is high or the tick is long (20x speed).
+
+Each arrival is a record: None for a synthetic job drawn from the phase mix,
+or a dict describing the job (as replayed from a JSONL trace).
+"""
+import json
+import math
+import random
+
+from .jobs import JobGenerator, JOB_SHAPES, JOB_MIX, CUSTOMER_POOLS
+
+
+class FixedRateArrivals:
+    """Evenly spaced arrivals at the current spawn rate (classic game pacing)"""
+
+    def __init__(self):
+        self.credit = 0.0  # Fractional arrivals carried between ticks
+
+    def arrivals(self, dt, rate):
+        self.credit += dt * rate
+        count = int(self.credit + 1e-9)  # Tolerate float drift (10 x 0.1 != 1.0)
+        self.credit = max(0.0, self.credit - count)
+        return [None] * count
+
+
+class PoissonArrivals:
+    """Memoryless arrivals - independent customers submitting jobs"""
+
+    def __init__(self, rate_multiplier=1.0):
+        self.rate_multiplier = rate_multiplier
+
+    def arrivals(self, dt, rate):
+        return [None] * poisson(dt * rate * self.rate_multiplier)
+
+
+class BurstyArrivals:
+    """Two-state (calm/burst) Markov-modulated Poisson arrivals
+
+    Models launch-day style traffic: long calm stretches at the base rate,
+    broken by short bursts at burst_multiplier times the rate.
+    """
+
+    def __init__(self, burst_multiplier=5.0, mean_calm=60.0, mean_burst=10.0):
+        self.burst_multiplier = burst_multiplier
+        self.mean_calm = mean_calm  # Average seconds between bursts
+        self.mean_burst = mean_burst  # Average burst length in seconds
+        self.in_burst = False
+
+    def arrivals(self, dt, rate):
+        # Exponential holding times: switch state with probability 1 - e^(-dt/mean)
+        mean = self.mean_burst if self.in_burst else self.mean_calm
+        if random.random() < 1.0 - math.exp(-dt / mean):
+            self.in_burst = not self.in_burst
+
+        multiplier = self.burst_multiplier if self.in_burst else 1.0
+        return [None] * poisson(dt * rate * multiplier)
+
+
+# Numeric job fields a trace record may override -> whether zero is allowed
+TRACE_NUMERIC_FIELDS = {
+    't': True,
+    'base_duration': False,
+    'vram_per_gpu': True,
+    'base_payout': True,
+    'sla_window': True,
+    'latency_budget_ms': True
+}
+
+
+def check_trace_record(record, shapes):
+    """Return what is wrong with a trace record, or None if it can be replayed"""
+    if not isinstance(record, dict):
+        return "record must be a JSON object"
+    for field, zero_ok in TRACE_NUMERIC_FIELDS.items():
+        if field not in record:
+            continue
+        value = record[field]
+        if (not isinstance(value, (int, float)) or isinstance(value, bool)
+                or not math.isfinite(value) or value < 0 or (value == 0 and not zero_ok)):
+            return f"'{field}' must be a {'non-negative' if zero_ok else 'positive'} number"
+    if 'gpu_count' in record:
+        count = record['gpu_count']
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            return "'gpu_count' must be a positive integer"
+    if 'shape' in record and record['shape'] not in shapes:
+        return f"unknown shape {record['shape']!r} (expected one of {', '.join(shapes)})"
+    if 'job_type' in record and record['job_type'] not in CUSTOMER_POOLS:
+        return f"unknown job_type {record['job_type']!r} (expected one of {', '.join(CUSTOMER_POOLS)})"
+    for field in ('customer_name', 'task_description'):
+        if field in record and (not isinstance(record[field], str) or not record[field]):
+            return f"'{field}' must be a non-empty string"
+    return None
+
+
+class TraceArrivals:
+    """Replay recorded arrivals from a JSONL trace
+
+    Each line is a JSON object. 't' is the arrival time in seconds of game
+    time since the replay started (records without 't' are spaced `gap`
+    seconds apart). All other keys describe the job: 'shape' names an entry
+    in the shape catalog and any job field ('gpu_count', 'vram_per_gpu',
+    'base_duration', 'base_payout', 'sla_window', 'job_type',
+    'customer_name', 'task_description') overrides it.
+
+    Records are checked when the trace is loaded, so a bad record fails at
+    startup with a ValueError naming its line instead of on every tick.
+    """
+
+    def __init__(self, records, time_scale=1.0, loop=False, gap=1.0, shapes=None, line_numbers=None):
+        shapes = shapes or JOB_SHAPES
+        self.records = []
+        t = 0.0
+        for index, record in enumerate(records):
+            error = check_trace_record(record, shapes)
+            if error:
+                line = line_numbers[index] if line_numbers else index + 1
+                raise ValueError(f"Trace record on line {line}: {error}")
+            record = dict(record)
+            t = float(record.pop('t', t + gap))
+            self.records.append((t, record))
+        self.records.sort(key=lambda r: r[0])
+
+        self.time_scale = time_scale  # >1 replays faster than recorded
+        self.loop = loop
+        self.clock = 0.0
+        self.position = 0
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Load a trace from a JSONL file (blank lines are skipped)"""
+        records, line_numbers = [], []
+        with open(path) as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Trace record on line {number}: invalid JSON ({e.msg})") from None
+                line_numbers.append(number)
+        return cls(records, line_numbers=line_numbers, **kwargs)
+
+    def is_exhausted(self):
+        return not self.loop and self.position >= len(self.records)
+
+    def arrivals(self, dt, rate):
+        """Return records due this tick (the game's spawn rate is ignored)"""
+        if not self.records:
+            return []
+
+        self.clock += dt * self.time_scale
+        due = []
+        while True:
+            if self.position >= len(self.records):
+                if not self.loop:
+                    break
+                # Wrap around: restart the trace after its last arrival
+                self.clock -= self.records[-1][0]
+                self.position = 0
+                if self.records[-1][0] <= 0:
+                    break  # Degenerate trace (all at t=0) - replay once per tick
+            t, record = self.records[self.position]
+            if t > self.clock:
+                break
+            due.append(record)
+            self.position += 1
+        return due
+
+
+ARRIVAL_PROCESSES = {
+    'fixed': FixedRateArrivals,
+    'poisson': PoissonArrivals,
+    'bursty': BurstyArrivals,
+    'trace': TraceArrivals.from_file
+}
+
+
+def poisson(lam):
+    """Sample a Poisson-distributed count with mean lam"""
+    if lam <= 0:
+        return 0
+    if lam > 30:
+        # Normal approximation - Knuth's method gets slow for large means
+        return max(0, int(round(random.gauss(lam, math.sqrt(lam)))))
+
+    threshold = math.exp(-lam)
+    count = 0
+    product = random.random()
+    while product > threshold:
+        count += 1
+        product *= random.random()
+    return count
+
+
+def load_job_shapes(path):
+    """Load a custom job-shape catalog from a JSON file
+
+    Shapes in the file are added to the stock catalog (or replace stock shapes
+    of the same name), so the phase mix keeps working.
+    """
+    with open(path) as f:
+        shapes = json.load(f)
+
+    required = ('base_duration', 'vram_per_gpu', 'base_payout', 'sla_window', 'gpu_count')
+    for name, spec in shapes.items():
+        missing = [key for key in required if key not in spec]
+        if missing:
+            raise ValueError(f"Job shape '{name}' is missing {', '.join(missing)}")
+        spec.setdefault('customers', ['inference'])
+        unknown = [pool for pool in spec['customers'] if pool not in CUSTOMER_POOLS]
+        if unknown or not spec['customers']:
+            raise ValueError(f"Job shape '{name}' needs customer pools from {', '.join(CUSTOMER_POOLS)}")
+    return {**JOB_SHAPES, **shapes}
+
+
+class Workload:
+    """Arrival process + job-shape catalog + phase mix for one game"""
+
+    def __init__(self, process=None, shapes=None, mix=None):
+        self.process = process or FixedRateArrivals()
+        self.shapes = shapes or JOB_SHAPES
+        self.mix = mix or JOB_MIX
+
+    @classmethod
+    def create(cls, kind='fixed', shapes=None, mix=None, **options):
+        """Build a workload by arrival process name (see ARRIVAL_PROCESSES)"""
+        if kind not in ARRIVAL_PROCESSES:
+            raise ValueError(f"Unknown arrival process: {kind}")
+        if kind == 'trace':
+            options = {'shapes': shapes, **options}  # Trace records are checked against the catalog
+        return cls(ARRIVAL_PROCESSES[kind](**options), shapes, mix)
+
+    def arrivals(self, dt, rate):
+        """Arrival records for a tick of dt seconds at `rate` jobs per second"""
+        return self.process.arrivals(dt, rate)
+
+    def create_job(self, record, total_revenue, value_multiplier=1.0, sla_extension=0,
+                   available_gpu_count=1):
+        """Turn an arrival record into a Job"""
+        if record is None:
+            return JobGenerator.generate_job(
+                total_revenue, value_multiplier, sla_extension, available_gpu_count,
+                shapes=self.shapes, mix=self.mix
+            )
+
+        overrides = dict(record)
+        shape_name = overrides.pop('shape', None)
+        if shape_name is None:
+            shape_name = JobGenerator.pick_shape(total_revenue, available_gpu_count, self.mix)
+        return JobGenerator.create_job(shape_name, value_multiplier, sla_extension,
+                                       self.shapes, overrides)
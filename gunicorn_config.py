@@ -1,12 +1,21 @@
 # Gunicorn configuration for GPU Tycoon
+import gc
 import os
 
 # Server socket
 bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
 workers = 1
-worker_class = 'sync'
 timeout = 120
 
+# Worker class - 'sync' by default. For long-polling clients use an async worker:
+#   WORKER_CLASS=gevent   (pip install gevent) - thousands of idle connections per process
+#   WORKER_CLASS=gthread  with WORKER_THREADS=N - a thread pool, no extra dependency
+# app.py holds a per-session lock around each request, so concurrent ticks and
+# actions for the same game are applied one at a time.
+worker_class = os.environ.get('WORKER_CLASS', 'sync')
+threads = int(os.environ.get('WORKER_THREADS', '1'))
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', '1000'))
+
 # Logging
 accesslog = '-'
 errorlog = '-'
@@ -15,7 +24,28 @@ loglevel = 'info'
 # Worker configuration
 keepalive = 5
 
-# For session support - use a single worker or enable sticky sessions
-# This ensures users connect to the same worker
+# Preload: import app.py once in the master (catalogs, compiled templates, the
+# serialized catalog response) and fork workers from it. Set PRELOAD_APP=false
+# to have every worker import the app itself.
+preload_app = os.environ.get('PRELOAD_APP', 'true').lower() == 'true'
+
+if preload_app:
+    # No collections in the master while it loads: they would only touch pages
+    # the workers are about to share
+    gc.disable()
+
+def when_ready(server):
+    """Master is done loading: freeze its objects so workers never dirty their pages"""
+    if preload_app:
+        gc.collect()
+        gc.freeze()  # Frozen objects are skipped by the collector - pages stay shared
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
+
+# For session support - use a single worker per process. To scale across cores,
+# run `python router.py --workers N`: it starts N of these processes (one shard
+# each) and routes every session to the process that owns it.
 worker_tmp_dir = '/dev/shm'
 
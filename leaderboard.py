@@ -0,0 +1,230 @@
+"""Cross-session leaderboard with incrementally maintained top-K indexes
+
+Each metric keeps its sessions in an indexable skip list ordered best-first,
+so updating a score, reading the top K and finding a session's rank are all
+O(log n) (plus K for the top list). Sessions are re-scored when they are
+ticked, never by scanning game_sessions.
+
+Entries are personal bests, so a reset doesn't wipe a player's standing.
+Scores are written to SQLite in batches (flush) and reloaded at startup, so
+they outlive hibernated, evicted and restarted sessions. Each flush also
+pulls the scores other shards (router.py) wrote since the last one.
+"""
+import hashlib
+import math
+import random
+import sqlite3
+import threading
+import time
+
+MIN_JOBS_FOR_SLA_RANK = 200  # Jobs completed before a session's SLA rate is ranked
+
+# Metric -> True if higher scores rank first
+METRICS = {
+    'total_revenue': True,
+    'gpu_count': True,
+    'sla_rate': True,
+    'time_to_victory': False
+}
+
+
+def session_scores(game):
+    """Scores a game currently has, per metric (unranked metrics are left out)"""
+    scores = {
+        'total_revenue': round(game.total_revenue, 2),
+        'gpu_count': len(game.gpus)
+    }
+    if game.jobs_completed >= MIN_JOBS_FOR_SLA_RANK:
+        scores['sla_rate'] = round(1 - game.sla_misses / game.jobs_completed, 4)
+    victory_time = getattr(game, 'victory_time', None)
+    if victory_time is not None:
+        scores['time_to_victory'] = round(victory_time, 1)
+    return scores
+
+
+def player_name(session_id):
+    """Public name for a session (the session ID itself is a secret)"""
+    return 'player-' + hashlib.sha256(session_id.encode()).hexdigest()[:8]
+
+
+class _Node:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, levels):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class IndexableSkipList:
+    """Sorted list of unique keys with O(log n) insert, remove and rank
+
+    Each link stores how many positions it skips, so a search can count the
+    keys it passes on the way down.
+    """
+
+    MAX_LEVELS = 32
+
+    def __init__(self):
+        self.tail = _Node(None, 0)
+        self.head = _Node(None, self.MAX_LEVELS)
+        self.head.next = [self.tail] * self.MAX_LEVELS
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _before(self, key):
+        """Last node on each level whose key is below `key`, and its position"""
+        chain = [None] * self.MAX_LEVELS
+        positions = [0] * self.MAX_LEVELS
+        node, position = self.head, 0
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not self.tail and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+            positions[level] = position
+        return chain, positions
+
+    def insert(self, key):
+        chain, positions = self._before(key)
+        levels = min(self.MAX_LEVELS, 1 - int(math.log(1.0 - random.random(), 2)))
+        node = _Node(key, levels)
+        position = positions[0] + 1  # Where the new node lands
+        for level in range(levels):
+            prev = chain[level]
+            node.next[level] = prev.next[level]
+            prev.next[level] = node
+            node.width[level] = prev.width[level] - (position - positions[level]) + 1
+            prev.width[level] = position - positions[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        chain, _ = self._before(key)
+        node = chain[0].next[0]
+        if node is self.tail or node.key != key:
+            raise KeyError(key)
+        for level in range(len(node.next)):
+            prev = chain[level]
+            prev.width[level] += node.width[level] - 1
+            prev.next[level] = node.next[level]
+        for level in range(len(node.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def rank(self, key):
+        """Number of keys below `key` (its 0-based index if present)"""
+        _, positions = self._before(key)
+        return positions[0]
+
+    def first(self, count):
+        """The `count` smallest keys"""
+        keys = []
+        node = self.head.next[0]
+        while node is not self.tail and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class Leaderboard:
+    """Per-metric rankings of all sessions that ever played"""
+
+    def __init__(self, path=None):
+        self._lock = threading.Lock()
+        self.indexes = {metric: IndexableSkipList() for metric in METRICS}
+        self.scores = {}  # session_id -> {metric: score}
+        self.dirty = set()
+        self.last_sync = 0.0
+
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            with self._conn:
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS leaderboard ('
+                    'session_id TEXT NOT NULL, metric TEXT NOT NULL, score REAL NOT NULL, '
+                    'updated_at REAL NOT NULL, PRIMARY KEY (session_id, metric))'
+                )
+                self._conn.execute(
+                    'CREATE INDEX IF NOT EXISTS leaderboard_updated ON leaderboard (updated_at)'
+                )
+            with self._lock:
+                self._pull()
+
+    @staticmethod
+    def _key(metric, session_id, score):
+        return (-score if METRICS[metric] else score, session_id)
+
+    def _set(self, session_id, metric, score, changed=True):
+        """Record a score if it is a personal best (changed=False: it is already on disk)"""
+        current = self.scores.setdefault(session_id, {})
+        old = current.get(metric)
+        if old is not None and (score <= old if METRICS[metric] else score >= old):
+            return  # Not a new personal best
+        index = self.indexes[metric]
+        if old is not None:
+            index.remove(self._key(metric, session_id, old))
+        index.insert(self._key(metric, session_id, score))
+        current[metric] = score
+        if changed:
+            self.dirty.add(session_id)
+
+    def update(self, session_id, game):
+        """Re-score a session after it changed (no-op for unchanged metrics)"""
+        scores = session_scores(game)
+        with self._lock:
+            for metric, score in scores.items():
+                self._set(session_id, metric, score)
+
+    def top(self, metric, count=10):
+        """Best `count` entries of a metric"""
+        with self._lock:
+            keys = self.indexes[metric].first(count)
+            return [{'rank': rank, 'player': player_name(session_id),
+                     'score': self.scores[session_id][metric]}
+                    for rank, (_, session_id) in enumerate(keys, 1)]
+
+    def rank(self, metric, session_id):
+        """(1-based rank, ranked sessions) of a session, rank None if unranked"""
+        with self._lock:
+            index = self.indexes[metric]
+            score = self.scores.get(session_id, {}).get(metric)
+            if score is None:
+                return None, len(index)
+            return index.rank(self._key(metric, session_id, score)) + 1, len(index)
+
+    def flush(self):
+        """Write changed scores to disk and pick up other shards' changes"""
+        if self._conn is None:
+            return
+        now = time.time()
+        with self._lock:
+            rows = [(session_id, metric, score, now)
+                    for session_id in self.dirty
+                    for metric, score in self.scores[session_id].items()]
+            self.dirty.clear()
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO leaderboard (session_id, metric, score, updated_at) '
+                    'VALUES (?, ?, ?, ?)', rows
+                )
+            self._pull()
+
+    def _pull(self):
+        """Merge scores written since the last sync (only better ones change anything)
+
+        The caller holds self._lock. Merged scores are already on disk, so
+        they are not marked dirty.
+        """
+        rows = self._conn.execute(
+            'SELECT session_id, metric, score, updated_at FROM leaderboard WHERE updated_at >= ?',
+            (self.last_sync,)
+        ).fetchall()
+        for session_id, metric, score, updated_at in rows:
+            if metric in METRICS:
+                self._set(session_id, metric, score, changed=False)
+            self.last_sync = max(self.last_sync, updated_at)
@@ -0,0 +1,300 @@
+"""Load generator that emulates browser clients of GPU Tycoon
+
+Each virtual user behaves like static/js/game.js: it gets a session cookie,
+then POSTs /api/tick every 200 ms / speed with dt = elapsed * speed (capped
+at 0.5 s), asking for the sparse tick fields and for the full state every
+2 s. In between it sends player actions at a configurable rate (buy_gpu,
+create_cluster, invest_in_contract) using the state it last received.
+
+The report covers throughput, p50/p95/p99 latency per endpoint, the error
+rate and the server's resident memory (sampled from /api/health).
+
+Usage:
+    python app.py                                    # or gunicorn / router.py
+    python loadtest.py --users 50 --speed 5 --duration 60
+"""
+import argparse
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit
+
+TICK_INTERVAL = 0.2  # Seconds between ticks at 1x (GameManager.tickInterval)
+MAX_TICK_DT = 0.5  # Client-side dt clamp
+FULL_STATE_INTERVAL = 2.0  # Seconds between full-state ticks
+RETRY_AFTER = 0.2  # Back-off after a 429, as sent in the server's Retry-After
+TICK_FIELDS = [
+    'cash', 'total_revenue', 'total_power_cost', 'gpus', 'job_queue', 'active_jobs',
+    'cooling_tier', 'scheduler_tier', 'network_penalty_pct', 'auto_assign', 'placement_mode',
+    'auto_cluster', 'pue', 'capacity', 'stats', 'victory', 'active_event', 'clusters',
+    'unlocks', 'regions'  # The GPU shop tab is open
+]
+
+# Relative weights of the player actions sent between ticks
+ACTION_MIX = {
+    'buy_gpu': 5,
+    'create_cluster': 2,
+    'invest_in_contract': 2
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+class Stats:
+    """Latencies and outcomes per endpoint, shared by all virtual users"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)  # endpoint -> seconds
+        self.errors = defaultdict(int)  # endpoint -> failed requests
+        self.statuses = defaultdict(int)  # HTTP status (0 = connection error) -> count
+
+    def record(self, endpoint, latency, status):
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+            self.statuses[status] += 1
+            if status == 0 or status >= 400:
+                self.errors[endpoint] += 1
+
+
+class VirtualUser(threading.Thread):
+    """One emulated browser tab"""
+
+    def __init__(self, base_url, speed, action_rate, stop_at, stats):
+        super().__init__(daemon=True)
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.speed = speed
+        self.action_rate = action_rate  # Actions per wall second
+        self.stop_at = stop_at
+        self.stats = stats
+        self.conn = None
+        self.cookies = SimpleCookie()
+        self.last_status = None
+        self.unsent_dt = 0.0  # Game time of a rate-limited tick, resent like game.js does
+        self.state = {}
+        self.gpu_costs = {}
+
+    def request(self, method, path, endpoint, body=None):
+        """Send a request, record it, and return the decoded JSON (None on failure)"""
+        headers = {'Accept-Encoding': 'identity'}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={m.value}' for k, m in self.cookies.items())
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+            body = json.dumps(body)
+
+        started = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.stats.record(endpoint, time.perf_counter() - started, 0)
+            self.last_status = 0
+            if self.conn is not None:
+                self.conn.close()
+            self.conn = None  # Reconnect on the next request
+            return None
+        self.stats.record(endpoint, time.perf_counter() - started, response.status)
+        self.last_status = response.status
+
+        for header in response.headers.get_all('Set-Cookie') or []:
+            self.cookies.load(header)
+        try:
+            return json.loads(data) if response.status < 400 else None
+        except ValueError:
+            return None
+
+    def tick(self, dt, full_state):
+        """Send one tick; True if it was rate limited (its dt is kept for the next one)"""
+        path = '/api/tick' if full_state else '/api/tick?fields=' + ','.join(TICK_FIELDS)
+        result = self.request('POST', path, 'tick (full)' if full_state else 'tick', {'dt': dt})
+        if self.last_status == 429:
+            self.unsent_dt = dt
+            return True
+        if result and result.get('success'):
+            self.state.update(result['state'])
+        return False
+
+    def pick_action(self):
+        """A realistic action for the current state, or None if none applies"""
+        action_type = random.choices(list(ACTION_MIX), weights=list(ACTION_MIX.values()))[0]
+        state = self.state
+
+        if action_type == 'buy_gpu':
+            affordable = [gpu_type for gpu_type in state.get('unlocks', {}).get('gpus', [])
+                          if self.gpu_costs.get(gpu_type, float('inf')) <= state.get('cash', 0)]
+            if affordable:
+                return {'type': 'buy_gpu', 'gpu_type': random.choice(affordable)}
+        elif action_type == 'create_cluster':
+            unclustered = state.get('unclustered_gpus', [])
+            if len(unclustered) >= 2:
+                return {'type': 'create_cluster', 'gpu_ids': random.sample(unclustered, 2)}
+        elif action_type == 'invest_in_contract':
+            contracts = state.get('contracts', {})
+            negotiating = contracts.get('negotiating', [])
+            if negotiating:
+                amount = int(min(state.get('cash', 0) * 0.2, 10000))
+                return {'type': 'invest_in_contract', 'contract_id': negotiating[0]['id'], 'amount': amount}
+            eligible = [a['contract']['id'] for a in contracts.get('available', []) if a['eligible']]
+            if eligible:
+                return {'type': 'start_contract_negotiation', 'contract_id': eligible[0]}
+        return None
+
+    def run(self):
+        # Page load: the catalog, then the first state (which sets the session cookie)
+        catalog = self.request('GET', '/api/catalog', 'catalog') or {}
+        self.gpu_costs = {gpu_type: spec['cost'] for gpu_type, spec in catalog.get('gpus', {}).items()}
+        self.state = self.request('GET', '/api/state', 'state') or {}
+
+        last_tick = time.perf_counter()
+        last_full = last_tick
+        next_action = last_tick + random.expovariate(self.action_rate) if self.action_rate > 0 else float('inf')
+        while time.time() < self.stop_at:
+            now = time.perf_counter()
+            dt = min((now - last_tick) * self.speed + self.unsent_dt, MAX_TICK_DT)
+            self.unsent_dt = 0.0
+            last_tick = now
+            full_state = now - last_full >= FULL_STATE_INTERVAL
+            if full_state:
+                last_full = now
+            rate_limited = self.tick(dt, full_state)
+
+            if now >= next_action:
+                action = self.pick_action()
+                if action is not None:
+                    self.request('POST', '/api/action', f"action:{action['type']}", action)
+                next_action = now + random.expovariate(self.action_rate)
+
+            # Like the browser: the next tick is scheduled after the response arrives
+            time.sleep(max(TICK_INTERVAL / self.speed, RETRY_AFTER if rate_limited else 0))
+
+        if self.conn is not None:
+            self.conn.close()
+
+
+class MemorySampler(threading.Thread):
+    """Polls /api/health once a second for the server's resident memory"""
+
+    def __init__(self, base_url, stop_at):
+        super().__init__(daemon=True)
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.stop_at = stop_at
+        self.samples = []  # (seconds since start, RSS MB, resident sessions)
+
+    def run(self):
+        started = time.time()
+        while time.time() < self.stop_at:
+            try:
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+                conn.request('GET', '/api/health')
+                health = json.loads(conn.getresponse().read())
+                conn.close()
+                if health.get('rss_mb') is not None:
+                    self.samples.append((time.time() - started, health['rss_mb'], health.get('active_sessions')))
+            except (OSError, ValueError, http.client.HTTPException):
+                pass
+            time.sleep(1.0)
+
+
+def build_report(stats, sampler, elapsed, users, speed):
+    endpoints = {}
+    total = 0
+    total_errors = 0
+    for endpoint, latencies in sorted(stats.latencies.items()):
+        latencies.sort()
+        errors = stats.errors[endpoint]
+        total += len(latencies)
+        total_errors += errors
+        endpoints[endpoint] = {
+            'requests': len(latencies),
+            'per_second': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+            'errors': errors
+        }
+
+    rss = [mb for _, mb, _ in sampler.samples]
+    return {
+        'users': users,
+        'speed': speed,
+        'duration_s': round(elapsed, 1),
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 1),
+        'error_rate_pct': round(total_errors / total * 100, 2) if total else 0.0,
+        'statuses': dict(sorted(stats.statuses.items())),
+        'endpoints': endpoints,
+        'server_rss_mb': {
+            'start': rss[0], 'peak': max(rss), 'end': rss[-1]
+        } if rss else None
+    }
+
+
+def print_report(report):
+    print(f"\n{report['users']} users at {report['speed']}x for {report['duration_s']}s: "
+          f"{report['requests']} requests, {report['throughput_rps']} req/s, "
+          f"{report['error_rate_pct']}% errors")
+    print(f"{'endpoint':<34}{'requests':>9}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for endpoint, row in report['endpoints'].items():
+        print(f"{endpoint:<34}{row['requests']:>9}{row['per_second']:>8}{row['p50_ms']:>9}"
+              f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['errors']:>8}")
+    print(f"HTTP statuses: {report['statuses']}")
+    rss = report['server_rss_mb']
+    if rss:
+        print(f"Server RSS: {rss['start']} MB at start, {rss['peak']} MB peak, {rss['end']} MB at end")
+    else:
+        print("Server RSS: not reported by /api/health")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Emulate browser clients against a GPU Tycoon server')
+    parser.add_argument('--url', default='http://localhost:5000', help='Server (or router) base URL')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users')
+    parser.add_argument('--speed', type=int, default=5, choices=[1, 2, 5, 20], help='Game speed of every user')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    parser.add_argument('--action-rate', type=float, default=0.2, help='Player actions per second per user')
+    parser.add_argument('--ramp-up', type=float, default=5, help='Seconds over which users join')
+    parser.add_argument('--json', help='Also write the report to this file')
+    args = parser.parse_args()
+
+    stats = Stats()
+    stop_at = time.time() + args.ramp_up + args.duration
+    sampler = MemorySampler(args.url, stop_at)
+    sampler.start()
+
+    started = time.time()
+    users = []
+    for index in range(args.users):
+        user = VirtualUser(args.url, args.speed, args.action_rate, stop_at, stats)
+        user.start()
+        users.append(user)
+        time.sleep(args.ramp_up / max(args.users, 1))
+    for user in users:
+        user.join()
+    elapsed = time.time() - started
+
+    report = build_report(stats, sampler, elapsed, args.users, args.speed)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Per-session memory accounting and a byte budget for resident games
+
+A game's footprint is estimated from the sizes of its growing parts (GPUs,
+jobs, clusters, SLA history, demand windows) times a per-item cost. The
+costs are measured once with tracemalloc on freshly built objects, so an
+estimate is a handful of len() calls and stays current as the code
+changes. The accountant keeps a running total of the resident sessions'
+estimates, updated after every request. When the total exceeds the budget,
+app.py hibernates the costliest idle sessions first.
+"""
+import functools
+import tracemalloc
+from collections import deque
+
+from game.clusters import GPUCluster
+from game.game_state import GameState
+from game.jobs import Job
+
+CALIBRATION_ITEMS = 200  # Items built per measurement
+MIN_IDLE_FOR_EVICTION = 30.0  # Seconds idle before a session counts as idle
+
+
+def _measure(build, count=1):
+    """Bytes allocated (and still referenced) by build(), per item"""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()  # Keep the result alive until measured
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    if not was_tracing:
+        tracemalloc.stop()
+    del kept
+    return max(1, allocated // count)
+
+
+@functools.cache
+def item_costs():
+    """Measured bytes per item of each part of a GameState
+
+    The calibration objects are thrown away, so the global job and cluster ID
+    counters are put back afterwards.
+    """
+    next_ids = Job._next_id, GPUCluster._next_id
+    try:
+        return _calibrate()
+    finally:
+        Job._next_id, GPUCluster._next_id = next_ids
+
+
+def _calibrate():
+    def rich_game():
+        game = GameState()
+        game.cash = 1e12
+        return game
+
+    def checked(result):
+        success, value = result
+        assert success, value
+        return value
+
+    def jobs(game):
+        return [game.workload.create_job(None, 0) for _ in range(CALIBRATION_ITEMS)]
+
+    game = rich_game()
+    sample_jobs = jobs(game)
+
+    def gpus():
+        g = rich_game()
+        return _measure(lambda: checked(g.purchase_gpus('L4', CALIBRATION_ITEMS)), CALIBRATION_ITEMS)
+
+    def clusters():
+        g = rich_game()
+        checked(g.purchase_gpus('L4', CALIBRATION_ITEMS * 2))
+        return _measure(lambda: checked(g.create_gpu_clusters('L4', 2, CALIBRATION_ITEMS)),
+                        CALIBRATION_ITEMS)
+
+    def arrivals():
+        g = rich_game()
+        return _measure(lambda: [g.forecaster.record_arrival(job, 0.0) for job in sample_jobs],
+                        CALIBRATION_ITEMS)
+
+    def demand_window():
+        g = rich_game()
+        return _measure(lambda: [g.auto_clusterer.record_job(job) for job in sample_jobs],
+                        CALIBRATION_ITEMS)
+
+    def sla_history():
+        history = deque(maxlen=CALIBRATION_ITEMS)
+        return _measure(lambda: history.extend([1] * CALIBRATION_ITEMS), CALIBRATION_ITEMS)
+
+    return {
+        'base': _measure(GameState),
+        'gpus': gpus(),
+        'jobs': _measure(lambda: jobs(game), CALIBRATION_ITEMS),
+        'clusters': clusters(),
+        'sla_history': sla_history(),
+        'forecast_arrivals': arrivals(),
+        'demand_window': demand_window()
+    }
+
+
+def estimate_bytes(game):
+    """Estimated footprint of a game, per part
+
+    Returns:
+        dict: part -> bytes
+    """
+    counts = {
+        'base': 1,
+        'gpus': len(game.gpus),
+        'jobs': len(game.job_queue) + len(game.active_jobs) + len(game.admission.deferred),
+        'clusters': len(game.cluster_manager.clusters),
+        'sla_history': len(game.sla_history),
+        'forecast_arrivals': len(game.forecaster.arrivals),
+        'demand_window': len(game.auto_clusterer.recent_jobs)
+    }
+    costs = item_costs()
+    return {part: count * costs[part] for part, count in counts.items()}
+
+
+class MemoryAccountant:
+    """Running estimate of the resident sessions' memory against a budget"""
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.sessions = {}  # session_id -> estimated bytes
+        self.total = 0
+
+    def update(self, session_id, game):
+        """Re-estimate a session after a request changed it"""
+        size = sum(estimate_bytes(game).values())
+        self.total += size - self.sessions.get(session_id, 0)
+        self.sessions[session_id] = size
+        return size
+
+    def forget(self, session_id):
+        """A session left memory (hibernated or evicted)"""
+        self.total -= self.sessions.pop(session_id, 0)
+
+    def over_budget(self):
+        return self.total > self.budget_bytes
+
+    def eviction_order(self, last_seen, now, exclude=None):
+        """Sessions to hibernate first: idle ones costliest-first, then the rest by LRU"""
+        idle, active = [], []
+        for session_id, size in self.sessions.items():
+            if session_id == exclude:
+                continue
+            seen = last_seen.get(session_id, 0)
+            if now - seen >= MIN_IDLE_FOR_EVICTION:
+                idle.append((-size, session_id))
+            else:
+                active.append((seen, session_id))
+        return [sid for _, sid in sorted(idle)] + [sid for _, sid in sorted(active)]
+
+    def to_dict(self, last_seen, now, games, limit=50):
+        """Budget usage and the largest sessions, with a per-part breakdown"""
+        largest = sorted(self.sessions.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return {
+            'budget_bytes': self.budget_bytes,
+            'total_bytes': self.total,
+            'used_pct': round(self.total / self.budget_bytes * 100, 1) if self.budget_bytes else None,
+            'resident_sessions': len(self.sessions),
+            'item_costs': item_costs(),
+            'sessions': [
+                {
+                    'session': session_id,
+                    'bytes': size,
+                    'idle_seconds': round(now - last_seen.get(session_id, now), 1),
+                    'breakdown': estimate_bytes(games[session_id]) if session_id in games else None
+                }
+                for session_id, size in largest
+            ]
+        }
@@ -0,0 +1,163 @@
+"""Sticky session router for multi-process GPU Tycoon
+
+Game state lives in process memory, so every request for a session must reach
+the process that owns it. This router starts N single-worker gunicorn
+backends (shards) on consecutive local ports and proxies each request to the
+shard that owns its session_id. Each shard only creates session ids that
+hash to itself (see app.new_session_id), so routing needs no shared state.
+
+Usage:
+    python router.py --workers 4          # listens on $PORT (default 5000)
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SESSION_COOKIE_NAME = 'session'
+
+# Headers that apply to a single connection and must not be forwarded
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade'
+}
+
+
+def shard_for_session(session_id, shard_count):
+    """Stable shard index for a session id (same answer in every process)"""
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32(session_id.encode()) % shard_count
+
+
+def session_id_from_cookie(cookie_value):
+    """Read session_id from a Flask session cookie without verifying it
+
+    The payload of a Flask cookie is signed, not encrypted. The router only
+    uses it to pick a shard - the owning backend still verifies the signature.
+    """
+    try:
+        compressed = cookie_value.startswith('.')
+        payload = cookie_value.lstrip('.').split('.')[0]
+        data = base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4))
+        if compressed:
+            data = zlib.decompress(data)
+        return json.loads(data).get('session_id')
+    except (ValueError, zlib.error, AttributeError):
+        return None
+
+
+class RouterHandler(BaseHTTPRequestHandler):
+    """Proxies requests to the shard owning the request's session"""
+    protocol_version = 'HTTP/1.1'
+    backend_ports = []
+    next_backend = 0  # Round-robin cursor for requests without a session
+
+    def _pick_backend(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        if SESSION_COOKIE_NAME in cookie:
+            session_id = session_id_from_cookie(cookie[SESSION_COOKIE_NAME].value)
+            if session_id:
+                return self.backend_ports[shard_for_session(session_id, len(self.backend_ports))]
+
+        # No session yet (page load, static files): any shard will do
+        RouterHandler.next_backend = (RouterHandler.next_backend + 1) % len(self.backend_ports)
+        return self.backend_ports[RouterHandler.next_backend]
+
+    def _proxy(self):
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        body = self.rfile.read(length) if length else None
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+
+        conn = http.client.HTTPConnection('127.0.0.1', self._pick_backend(), timeout=120)
+        try:
+            conn.request(self.command, self.path, body=body, headers=headers)
+            response = conn.getresponse()
+            payload = response.read()
+        except OSError:
+            self.send_error(502, 'Backend unavailable')
+            return
+        finally:
+            conn.close()
+
+        self.send_response(response.status, response.reason)
+        for key, value in response.getheaders():
+            if key.lower() not in HOP_BY_HOP_HEADERS and key.lower() != 'content-length':
+                self.send_header(key, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = _proxy
+
+    def log_message(self, format, *args):
+        pass  # Backends keep the access log
+
+
+def start_backends(workers, base_port):
+    """Launch one gunicorn process per shard"""
+    processes = []
+    for index in range(workers):
+        env = dict(os.environ,
+                   PORT=str(base_port + index),
+                   SHARD_INDEX=str(index),
+                   SHARD_COUNT=str(workers))
+        processes.append(subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_config.py', 'app:app'],
+            env=env
+        ))
+    return processes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sticky session router for GPU Tycoon')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of backend processes (shards)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', '5000')),
+                        help='Public port to listen on')
+    parser.add_argument('--backend-port', type=int, default=9100,
+                        help='First local port used by the backends')
+    args = parser.parse_args()
+
+    if not os.environ.get('SECRET_KEY'):
+        # Shards must agree on the cookie signing key
+        os.environ['SECRET_KEY'] = os.urandom(32).hex()
+
+    RouterHandler.backend_ports = [args.backend_port + i for i in range(args.workers)]
+    processes = start_backends(args.workers, args.backend_port)
+
+    server = ThreadingHTTPServer(('0.0.0.0', args.port), RouterHandler)
+    server.daemon_threads = True
+
+    def shutdown(signum, frame):
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"Routing :{args.port} -> {args.workers} shards on ports {RouterHandler.backend_ports}")
+    try:
+        server.serve_forever()
+    finally:
+        for process in processes:
+            process.terminate()
+        deadline = time.time() + 10
+        for process in processes:
+            try:
+                process.wait(timeout=max(0, deadline - time.time()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+if __name__ == '__main__':
+    main()
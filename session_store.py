@@ -0,0 +1,67 @@
+"""On-disk store for hibernated game sessions
+
+Idle GameState objects are pickled into a local SQLite database and dropped
+from memory; they are loaded back on the player's next request. SQLite
+handles locking, so shards started by router.py can share one file.
+"""
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class SessionStore:
+    """SQLite-backed key/value store of pickled GameState objects"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'session_id TEXT PRIMARY KEY, data BLOB NOT NULL, saved_at REAL NOT NULL, last_seen REAL)'
+            )
+            columns = [row[1] for row in self._conn.execute('PRAGMA table_info(sessions)')]
+            if 'last_seen' not in columns:  # Stores created before last_seen was kept
+                self._conn.execute('ALTER TABLE sessions ADD COLUMN last_seen REAL')
+
+    def save(self, session_id, game, last_seen=None):
+        """Hibernate a game state
+
+        Args:
+            last_seen: Wall time of the player's last request (default: now)
+        """
+        data = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sessions (session_id, data, saved_at, last_seen) VALUES (?, ?, ?, ?)',
+                (session_id, data, now, now if last_seen is None else last_seen)
+            )
+
+    def load(self, session_id):
+        """Rehydrate and remove a hibernated game state
+
+        Returns:
+            tuple: (game_state, last_seen) or None if the session is not stored
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT data, COALESCE(last_seen, saved_at) FROM sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+        return pickle.loads(row[0]), row[1]
+
+    def discard(self, session_id):
+        """Forget a hibernated session"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def count(self):
+        """Number of hibernated sessions"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
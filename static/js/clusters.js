@@ -6,6 +6,7 @@
 class ClusterManager {
     constructor() {
         this.draggedGpu = null;
+        this.clusterCards = new Map(); // clusterId -> card element
     }
     
     /**
@@ -385,26 +386,26 @@ class ClusterManager {
         }
 
         // Remove cluster cards that no longer exist in state
-        const existingClusterCards = document.querySelectorAll('.cluster-card');
-        existingClusterCards.forEach(card => {
-            const clusterId = parseInt(card.dataset.clusterId);
+        for (const [clusterId, card] of this.clusterCards.entries()) {
             if (!currentClusterIds.has(clusterId)) {
                 card.remove();
+                this.clusterCards.delete(clusterId);
             }
-        });
+        }
 
         // Early return if no clusters to render
         if (!state.clusters || !state.clusters.clusters) return;
 
-        // Render each cluster
+        // Render each cluster (cards are keyed by cluster id)
         state.clusters.clusters.forEach(cluster => {
-            const existingCluster = document.querySelector(`[data-cluster-id="${cluster.id}"]`);
+            const existingCluster = this.clusterCards.get(cluster.id);
 
             if (!existingCluster) {
                 // Create new cluster card
                 const clusterCard = this.createClusterCard(cluster, state.gpus);
                 rackContainer.insertBefore(clusterCard, rackContainer.firstChild);
                 this.makeClusterDroppable(clusterCard, cluster.id);
+                this.clusterCards.set(cluster.id, clusterCard);
             } else {
                 // Update existing cluster
                 this.updateClusterCard(existingCluster, cluster, state.gpus);
@@ -412,6 +413,13 @@ class ClusterManager {
         });
     }
     
+    /**
+     * Key that changes whenever a cluster card must be rebuilt
+     */
+    getClusterKey(cluster) {
+        return `${cluster.gpu_ids.join(',')}|${cluster.label || ''}`;
+    }
+    
     /**
      * Create a cluster card element
      */
@@ -419,6 +427,7 @@ class ClusterManager {
         const card = document.createElement('div');
         card.className = 'cluster-card';
         card.dataset.clusterId = cluster.id;
+        card.dataset.gpuKey = this.getClusterKey(cluster);
         
         // Find GPU objects for this cluster
         const clusterGpus = allGpus.filter(g => cluster.gpu_ids.includes(g.id));
@@ -434,6 +443,7 @@ class ClusterManager {
                 <span class="cluster-title">
                     <span style="color: ${statusColor}">${statusIcon}</span>
                     GPU Cluster #${cluster.id}
+                    <span class="cluster-label"></span>
                 </span>
                 <button class="cluster-disband-btn" onclick="window.clusterManager.disbandCluster(${cluster.id})">
                     ✕ Disband
@@ -476,6 +486,11 @@ class ClusterManager {
             </div>
         `;
         
+        // Player-chosen text: set as text, never as HTML
+        if (cluster.label) {
+            card.querySelector('.cluster-label').textContent = `· ${cluster.label}`;
+        }
+        
         return card;
     }
     
@@ -483,14 +498,26 @@ class ClusterManager {
      * Update an existing cluster card
      */
     updateClusterCard(cardElement, cluster, allGpus) {
-        // Update VRAM stats (only if changed to avoid DOM thrashing)
-        const totalVramEl = cardElement.querySelector('.cluster-stat-value');
-        const newVramText = `${cluster.total_vram}GB`;
-        if (totalVramEl && totalVramEl.textContent !== newVramText) {
-            totalVramEl.textContent = newVramText;
+        // Membership or label changed: rebuild this card only
+        const gpuKey = this.getClusterKey(cluster);
+        if (cardElement.dataset.gpuKey !== undefined && cardElement.dataset.gpuKey !== gpuKey) {
+            const newCard = this.createClusterCard(cluster, allGpus);
+            cardElement.replaceWith(newCard);
+            this.makeClusterDroppable(newCard, cluster.id);
+            this.clusterCards.set(cluster.id, newCard);
+            return;
         }
         
-        // Could add more dynamic updates here
+        // Update VRAM stats (only if changed to avoid DOM thrashing)
+        const statValues = cardElement.querySelectorAll('.cluster-stat-value');
+        const newTotalText = `${cluster.total_vram}GB`;
+        const newAvailableText = `${cluster.available_vram}GB`;
+        if (statValues[1] && statValues[1].textContent !== newTotalText) {
+            statValues[1].textContent = newTotalText;
+        }
+        if (statValues[2] && statValues[2].textContent !== newAvailableText) {
+            statValues[2].textContent = newAvailableText;
+        }
     }
 }
 
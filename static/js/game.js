@@ -9,7 +9,20 @@ class GameManager {
         this.gameSpeed = 5; // Fixed at 5x speed
         this.tickInterval = 200; // 200ms default
         this.lastState = null;
+        this.forecastButton = null; // Shop button whose forecast is shown
         this.lastTickTs = null; // For speed-aware dt based on elapsed time
+        this.unsentDt = 0; // Game time of ticks the server rejected (429), sent with the next one
+        this.backoffUntil = 0; // No ticks before this time after a 429
+        
+        // Sparse ticks: fast-changing sections every tick, the full state on a slower cadence
+        this.tickFields = [
+            'cash', 'total_revenue', 'total_power_cost', 'gpus', 'job_queue', 'active_jobs',
+            'cooling_tier', 'scheduler_tier', 'network_penalty_pct', 'auto_assign', 'placement_mode', 'auto_cluster', 'pue',
+            'capacity', 'stats', 'victory', 'active_event', 'clusters'
+        ];
+        this.shopTabFields = { gpus: ['unlocks', 'regions'], marketing: ['marketing'], contracts: ['contracts'] };
+        this.fullStateInterval = 2000; // ms between full-state ticks
+        this.lastFullStateTs = 0;
     }
     
     /**
@@ -56,6 +69,16 @@ class GameManager {
             await this.toggleAutoAssign();
         });
         
+        // Toggle auto-cluster button
+        document.getElementById('toggle-auto-cluster').addEventListener('click', async () => {
+            await this.toggleAutoCluster();
+        });
+        
+        // Toggle placement mode button
+        document.getElementById('toggle-placement-mode').addEventListener('click', async () => {
+            await this.togglePlacementMode();
+        });
+        
         // Note: Marketing upgrade button listener is attached dynamically in renderMarketingShop()
         
         // Shop buttons (using event delegation)
@@ -65,7 +88,8 @@ class GameManager {
                 
                 if (action === 'buy_gpu') {
                     const gpuType = e.target.dataset.gpuType;
-                    await this.buyGPU(gpuType);
+                    // Shift-click buys 10 in a single batched request
+                    await this.buyGPU(gpuType, e.shiftKey ? 10 : 1);
                 } else if (action === 'buy_upgrade') {
                     const upgradeType = e.target.dataset.upgradeType;
                     const upgradeId = e.target.dataset.upgradeId;
@@ -74,6 +98,20 @@ class GameManager {
             }
         });
         
+        // Hovering a buy button shows the capacity forecast with that GPU added
+        document.getElementById('gpu-shop').addEventListener('mouseover', (e) => {
+            const button = e.target.closest('[data-action="buy_gpu"]');
+            if (button && button !== this.forecastButton) {
+                this.forecastButton = button;
+                this.showForecast(button);
+            }
+        });
+        document.getElementById('gpu-shop').addEventListener('mouseout', (e) => {
+            if (this.forecastButton && !this.forecastButton.contains(e.relatedTarget)) {
+                this.forecastButton = null; // Refresh on the next hover
+            }
+        });
+        
         // Job assignment buttons (using event delegation)
         document.getElementById('job-queue').addEventListener('click', (e) => {
             if (e.target.classList.contains('job-assign-btn')) {
@@ -198,8 +236,8 @@ class GameManager {
             speedIndicator.textContent = `${this.gameSpeed}x`;
         }
         
-        // Schedule next tick based on speed
-        const delay = this.tickInterval / this.gameSpeed;
+        // Schedule next tick based on speed (later if the server asked us to back off)
+        const delay = Math.max(this.tickInterval / this.gameSpeed, this.backoffUntil - performance.now());
         setTimeout(() => this.gameLoop(), delay);
     }
     
@@ -218,19 +256,39 @@ class GameManager {
             }
             this.lastTickTs = now;
 
-            let dt = baseDtSec * this.gameSpeed;
+            let dt = baseDtSec * this.gameSpeed + this.unsentDt;
+            this.unsentDt = 0;
             // Clamp dt to avoid huge jumps if the tab was throttled
             const maxDt = 0.5; // seconds
             if (dt > maxDt) dt = maxDt;
 
-            const response = await fetch('/api/tick', {
+            // Only ask for the sections the player can currently see, except for a
+            // periodic full refresh (achievements, hidden shop tabs, etc.)
+            let url = '/api/tick';
+            const fullState = !this.lastState || now - this.lastFullStateTs >= this.fullStateInterval;
+            if (fullState) {
+                this.lastFullStateTs = now;
+            } else {
+                const fields = [...this.tickFields, ...(this.shopTabFields[uiManager.currentShopTab] || [])];
+                url += '?fields=' + fields.join(',');
+            }
+
+            const response = await fetch(url, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ dt })
             });
+            if (response.status === 429) {
+                // Rate limited: keep this tick's game time for the next request and slow down
+                const retryAfter = parseFloat(response.headers.get('Retry-After')) || this.tickInterval / 1000;
+                this.unsentDt = dt;
+                this.backoffUntil = now + retryAfter * 1000;
+                return null;
+            }
             const result = await response.json();
             if (result && result.success) {
-                return result.state;
+                // Sections not requested keep their last known value
+                return fullState ? result.state : { ...this.lastState, ...result.state };
             }
         } catch (e) {
             console.error('Tick error:', e);
@@ -256,16 +314,67 @@ class GameManager {
     }
     
     /**
-     * Buy a GPU
+     * Send several actions in one request (applied in order under the session lock)
      */
-    async buyGPU(gpuType) {
+    async sendActions(actions, allOrNothing = false) {
+        const response = await fetch('/api/actions', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ actions, all_or_nothing: allOrNothing })
+        });
+        const result = await response.json();
+        // The batch response carries the resulting state - no extra /api/state round trip
+        if (result.state) {
+            uiManager.update(result.state);
+            this.lastState = result.state;
+        }
+        return result;
+    }
+    
+    /**
+     * Fetch the capacity forecast for buying one GPU and show it on the button
+     */
+    async showForecast(button) {
+        try {
+            const response = await fetch(`/api/forecast?gpu_type=${encodeURIComponent(button.dataset.gpuType)}&count=1`);
+            if (!response.ok) return;
+            uiManager.updateForecastTooltip(button, await response.json());
+        } catch (e) {
+            console.error('Forecast error:', e);
+        }
+    }
+    
+    /**
+     * Buy one or more GPUs of a type
+     */
+    async buyGPU(gpuType, count = 1) {
+        const region = uiManager.getSelectedRegion();
+        if (count > 1) {
+            // One bulk purchase: validated once, single cash debit
+            try {
+                const result = await this.sendActions([{ type: 'buy_gpus', gpu_type: gpuType, count, region }]);
+                const purchase = result.results[0];
+                if (purchase.success) {
+                    uiManager.showNotification(purchase.message, 'success');
+                    audioManager.purchase();
+                } else {
+                    uiManager.showNotification(purchase.message, 'error');
+                }
+            } catch (e) {
+                console.error('Buy GPUs error:', e);
+                uiManager.showNotification('Failed to purchase GPUs', 'error');
+            }
+            return;
+        }
+        
         try {
             const response = await fetch('/api/action', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
                     type: 'buy_gpu',
-                    gpu_type: gpuType
+                    gpu_type: gpuType,
+                    region
                 })
             });
             
@@ -364,6 +473,54 @@ class GameManager {
         }
     }
     
+    /**
+     * Toggle automatic cluster formation
+     */
+    async toggleAutoCluster() {
+        try {
+            const response = await fetch('/api/action', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ type: 'toggle_auto_cluster' })
+            });
+            
+            const result = await response.json();
+            
+            if (result.success) {
+                uiManager.showNotification(result.message, 'success');
+            }
+            
+            // Force update
+            await this.updateState();
+        } catch (e) {
+            console.error('Toggle auto-cluster error:', e);
+        }
+    }
+    
+    /**
+     * Toggle compact (topology-aware) vs first-fit GPU placement
+     */
+    async togglePlacementMode() {
+        try {
+            const response = await fetch('/api/action', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ type: 'toggle_placement_mode' })
+            });
+            
+            const result = await response.json();
+            
+            if (result.success) {
+                uiManager.showNotification(result.message, 'success');
+            }
+            
+            // Force update
+            await this.updateState();
+        } catch (e) {
+            console.error('Toggle placement mode error:', e);
+        }
+    }
+    
     /**
      * Upgrade marketing level
      */
@@ -9,10 +9,27 @@ class UIManager {
         this.catalog = null;
         this.jobCards = new Map(); // Track job cards by ID to avoid recreation
         this.gpuBars = new Map(); // Track GPU bars by ID
-        this.lastShopState = null; // Track last shop state to avoid unnecessary re-renders
         this.currentShopTab = 'gpus'; // Track active shop tab
         this.shownAchievements = new Set(); // Track which achievements have been shown
         this.victoryShown = false; // Track if victory screen has been shown
+        
+        // Keyed DOM nodes for the shop tabs (patched in place, never rebuilt per tick)
+        this.shopItems = new Map(); // gpuType -> shop item elements
+        this.contractCards = new Map(); // contractId -> { element, signature }
+        this.contractSections = null; // Section containers for the contracts tab
+        this.marketingSignature = null; // Last rendered marketing state
+        
+        // Frame-budgeted render scheduler (decoupled from the network loop)
+        this.renderState = null; // Newest state received from the server
+        this.renderQueue = []; // Sections still to render for renderState
+        this.frameRequested = false;
+        this.frameBudgetMs = 8; // Leave the rest of each 16ms frame for layout and paint
+        
+        // Sections in priority order: the first four render every frame
+        this.criticalSections = ['updateCapacity', 'updateMetrics', 'updateJobs', 'updateGPUs'];
+        this.deferredSections = ['updateSystemInfo', 'updateAutoAssignToggle', 'updatePlacementToggle',
+                                 'updateAutoClusterToggle', 'updateEvent',
+                                 'updateShop', 'updateAchievements', 'updateVictory', 'updateEducation'];
     }
     
     /**
@@ -51,6 +68,11 @@ class UIManager {
         });
         
         this.currentShopTab = tabName;
+        
+        // Hidden tabs are not patched, so bring the newly visible one up to date
+        if (this.renderState) {
+            this.updateShop(this.renderState);
+        }
     }
     
     /**
@@ -66,26 +88,65 @@ class UIManager {
     }
     
     /**
-     * Update all UI elements with new game state
+     * Queue a render of a new game state
+     *
+     * States arriving faster than the display refreshes are coalesced: only the
+     * newest one is rendered, on the next animation frame.
      */
     update(state) {
-        this.updateCapacity(state);
-        this.updateMetrics(state);
-        this.updateJobs(state);
-        this.updateGPUs(state);
-        this.updateShop(state);
-        this.updateSystemInfo(state);
-        this.updateAutoAssignToggle(state);
-        this.updateEvent(state);
-        this.updateAchievements(state);
-        this.updateVictory(state);
-        
-        // Check for educational milestones
+        this.renderState = state;
+        
+        // Critical sections first, then sections a previous frame ran out of budget for,
+        // then everything else
+        this.renderQueue = [...new Set([
+            ...this.criticalSections, ...this.renderQueue, ...this.deferredSections
+        ])];
+        this.requestFrame();
+    }
+    
+    requestFrame() {
+        if (this.frameRequested) return;
+        this.frameRequested = true;
+        requestAnimationFrame(() => this.renderFrame());
+    }
+    
+    /**
+     * Render queued sections until the frame budget is spent
+     */
+    renderFrame() {
+        this.frameRequested = false;
+        const start = performance.now();
+        
+        while (this.renderQueue.length > 0) {
+            const section = this.renderQueue.shift();
+            this[section](this.renderState);
+            if (performance.now() - start > this.frameBudgetMs) break;
+        }
+        
+        // Out of budget - finish the remaining sections next frame
+        if (this.renderQueue.length > 0) {
+            this.requestFrame();
+        }
+    }
+    
+    /**
+     * Check for educational milestones
+     */
+    updateEducation(state) {
         if (window.educationManager) {
             educationManager.checkMilestones(state);
         }
     }
     
+    /**
+     * Set text content only if it changed (avoids needless layout)
+     */
+    setText(element, text) {
+        if (element && element.textContent !== text) {
+            element.textContent = text;
+        }
+    }
+    
     /**
      * Update capacity bar
      */
@@ -96,23 +157,25 @@ class UIManager {
         const reservedPct = total > 0 ? (reserved / total) * 100 : 0;
         const availablePct = total > 0 ? (available / total) * 100 : 100;
         
-        document.getElementById('capacity-text').textContent = 
-            `${available} Available / ${reserved} Reserved / ${total} Total GPUs`;
+        this.setText(document.getElementById('capacity-text'),
+            `${available} Available / ${reserved} Reserved / ${total} Total GPUs`);
         
-        document.getElementById('capacity-bar-available').style.width = `${availablePct}%`;
-        document.getElementById('capacity-bar-reserved').style.width = `${reservedPct}%`;
+        const availableBar = document.getElementById('capacity-bar-available');
+        const reservedBar = document.getElementById('capacity-bar-reserved');
+        if (availableBar.style.width !== `${availablePct}%`) availableBar.style.width = `${availablePct}%`;
+        if (reservedBar.style.width !== `${reservedPct}%`) reservedBar.style.width = `${reservedPct}%`;
     }
     
     /**
      * Update metrics panel
      */
     updateMetrics(state) {
-        document.getElementById('cash-display').textContent = this.formatCurrency(state.cash);
-        document.getElementById('revenue-rate').textContent = this.formatCurrency(state.stats.revenue_per_hour) + '/hr';
-        document.getElementById('gpu-count').textContent = state.stats.total_gpus;
-        document.getElementById('utilization').textContent = state.stats.utilization.toFixed(1) + '%';
-        document.getElementById('sla-compliance').textContent = state.stats.sla_compliance.toFixed(1) + '%';
-        document.getElementById('pue').textContent = state.pue.toFixed(2);
+        this.setText(document.getElementById('cash-display'), this.formatCurrency(state.cash));
+        this.setText(document.getElementById('revenue-rate'), this.formatCurrency(state.stats.revenue_per_hour) + '/hr');
+        this.setText(document.getElementById('gpu-count'), String(state.stats.total_gpus));
+        this.setText(document.getElementById('utilization'), state.stats.utilization.toFixed(1) + '%');
+        this.setText(document.getElementById('sla-compliance'), state.stats.sla_compliance.toFixed(1) + '%');
+        this.setText(document.getElementById('pue'), state.pue.toFixed(2));
     }
     
     /**
@@ -120,8 +183,8 @@ class UIManager {
      */
     updateJobs(state) {
         // Update counts
-        document.getElementById('queue-count').textContent = `(${state.job_queue.length})`;
-        document.getElementById('active-count').textContent = `(${state.active_jobs.length})`;
+        this.setText(document.getElementById('queue-count'), `(${state.job_queue.length})`);
+        this.setText(document.getElementById('active-count'), `(${state.active_jobs.length})`);
         
         // Update job queue (incremental)
         this.updateJobContainer('job-queue', state.job_queue, false, state.auto_assign);
@@ -277,9 +340,12 @@ class UIManager {
                 });
             } else {
                 // Update progress bar for active jobs
-                const progressFill = cardInfo.element.querySelector('.job-progress-fill');
-                if (progressFill) {
-                    progressFill.style.width = `${(job.progress * 100).toFixed(1)}%`;
+                if (cardInfo.progressFill === undefined) {
+                    cardInfo.progressFill = cardInfo.element.querySelector('.job-progress-fill');
+                }
+                const progressWidth = `${(job.progress * 100).toFixed(1)}%`;
+                if (cardInfo.progressFill && cardInfo.progressFill.style.width !== progressWidth) {
+                    cardInfo.progressFill.style.width = progressWidth;
                 }
                 
                 // Update sync status for multi-GPU jobs
@@ -360,6 +426,12 @@ class UIManager {
             </div>
             <div class="job-details">
                 💰 $${job.base_payout} | 🎮 ${job.vram_per_gpu}GB VRAM
+                ${job.origin_region ? ` | 🌍 ${job.origin_region}` : ''}
+                ${job.region && job.region !== job.origin_region ? ` → ${job.region} (+${job.region_penalty_pct}%)` : ''}
+                ${showProgress && job.effective_bandwidth_gbps ? ` | 📶 ${job.spread} ${job.effective_bandwidth_gbps}GB/s` : ''}
+                ${showProgress && job.mig_slices ? ` | 🍰 MIG ${job.mig_slices} slice${job.mig_slices > 1 ? 's' : ''}` : ''}
+                ${job.batch_size > 1 ? ` | 📦 Batch ×${job.batch_size}` : ''}
+                ${showProgress && job.compact_gain_pct > 0 ? ` (packed +${job.compact_gain_pct}%)` : ''}
                 ${job.sla_missed ? ' | ⚠️ SLA MISSED' : ''}
             </div>
             ${showProgress ? `
@@ -483,7 +555,7 @@ class UIManager {
             <div class="gpu-utilization-bar">
                 <div class="gpu-utilization-fill ${utilPercent > 80 ? 'high' : ''}" 
                      style="width: ${utilPercent}%"></div>
-                <div class="gpu-utilization-text">${utilPercent}%</div>
+                <div class="gpu-utilization-text">${this.getUtilizationText(gpu)}</div>
             </div>
         `;
         
@@ -538,99 +610,178 @@ class UIManager {
         }
         
         // Only update text if it changed
-        if (textElement && textElement.textContent !== `${utilPercent}%`) {
-            textElement.textContent = `${utilPercent}%`;
+        this.setText(textElement, this.getUtilizationText(gpu));
+    }
+    
+    /**
+     * Utilization label, with MIG slice usage for partitioned GPUs
+     */
+    getUtilizationText(gpu) {
+        const utilPercent = (gpu.utilization * 100).toFixed(0);
+        if (gpu.slice_jobs && gpu.slice_jobs.length > 0) {
+            return `${utilPercent}% · MIG ${gpu.slices_used}/${gpu.mig_slices} (${gpu.slice_jobs.length} jobs)`;
         }
+        return `${utilPercent}%`;
     }
     
     /**
-     * Update shop items (only when state changes)
+     * Update shop items (only the visible tab is patched)
      */
     updateShop(state) {
         if (!this.catalog) return;
         
-        // Create a hash of relevant shop state to detect changes
-        const shopStateHash = JSON.stringify({
-            cash: Math.floor(state.cash),
-            cooling: state.cooling_tier,
-            network: state.network_tier,
-            revenue: Math.floor(state.total_revenue / 1000), // Round to nearest 1000
-            gpuCount: state.gpus.length,
-            contracts: state.contracts ? JSON.stringify(state.contracts) : '',
-            marketing: state.marketing ? JSON.stringify(state.marketing.purchased) : ''
-        });
-        
-        // Only re-render if state has changed
-        if (this.lastShopState !== shopStateHash) {
+        if (this.currentShopTab === 'gpus') {
             this.renderGPUShop(state);
+        } else if (this.currentShopTab === 'marketing') {
             this.renderMarketingShop(state);
+        } else if (this.currentShopTab === 'contracts') {
             this.renderContractsShop(state);
-            this.lastShopState = shopStateHash;
         }
     }
     
+    /**
+     * Render the GPU shop - items are created once and patched by GPU type
+     */
     renderGPUShop(state) {
         const container = document.getElementById('gpu-shop');
-        container.innerHTML = '';
         
-        // Sort by price ascending (cheapest first)
-        const sortedGPUs = Object.entries(this.catalog.gpus).sort((a, b) => a[1].cost - b[1].cost);
+        if (this.shopItems.size === 0) {
+            // Sort by price ascending (cheapest first)
+            const sortedGPUs = Object.entries(this.catalog.gpus).sort((a, b) => a[1].cost - b[1].cost);
+            sortedGPUs.forEach(([gpuType, spec]) => {
+                const item = this.createGPUShopItem(gpuType, spec);
+                container.appendChild(item);
+                this.shopItems.set(gpuType, {
+                    element: item,
+                    button: item.querySelector('[data-action="buy_gpu"]'),
+                    powerCost: item.querySelector('.shop-item-power-cost')
+                });
+            });
+        }
+        
+        if (state.regions) this.updateRegionSelect(state.regions);
         
-        sortedGPUs.forEach(([gpuType, spec]) => {
+        const pue = state.pue || 1.45;
+        this.shopItems.forEach((itemInfo, gpuType) => {
+            const spec = this.catalog.gpus[gpuType];
             const unlocked = state.unlocks.gpus.includes(gpuType);
             const canAfford = state.cash >= spec.cost;
             
-            // Check if cooling is bundled (cooling_tier field exists)
-            const coolingNote = spec.cooling_tier && spec.cooling_tier !== 'air' 
-                ? `<div class="shop-item-note">❄️ Includes ${this.getCoolingName(spec.cooling_tier)}</div>` 
-                : '';
             // Estimated power cost per hour at 100% utilization
-            const estPowerCostHr = (((spec.tdp || 0) / 1000) * (state.pue || 1.45) * 0.15).toFixed(2);
+            const estPowerCostHr = (((spec.tdp || 0) / 1000) * pue * 0.15).toFixed(2);
+            this.setText(itemInfo.powerCost, `Est. power cost/hr @100%: $${estPowerCostHr} (PUE ${pue.toFixed(2)})`);
             
-            // Get educational description if available
-            let educationalContent = '';
-            if (window.educationManager) {
-                const eduDesc = educationManager.getGPUDescription(gpuType);
-                if (eduDesc) {
-                    educationalContent = `
-                        <div class="shop-item-description">${eduDesc}</div>
-                        <button class="shop-btn" 
-                                style="background: rgba(168, 85, 247, 0.2); margin-bottom: 8px; font-size: 0.85em; padding: 6px;"
-                                onclick="educationManager.showGPUDetails('${gpuType}')">
-                            📚 Learn More About This GPU
-                        </button>
-                    `;
-                }
+            const disabled = !unlocked || !canAfford;
+            if (itemInfo.button.disabled !== disabled) {
+                itemInfo.button.disabled = disabled;
+            }
+            this.setText(itemInfo.button, !unlocked ? '🔒 Locked' : (canAfford ? 'Buy GPU' : 'Not enough $'));
+        });
+    }
+    
+    /**
+     * Forecast tooltip for a buy button: utilization, queue wait and SLA before -> after
+     */
+    updateForecastTooltip(button, forecast) {
+        const { current, proposed } = forecast;
+        let title = 'Shift-click to buy 10';
+        if (current && proposed) {
+            const wait = f => f.mean_queue_wait === null ? '∞' : `${f.mean_queue_wait}s`;
+            title = [
+                `Forecast with +1 ${forecast.gpu_type}:`,
+                `Utilization ${current.utilization_pct}% → ${proposed.utilization_pct}%`,
+                `Queue wait ${wait(current)} → ${wait(proposed)}`,
+                `SLA ${current.sla_attainment_pct}% → ${proposed.sla_attainment_pct}%`,
+                title
+            ].join('\n');
+        }
+        if (button.title !== title) {
+            button.title = title;
+        }
+    }
+    
+    /**
+     * Fill the datacenter region picker (locked regions are disabled)
+     */
+    updateRegionSelect(regions) {
+        const select = document.getElementById('region-select');
+        if (!select) return;
+        
+        regions.forEach(region => {
+            let option = select.querySelector(`option[value="${region.id}"]`);
+            if (!option) {
+                option = document.createElement('option');
+                option.value = region.id;
+                select.appendChild(option);
+            }
+            const label = region.unlocked
+                ? `${region.name} (${region.gpu_count} GPUs, ${region.free_gpus} idle)`
+                : `🔒 ${region.name} ($${this.formatNumber(region.unlock_revenue)} revenue)`;
+            this.setText(option, label);
+            if (option.disabled !== !region.unlocked) {
+                option.disabled = !region.unlocked;
             }
-            
-            const item = document.createElement('div');
-            item.className = 'shop-item';
-            
-            item.innerHTML = `
-                <div class="shop-item-header">
-                    <span class="shop-item-name">${spec.name}</span>
-                    <span class="shop-item-cost">$${this.formatNumber(spec.cost)}</span>
-                </div>
-                <div class="shop-item-specs">
-                    ${spec.vram}GB VRAM | ${spec.tdp}W TDP | ${spec.performance}x perf
-                    <div style="color:#9ca3af; font-size:0.8em; margin-top:4px;">
-                        Est. power cost/hr @100%: $${estPowerCostHr} (PUE ${(state.pue || 1.45).toFixed(2)})
-                    </div>
-                </div>
-                ${coolingNote}
-                ${educationalContent || (spec.description ? `<div class="shop-item-description">${spec.description}</div>` : '')}
-                <button class="shop-btn" 
-                        data-action="buy_gpu" 
-                        data-gpu-type="${gpuType}"
-                        ${!unlocked || !canAfford ? 'disabled' : ''}>
-                    ${!unlocked ? '🔒 Locked' : (canAfford ? 'Buy GPU' : 'Not enough $')}
-                </button>
-            `;
-            
-            container.appendChild(item);
         });
     }
     
+    /**
+     * Region new GPUs are bought in
+     */
+    getSelectedRegion() {
+        const select = document.getElementById('region-select');
+        return (select && select.value) || 'us-east';
+    }
+    
+    /**
+     * Create the static part of a GPU shop item
+     */
+    createGPUShopItem(gpuType, spec) {
+        // Check if cooling is bundled (cooling_tier field exists)
+        const coolingNote = spec.cooling_tier && spec.cooling_tier !== 'air' 
+            ? `<div class="shop-item-note">❄️ Includes ${this.getCoolingName(spec.cooling_tier)}</div>` 
+            : '';
+        
+        // Get educational description if available
+        let educationalContent = '';
+        if (window.educationManager) {
+            const eduDesc = educationManager.getGPUDescription(gpuType);
+            if (eduDesc) {
+                educationalContent = `
+                    <div class="shop-item-description">${eduDesc}</div>
+                    <button class="shop-btn" 
+                            style="background: rgba(168, 85, 247, 0.2); margin-bottom: 8px; font-size: 0.85em; padding: 6px;"
+                            onclick="educationManager.showGPUDetails('${gpuType}')">
+                        📚 Learn More About This GPU
+                    </button>
+                `;
+            }
+        }
+        
+        const item = document.createElement('div');
+        item.className = 'shop-item';
+        item.dataset.gpuType = gpuType;
+        
+        item.innerHTML = `
+            <div class="shop-item-header">
+                <span class="shop-item-name">${spec.name}</span>
+                <span class="shop-item-cost">$${this.formatNumber(spec.cost)}</span>
+            </div>
+            <div class="shop-item-specs">
+                ${spec.vram}GB VRAM | ${spec.tdp}W TDP | ${spec.performance}x perf
+                <div class="shop-item-power-cost" style="color:#9ca3af; font-size:0.8em; margin-top:4px;"></div>
+            </div>
+            ${coolingNote}
+            ${educationalContent || (spec.description ? `<div class="shop-item-description">${spec.description}</div>` : '')}
+            <button class="shop-btn" 
+                    data-action="buy_gpu" 
+                    data-gpu-type="${gpuType}"
+                    title="Shift-click to buy 10">
+            </button>
+        `;
+        
+        return item;
+    }
+    
     getCoolingName(tier) {
         const names = {
             'air': 'Air Cooling',
@@ -640,62 +791,111 @@ class UIManager {
         return names[tier] || tier;
     }
     
+    /**
+     * Render the contracts shop - cards are keyed by contract id and only
+     * rebuilt when something shown on that card changes
+     */
     renderContractsShop(state) {
         const container = document.getElementById('contracts-shop');
         if (!state.contracts) {
             container.innerHTML = '<p style="color: #888; padding: 20px;">Contracts system loading...</p>';
+            this.contractSections = null;
             return;
         }
         
-        container.innerHTML = '';
-        
-        // Show active contracts first (sorted by monthly income ascending)
-        if (state.contracts.active && state.contracts.active.length > 0) {
-            const activeSection = document.createElement('div');
-            activeSection.innerHTML = '<h3 style="color: #8b5cf6; margin-bottom: 10px;">🟣 Active Contracts</h3>';
-            container.appendChild(activeSection);
-            
-            const sortedActive = [...state.contracts.active].sort((a, b) => a.monthly_income - b.monthly_income);
-            sortedActive.forEach(contract => {
-                container.appendChild(this.createContractCard(contract, 'active', state));
-            });
+        if (!this.contractSections) {
+            container.innerHTML = '';
+            this.contractCards.clear();
+            this.contractSections = {
+                active: this.createContractSection(container, '<h3 style="color: #8b5cf6; margin-bottom: 10px;">🟣 Active Contracts</h3>'),
+                negotiating: this.createContractSection(container, '<h3 style="color: #f59e0b; margin: 20px 0 10px 0;">🟠 In Negotiation</h3>'),
+                available: this.createContractSection(container, '<h3 style="color: #10b981; margin: 20px 0 10px 0;">🟢 Available Deals</h3>'),
+                summary: document.createElement('div')
+            };
+            this.contractSections.summary.style.cssText = 'margin-top: 20px; padding: 15px; background: rgba(139, 92, 246, 0.2); border-radius: 8px; text-align: center;';
+            container.appendChild(this.contractSections.summary);
         }
         
-        // Show negotiating contracts (sorted by negotiation cost ascending)
-        if (state.contracts.negotiating && state.contracts.negotiating.length > 0) {
-            const negotiatingSection = document.createElement('div');
-            negotiatingSection.innerHTML = '<h3 style="color: #f59e0b; margin: 20px 0 10px 0;">🟠 In Negotiation</h3>';
-            container.appendChild(negotiatingSection);
-            
-            const sortedNegotiating = [...state.contracts.negotiating].sort((a, b) => a.negotiation_cost_total - b.negotiation_cost_total);
-            sortedNegotiating.forEach(contract => {
-                container.appendChild(this.createContractCard(contract, 'negotiating', state));
-            });
-        }
+        // Active contracts sorted by monthly income, the rest by negotiation cost (ascending)
+        const entries = {
+            active: [...(state.contracts.active || [])]
+                .sort((a, b) => a.monthly_income - b.monthly_income)
+                .map(contract => ({ contract, status: 'active', issues: [] })),
+            negotiating: [...(state.contracts.negotiating || [])]
+                .sort((a, b) => a.negotiation_cost_total - b.negotiation_cost_total)
+                .map(contract => ({ contract, status: 'negotiating', issues: [] })),
+            available: [...(state.contracts.available || [])]
+                .sort((a, b) => a.contract.negotiation_cost_total - b.contract.negotiation_cost_total)
+                .map(item => ({ contract: item.contract, status: item.eligible ? 'available' : 'locked', issues: item.issues }))
+        };
         
-        // Show available contracts (sorted by negotiation cost ascending)
-        if (state.contracts.available && state.contracts.available.length > 0) {
-            const availableSection = document.createElement('div');
-            availableSection.innerHTML = '<h3 style="color: #10b981; margin: 20px 0 10px 0;">🟢 Available Deals</h3>';
-            container.appendChild(availableSection);
+        const seen = new Set();
+        ['active', 'negotiating', 'available'].forEach(sectionName => {
+            const section = this.contractSections[sectionName];
+            section.wrapper.style.display = entries[sectionName].length > 0 ? '' : 'none';
             
-            const sortedAvailable = [...state.contracts.available].sort((a, b) => a.contract.negotiation_cost_total - b.contract.negotiation_cost_total);
-            sortedAvailable.forEach(item => {
-                container.appendChild(this.createContractCard(item.contract, item.eligible ? 'available' : 'locked', state, item.issues));
+            entries[sectionName].forEach(({ contract, status, issues }, index) => {
+                seen.add(contract.id);
+                const signature = this.getContractSignature(contract, status, state, issues);
+                let cardInfo = this.contractCards.get(contract.id);
+                
+                if (!cardInfo || cardInfo.signature !== signature) {
+                    const card = this.createContractCard(contract, status, state, issues);
+                    if (cardInfo) {
+                        cardInfo.element.replaceWith(card);
+                    }
+                    cardInfo = { element: card, signature };
+                    this.contractCards.set(contract.id, cardInfo);
+                }
+                
+                // Keep sort order without touching cards that are already in place
+                if (section.list.children[index] !== cardInfo.element) {
+                    section.list.insertBefore(cardInfo.element, section.list.children[index] || null);
+                }
             });
+        });
+        
+        for (const [contractId, cardInfo] of this.contractCards.entries()) {
+            if (!seen.has(contractId)) {
+                cardInfo.element.remove();
+                this.contractCards.delete(contractId);
+            }
         }
         
         // Show summary if there are active contracts
-        if (state.contracts.active && state.contracts.active.length > 0) {
-            const summary = document.createElement('div');
-            summary.style.cssText = 'margin-top: 20px; padding: 15px; background: rgba(139, 92, 246, 0.2); border-radius: 8px; text-align: center;';
-            summary.innerHTML = `
+        const summary = this.contractSections.summary;
+        summary.style.display = entries.active.length > 0 ? '' : 'none';
+        const summaryHtml = `
                 <div style="color: #8b5cf6; font-weight: bold; font-size: 1.1em;">Total Contract Income</div>
                 <div style="color: #8b5cf6; font-size: 1.5em; margin-top: 5px;">$${this.formatNumber(state.contracts.total_monthly_income)}/month</div>
                 <div style="color: #888; font-size: 0.9em; margin-top: 5px;">${state.contracts.total_reserved_gpus} GPUs Reserved</div>
             `;
-            container.appendChild(summary);
+        if (entries.active.length > 0 && summary.dataset.html !== summaryHtml) {
+            summary.innerHTML = summaryHtml;
+            summary.dataset.html = summaryHtml;
+        }
+    }
+    
+    createContractSection(container, headerHtml) {
+        const wrapper = document.createElement('div');
+        wrapper.innerHTML = headerHtml;
+        const list = document.createElement('div');
+        wrapper.appendChild(list);
+        container.appendChild(wrapper);
+        return { wrapper, list };
+    }
+    
+    /**
+     * Everything a contract card displays - the card is rebuilt only when this changes
+     */
+    getContractSignature(contract, status, state, issues) {
+        let canAct = '';
+        if (status === 'negotiating') {
+            const remaining = contract.negotiation_cost_total - contract.money_invested;
+            canAct = state.cash >= Math.min(5000, remaining);
         }
+        return [status, contract.negotiation_progress, contract.money_invested,
+                contract.months_remaining, issues.join('|'), canAct].join(';');
     }
     
     createContractCard(contract, status, state, issues = []) {
@@ -818,11 +1018,19 @@ class UIManager {
         const container = document.getElementById('marketing-shop');
         if (!state.marketing) {
             container.innerHTML = '<p style="color: #888; padding: 20px;">Loading...</p>';
+            this.marketingSignature = null;
             return;
         }
         
         const { current, next, job_spawn_multiplier, job_value_multiplier, sla_extension, level, upcoming } = state.marketing;
         
+        // Rebuild only when the level or the upgrade button's state changes
+        const signature = next
+            ? `${level};${state.total_revenue >= next.unlock_revenue};${state.cash >= next.cost}`
+            : `${level};max`;
+        if (this.marketingSignature === signature) return;
+        this.marketingSignature = signature;
+        
         const jobBoost = ((job_spawn_multiplier - 1) * 100).toFixed(0);
         const valueBoost = ((job_value_multiplier - 1) * 100).toFixed(0);
         
@@ -919,17 +1127,17 @@ class UIManager {
         const coolingName = this.catalog && this.catalog.cooling_info && this.catalog.cooling_info[state.cooling_tier] 
             ? this.catalog.cooling_info[state.cooling_tier].name 
             : state.cooling_tier;
-        document.getElementById('cooling-display').textContent = coolingName;
+        this.setText(document.getElementById('cooling-display'), coolingName);
         
         // Network (auto-managed, show penalty %)
         const networkText = this.getNetworkText(state.stats.total_gpus, state.network_penalty_pct);
-        document.getElementById('network-display').textContent = networkText;
+        this.setText(document.getElementById('network-display'), networkText);
         
         // Scheduler (auto-managed)
         const schedulerName = this.catalog && this.catalog.scheduler_info && this.catalog.scheduler_info[state.scheduler_tier]
             ? this.catalog.scheduler_info[state.scheduler_tier].name
             : state.scheduler_tier;
-        document.getElementById('scheduler-display').textContent = schedulerName;
+        this.setText(document.getElementById('scheduler-display'), schedulerName);
     }
     
     getNetworkText(gpuCount, penalty) {
@@ -950,11 +1158,44 @@ class UIManager {
     updateAutoAssignToggle(state) {
         const toggleBtn = document.getElementById('toggle-auto-assign');
         if (toggleBtn) {
-            toggleBtn.textContent = state.auto_assign ? '🤖 Auto: ON' : '👆 Manual: ON';
+            this.setText(toggleBtn, state.auto_assign ? '🤖 Auto: ON' : '👆 Manual: ON');
             toggleBtn.classList.toggle('active', state.auto_assign);
         }
     }
 
+    /**
+     * Update placement mode toggle button state
+     */
+    updatePlacementToggle(state) {
+        const toggleBtn = document.getElementById('toggle-placement-mode');
+        if (toggleBtn && state.placement_mode) {
+            const compact = state.placement_mode === 'compact';
+            this.setText(toggleBtn, compact ? '🧩 Packing: Compact' : '📥 Packing: First Fit');
+            toggleBtn.classList.toggle('active', compact);
+        }
+    }
+
+    /**
+     * Update auto-cluster toggle button (tooltip shows the last re-partition)
+     */
+    updateAutoClusterToggle(state) {
+        const toggleBtn = document.getElementById('toggle-auto-cluster');
+        if (!toggleBtn || !state.auto_cluster) return;
+        
+        const { enabled, last_report: report } = state.auto_cluster;
+        this.setText(toggleBtn, enabled ? '🧠 Auto-Cluster: ON' : '🧠 Auto-Cluster: OFF');
+        toggleBtn.classList.toggle('active', enabled);
+        
+        const title = report
+            ? `Last plan @${report.game_time}s: ${report.applied ? `${report.clusters_created} clusters` : 'no change'}, ` +
+              `utilization ${report.expected_utilization_pct.before}% → ${report.expected_utilization_pct.after}%, ` +
+              `jobs hostable ${report.hostable_jobs_pct.before}% → ${report.hostable_jobs_pct.after}%`
+            : 'Re-partition idle GPUs into clusters sized to recent jobs';
+        if (toggleBtn.title !== title) {
+            toggleBtn.title = title;
+        }
+    }
+
     /**
      * Show a notification message
      */
@@ -1228,14 +1469,14 @@ class UIManager {
         
         if (state.active_event) {
             const event = state.active_event;
-            eventBanner.style.display = 'block';
+            if (eventBanner.style.display !== 'block') eventBanner.style.display = 'block';
             
-            eventBanner.querySelector('.event-name').textContent = event.name;
-            eventBanner.querySelector('.event-description').textContent = event.description;
+            this.setText(eventBanner.querySelector('.event-name'), event.name);
+            this.setText(eventBanner.querySelector('.event-description'), event.description);
             
             const timeRemaining = Math.ceil(event.time_remaining);
-            eventBanner.querySelector('.event-timer').textContent = `${timeRemaining}s remaining`;
-        } else {
+            this.setText(eventBanner.querySelector('.event-timer'), `${timeRemaining}s remaining`);
+        } else if (eventBanner.style.display !== 'none') {
             eventBanner.style.display = 'none';
         }
     }
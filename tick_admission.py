@@ -0,0 +1,91 @@
+"""Server-side tick admission for /api/tick
+
+Clients choose their own tick rate and dt, so a duplicated tab or a buggy
+client could run the simulation (and the CPU) arbitrarily fast. Each session
+gets a TickAdmission that bounds it:
+
+- Request rate: a token bucket on requests; excess requests get HTTP 429.
+- Simulation speed: a token bucket on game time, so all tabs of a session
+  together advance at most MAX_GAME_SPEED game-seconds per wall-second.
+- Coalescing: ticks arriving within MIN_UPDATE_INTERVAL of the last update
+  only add their dt to a pending total, which the next admitted tick
+  simulates in a single GameState.update.
+- Cached responses: when the state hasn't changed since the last response,
+  the serialized body is reused instead of calling to_dict again.
+"""
+import time
+
+MAX_GAME_SPEED = 20.0  # Game seconds per wall second (the fastest speed button)
+MAX_GAME_BURST = 2.0  # Game seconds that can be banked while idle
+MAX_TICK_DT = 0.5  # Largest dt accepted from one request (matches the client clamp)
+MIN_UPDATE_INTERVAL = 0.05  # Wall seconds between simulation updates (20 updates/s)
+# Tick requests per wall second: above the stock client's fastest cadence (one tick
+# every 200 ms / 20 = 10 ms, i.e. < 100/s); extra requests only hit the coalescer
+MAX_REQUEST_RATE = 120.0
+MAX_REQUEST_BURST = 40.0
+RETRY_AFTER = 0.2  # Seconds a rate-limited client is told to wait
+
+
+class TickAdmission:
+    """Per-session tick rate limiter and response cache"""
+
+    def __init__(self):
+        now = time.monotonic()
+        self.request_tokens = MAX_REQUEST_BURST
+        self.game_tokens = MAX_GAME_BURST
+        self.last_refill = now
+        self.last_update = 0.0
+        self.pending_dt = 0.0
+
+        # Bumped whenever the game state changes; keys the response cache
+        self.revision = 0
+        self.cached_key = None
+        self.cached_body = None
+
+    def _refill(self, now):
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.request_tokens = min(MAX_REQUEST_BURST, self.request_tokens + elapsed * MAX_REQUEST_RATE)
+        self.game_tokens = min(MAX_GAME_BURST, self.game_tokens + elapsed * MAX_GAME_SPEED)
+
+    def allow_request(self):
+        """Take a request token; False means the client should back off (429)"""
+        self._refill(time.monotonic())
+        if self.request_tokens < 1.0:
+            return False
+        self.request_tokens -= 1.0
+        return True
+
+    def admit(self, dt):
+        """Return the game time to simulate now (0.0 = coalesced into a later tick)
+
+        dt must be a finite float (app.py rejects anything else with a 400).
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.pending_dt += max(0.0, min(dt, MAX_TICK_DT))
+
+        if now - self.last_update < MIN_UPDATE_INTERVAL:
+            return 0.0
+
+        granted = min(self.pending_dt, self.game_tokens)
+        self.game_tokens -= granted
+        self.pending_dt = 0.0  # Time beyond the speed limit is dropped, not deferred
+        self.last_update = now
+        if granted > 0:
+            self.state_changed()
+        return granted
+
+    def state_changed(self):
+        """Invalidate the cached response (call after any action)"""
+        self.revision += 1
+
+    def get_cached(self, fields):
+        """Cached response body for these fields if the state hasn't changed"""
+        if self.cached_key == (self.revision, fields):
+            return self.cached_body
+        return None
+
+    def store(self, fields, body):
+        self.cached_key = (self.revision, fields)
+        self.cached_body = body